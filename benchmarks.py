@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки горячих путей игровой логики.
+Замеряет GameLogic.update (с политиками смешивания 'overlap' и 'enter'),
+поиск касаний, смешивание цветов, запросы курсора и операции инвентаря
+на разном количестве шариков, память на один шарик и сохранение/загрузку
+снимков состояния в сравнении с наивным JSON. Сохраняет
+результаты в JSON и сравнивает их с сохраненной базовой линией.
+
+Примеры:
+    python3 benchmarks.py --output bench.json
+    python3 benchmarks.py --sizes 70 1000 --baseline bench.json --threshold 0.25
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from logic import (
+    Ball, CachedColorMixer, Color, ColorMixer, GameLogic, Inventory,
+    create_game_logic
+)
+
+DEFAULT_SIZES = (70, 1000, 5000, 20000)
+
+# Площадь поля на один шарик: плотная раскладка - шарики почти касаются,
+# разреженная - касания редки
+LAYOUTS = {
+    'dense': 40 * 40,
+    'sparse': 200 * 200,
+}
+
+
+@dataclass
+class _LegacyColor:
+    """Прежнее представление цвета (dataclass с __dict__) для сравнения памяти."""
+    r: int
+    g: int
+    b: int
+
+
+@dataclass
+class _LegacyBall:
+    """Прежнее представление шарика (dataclass с __dict__) для сравнения памяти."""
+    x: float
+    y: float
+    vx: float
+    vy: float
+    radius: float
+    color: _LegacyColor
+    id: int
+
+
+def build_layout(count: int, layout: str, backend: str = 'python',
+                 seed: int = 0, broad_phase: str = 'grid') -> GameLogic:
+    """
+    Создает поле с заданным количеством шариков и плотностью.
+
+    Args:
+        count: Количество шариков
+        layout: 'dense' или 'sparse'
+        backend: Бэкенд симуляции
+        seed: Зерно генератора
+        broad_phase: Алгоритм поиска касаний
+
+    Returns:
+        GameLogic после одного тика "прогрева"
+    """
+    side = max(200.0, math.sqrt(count * LAYOUTS[layout]))
+    game = create_game_logic(side, side, backend=backend, broad_phase=broad_phase,
+                             seed=seed)
+    game.inventory.max_size = None
+    for _ in range(count):
+        game.add_ball(game.create_random_ball())
+    game.update()
+    return game
+
+
+def measure(func: Callable[[], object], min_time: float = 0.2, repeat: int = 3) -> dict:
+    """
+    Замеряет время одного вызова функции.
+
+    Количество вызовов подбирается так, чтобы один замер длился не меньше
+    min_time; берется лучший из repeat замеров.
+
+    Returns:
+        Словарь с временем одного вызова и количеством вызовов в замере
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = min([elapsed] + timer.repeat(repeat=repeat - 1, number=number))
+    return {'seconds': best / number, 'number': number}
+
+
+def bench_game(count: int, layout: str, backend: str, min_time: float,
+               broad_phase: str = 'grid') -> Dict[str, dict]:
+    """Замеряет операции GameLogic на одном поле."""
+    game = build_layout(count, layout, backend, broad_phase=broad_phase)
+    center = game.width / 2, game.height / 2
+    prefix = f"{backend}/{layout}/{count}"
+    results = {}
+
+    results[f"update/{prefix}"] = measure(game.update, min_time)
+    game.mix_policy = 'enter'
+    results[f"update_mix_enter/{prefix}"] = measure(game.update, min_time)
+    game.mix_policy = 'overlap'
+    results[f"collisions/{prefix}"] = measure(game._handle_ball_collisions, min_time)
+
+    def suck_and_spit():
+        # Возвращаем шарик на поле, чтобы их количество не менялось
+        if game.suck_ball_at_position(*center):
+            game.spit_ball_at_position(*center)
+    results[f"suck_ball_at_position/{prefix}"] = measure(suck_and_spit, min_time)
+
+    results[f"get_balls_in_area/{prefix}"] = measure(
+        lambda: game.get_balls_in_area(center[0], center[1], game.sucking_radius * 2),
+        min_time
+    )
+    return results
+
+
+def bench_inventory(count: int, min_time: float) -> Dict[str, dict]:
+    """Замеряет заполнение инвентаря, удаление каждого второго шарика и опустошение."""
+    balls = [Ball(0, 0, 0, 0, 20, Color(255, 0, 0)) for _ in range(count)]
+
+    def fill_and_drain():
+        inventory = Inventory()
+        for ball in balls:
+            inventory.add_ball(ball)
+        for ball in balls[::2]:
+            inventory.remove_ball(ball)
+        while inventory.pop_ball() is not None:
+            pass
+
+    return {f"inventory/{count}": measure(fill_and_drain, min_time)}
+
+
+def bench_mixing(min_time: float, pairs: int = 1000) -> Dict[str, dict]:
+    """Замеряет смешивание пачки пар цветов без кэша и с кэшем."""
+    rng = random.Random(0)
+    palette = [Color(rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+               for _ in range(64)]
+    colors = [(rng.choice(palette), rng.choice(palette)) for _ in range(pairs)]
+    results = {}
+    for name, mixer in (('plain', ColorMixer()), ('cached', CachedColorMixer())):
+        def mix_all(mixer=mixer):
+            for color1, color2 in colors:
+                mixer.mix_colors(color1, color2)
+        timing = measure(mix_all, min_time)
+        timing['seconds'] /= pairs
+        results[f"mix_colors/{name}"] = timing
+    return results
+
+
+def measure_memory(factory: Callable[[int], object], count: int) -> float:
+    """
+    Замеряет память, занятую count объектами, созданными factory(k).
+
+    Returns:
+        Байт на один объект (вместе с его полями и ссылкой в списке)
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        items = [factory(k) for k in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def bench_memory(count: int = 100_000) -> Dict[str, dict]:
+    """
+    Сравнивает память на шарик: прежние dataclass с __dict__, Ball со
+    __slots__ и Ball с интернированными цветами (как после смешивания).
+
+    Координаты вычисляются в фабрике, чтобы каждый шарик владел своими
+    числами, как в игре.
+    """
+    def legacy(k):
+        return _LegacyBall(k * 0.5, k * 0.25, k % 7 - 3.5, k % 5 - 2.5, 15.0 + k % 16,
+                           _LegacyColor(k % 256, (k >> 8) % 256, 128), k)
+
+    def slotted(k):
+        return Ball(k * 0.5, k * 0.25, k % 7 - 3.5, k % 5 - 2.5, 15.0 + k % 16,
+                    Color(k % 256, (k >> 8) % 256, 128), k)
+
+    def interned(k):
+        # Смешивание сводит цвета к небольшой палитре общих объектов
+        return Ball(k * 0.5, k * 0.25, k % 7 - 3.5, k % 5 - 2.5, 15.0 + k % 16,
+                    Color.intern(k % 16 * 16, (k >> 4) % 16 * 16, 128), k)
+
+    return {
+        f"memory/{name}/{count}": {'bytes_per_ball': measure_memory(factory, count)}
+        for name, factory in (('legacy', legacy), ('slots', slotted),
+                              ('slots_interned', interned))
+    }
+
+
+def _json_save(game: GameLogic, path: str):
+    """Наивное сохранение: словарь на каждый шарик в JSON."""
+    def encode(ball):
+        return {'x': ball.x, 'y': ball.y, 'vx': ball.vx, 'vy': ball.vy,
+                'radius': ball.radius, 'color': ball.color.to_tuple()}
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'width': game.width,
+            'height': game.height,
+            'balls': [encode(ball) for ball in game.balls],
+            'inventory': [encode(ball) for ball in game.inventory.balls],
+        }, f)
+
+
+def _json_load(path: str) -> GameLogic:
+    """Наивная загрузка: разбор JSON и создание Ball по одному."""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    game = GameLogic(data['width'], data['height'])
+    for item in data['balls']:
+        game.add_ball(Ball(item['x'], item['y'], item['vx'], item['vy'],
+                           item['radius'], Color(*item['color'])))
+    for item in data['inventory']:
+        game.inventory.add_ball(Ball(item['x'], item['y'], item['vx'], item['vy'],
+                                     item['radius'], Color(*item['color'])))
+    return game
+
+
+def bench_snapshot(count: int, min_time: float) -> Dict[str, dict]:
+    """
+    Сравнивает сохранение и загрузку сцены из count шариков: наивный JSON
+    против снимка snapshot.py (загрузка в GameLogic и в NumpyGameLogic).
+    """
+    try:
+        from snapshot import load_snapshot, save_snapshot
+    except ImportError:  # Снимки требуют NumPy
+        return {}
+
+    game = create_game_logic(1000, 1000, seed=0)
+    for _ in range(count):
+        game.add_ball(game.create_random_ball())
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'scene.json')
+        snapshot_path = os.path.join(directory, 'scene.snapshot')
+        results[f"snapshot/json_save/{count}"] = measure(
+            lambda: _json_save(game, json_path), min_time)
+        results[f"snapshot/json_load/{count}"] = measure(
+            lambda: _json_load(json_path), min_time)
+        results[f"snapshot/save/{count}"] = measure(
+            lambda: save_snapshot(game, snapshot_path), min_time)
+        results[f"snapshot/load_python/{count}"] = measure(
+            lambda: load_snapshot(snapshot_path, backend='python'), min_time)
+        results[f"snapshot/load_numpy/{count}"] = measure(
+            lambda: load_snapshot(snapshot_path, backend='numpy'), min_time)
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, layouts=tuple(LAYOUTS), backend: str = 'python',
+                   min_time: float = 0.2, log: Callable[[str], None] = print,
+                   broad_phase: str = 'grid', memory_count: int = 100_000,
+                   snapshot_count: int = 100_000) -> dict:
+    """
+    Прогоняет все бенчмарки.
+
+    Returns:
+        Словарь {'meta': ..., 'results': {имя: {'seconds': ..., 'number': ...}},
+        'memory': {имя: {'bytes_per_ball': ...}}}
+    """
+    results = {}
+    results.update(bench_mixing(min_time))
+    for count in sizes:
+        results.update(bench_inventory(count, min_time))
+        for layout in layouts:
+            log(f"  {backend}/{layout}/{count}...")
+            results.update(bench_game(count, layout, backend, min_time, broad_phase))
+    if snapshot_count > 0:
+        log(f"  snapshot/{snapshot_count}...")
+        results.update(bench_snapshot(snapshot_count, min_time))
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'sizes': list(sizes),
+            'layouts': list(layouts),
+            'backend': backend,
+            'broad_phase': broad_phase,
+        },
+        'results': results,
+        'memory': bench_memory(memory_count) if memory_count > 0 else {},
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Сравнивает результаты с базовой линией.
+
+    Args:
+        current: Текущие результаты (формат run_benchmarks)
+        baseline: Базовая линия в том же формате
+        threshold: Допустимое относительное замедление (0.2 = на 20%)
+
+    Returns:
+        Список описаний регрессий (пустой, если регрессий нет)
+    """
+    regressions = []
+    base_results = baseline.get('results', {})
+    for name, timing in sorted(current['results'].items()):
+        base = base_results.get(name)
+        if not base or base['seconds'] <= 0:
+            continue
+        ratio = timing['seconds'] / base['seconds']
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {base['seconds'] * 1e6:.1f} -> {timing['seconds'] * 1e6:.1f} мкс "
+                f"(x{ratio:.2f})"
+            )
+    base_memory = baseline.get('memory', {})
+    for name, usage in sorted(current.get('memory', {}).items()):
+        base = base_memory.get(name)
+        if not base or base['bytes_per_ball'] <= 0:
+            continue
+        ratio = usage['bytes_per_ball'] / base['bytes_per_ball']
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {base['bytes_per_ball']:.0f} -> {usage['bytes_per_ball']:.0f} байт "
+                f"(x{ratio:.2f})"
+            )
+    return regressions
+
+
+def format_results(data: dict) -> str:
+    """Форматирует результаты в таблицу."""
+    lines = [f"{'Бенчмарк':<50} {'мкс/вызов':>14}"]
+    lines.append("-" * 65)
+    for name, timing in sorted(data['results'].items()):
+        lines.append(f"{name:<50} {timing['seconds'] * 1e6:>14.2f}")
+    if data.get('memory'):
+        lines.append("")
+        lines.append(f"{'Память':<50} {'байт/шарик':>14}")
+        lines.append("-" * 65)
+        for name, usage in sorted(data['memory'].items()):
+            lines.append(f"{name:<50} {usage['bytes_per_ball']:>14.1f}")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Бенчмарки горячих путей logic.py")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="количество шариков")
+    parser.add_argument('--layouts', nargs='+', choices=tuple(LAYOUTS),
+                        default=list(LAYOUTS), help="плотность раскладки")
+    parser.add_argument('--backend', choices=('python', 'numpy'), default='python',
+                        help="бэкенд симуляции")
+    parser.add_argument('--broad-phase', choices=GameLogic.BROAD_PHASES, default='grid',
+                        help="алгоритм поиска касаний")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="минимальная длительность одного замера, с")
+    parser.add_argument('--memory-count', type=int, default=100_000,
+                        help="количество шариков в замере памяти (0 - не замерять)")
+    parser.add_argument('--snapshot-count', type=int, default=100_000,
+                        help="шариков в сцене для замера снимков (0 - не замерять)")
+    parser.add_argument('--output', default='bench_results.json',
+                        help="файл для результатов в JSON")
+    parser.add_argument('--baseline', help="файл базовой линии для сравнения")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="допустимое замедление относительно базовой линии (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Главная функция запуска."""
+    args = parse_args(argv)
+    print("Запуск бенчмарков...")
+    data = run_benchmarks(args.sizes, args.layouts, args.backend, args.min_time,
+                          broad_phase=args.broad_phase, memory_count=args.memory_count,
+                          snapshot_count=args.snapshot_count)
+    print(format_results(data))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    print(f"\nРезультаты сохранены в {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(data, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ Регрессии (порог {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\n✓ Регрессий нет (порог {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
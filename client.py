@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Клиент игры про шарики.
+Подключается к серверу (server.py), собирает состояние игры из кадров
+сервера и рисует его кодом GameGUI. Действия игрока (всасывание,
+выплевывание, добавление шарика, очистка поля) отправляются на сервер
+командами и выполняются там.
+
+Пример:
+    python3 server.py
+    python3 client.py --port 8765
+"""
+
+import argparse
+import json
+import random
+import socket
+import sys
+from typing import Dict, List, Optional, Tuple, Union
+
+import pygame
+
+from game_gui import GameGUI
+from logic import Ball, Color, DeleteZone, GameLogic, Inventory
+from server import (CMD_ADD_BALL, CMD_ADD_RANDOM, CMD_CLEAR, CMD_SPIT, CMD_SUCK,
+                    DEFAULT_HOST, DEFAULT_PORT, MSG_FRAME, MSG_HELLO, PROTOCOL_VERSION,
+                    decode_frame, pack_command, unpack_messages)
+
+
+class RemoteGame:
+    """
+    Игра, которая идет на сервере.
+
+    Повторяет часть интерфейса GameLogic, нужную GameGUI: состояние
+    (balls, inventory, delete_zones, sucking_radius) собирается из кадров
+    сервера в poll(), а команды игрока отправляются на сервер и видны
+    в следующих кадрах.
+    """
+
+    # GameGUI назначает профайлер логике; фаз логики на клиенте нет
+    profiler = None
+
+    def __init__(self, address: Union[str, Tuple[str, int]], timeout: float = 5.0):
+        """
+        Подключается к серверу и ждет приветствие и опорный кадр.
+
+        Args:
+            address: (host, port) для TCP или путь Unix-сокета
+            timeout: Сколько ждать сервер при подключении, секунд
+
+        Raises:
+            ConnectionError: если сервер закрыл соединение раньше опорного кадра
+            ValueError: если сервер говорит на другой версии протокола
+        """
+        if isinstance(address, str):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.settimeout(timeout)
+        self._socket.connect(address)
+        self._incoming = bytearray()
+        self._outgoing = bytearray()
+        self.connected = True
+
+        self.width = 0.0
+        self.height = 0.0
+        self.delete_zones: List[DeleteZone] = []
+        self.sucking_radius = 0.0
+        self.ticks_per_second = 0.0
+        self.inventory = Inventory()
+        self.tick = 0
+        self.frames = 0  # Принятые кадры
+        self.rng = random.Random()  # Для create_random_ball
+        self._balls: Dict[int, Ball] = {}
+        self._balls_cache: Optional[List[Ball]] = None
+
+        while not self.frames:
+            if not self._read():
+                raise ConnectionError("Сервер закрыл соединение")
+        self._socket.setblocking(False)
+
+    # === Прием состояния ===
+
+    def poll(self):
+        """Отправляет накопленные команды и применяет все пришедшие кадры."""
+        self._flush()
+        while self._read():
+            pass
+
+    def _read(self) -> bool:
+        """
+        Читает порцию данных из сокета и применяет полные сообщения.
+
+        Returns:
+            True если данные были прочитаны
+        """
+        try:
+            data = self._socket.recv(1 << 16)
+        except (BlockingIOError, InterruptedError):
+            return False
+        except ConnectionError:
+            data = b''
+        if not data:
+            self.connected = False
+            return False
+        self._incoming += data
+        for kind, payload in unpack_messages(self._incoming):
+            if kind == MSG_HELLO:
+                self._apply_hello(json.loads(payload.decode('utf-8')))
+            elif kind == MSG_FRAME:
+                self._apply_frame(decode_frame(payload))
+        return True
+
+    def _apply_hello(self, header: dict):
+        """Применяет параметры игры из приветствия сервера."""
+        if header['version'] != PROTOCOL_VERSION:
+            raise ValueError(f"Неподдерживаемая версия протокола {header['version']}")
+        self.width = header['width']
+        self.height = header['height']
+        self.delete_zones = [DeleteZone(*zone) for zone in header['delete_zones']]
+        self.sucking_radius = header['sucking_radius']
+        self.inventory.max_size = header['inventory_size']
+        self.ticks_per_second = header['ticks_per_second']
+
+    def _apply_frame(self, frame: dict):
+        """
+        Применяет кадр сервера к шарикам и инвентарю.
+
+        Raises:
+            ValueError: если кадр двигает или перекрашивает шарик, которого
+                нет у клиента (кадр тогда не применяется)
+        """
+        balls = self._balls
+        added = {row[0] for row in frame['added']}
+        removed = set(frame['removed'])
+        for row in frame['moved'] + frame['recolored']:
+            ball_id = row[0]
+            if ball_id in added:
+                continue
+            if frame['keyframe'] or ball_id in removed or ball_id not in balls:
+                raise ValueError(f"Кадр {frame['tick']}: неизвестный шарик {ball_id}")
+        if frame['keyframe']:
+            balls.clear()
+        for ball_id in frame['removed']:
+            balls.pop(ball_id, None)
+        for ball_id, x, y, radius, r, g, b in frame['added']:
+            balls[ball_id] = Ball(x, y, 0.0, 0.0, radius, Color.intern(r, g, b), id=ball_id)
+        for ball_id, x, y in frame['moved']:
+            ball = balls[ball_id]
+            ball.x = x
+            ball.y = y
+        for ball_id, r, g, b in frame['recolored']:
+            balls[ball_id].color = Color.intern(r, g, b)
+        if frame['keyframe'] or frame['removed'] or frame['added']:
+            self._balls_cache = None
+
+        if frame['inventory'] is not None:
+            self.inventory.clear()
+            for radius, r, g, b in frame['inventory']:
+                self.inventory.add_ball(Ball(0.0, 0.0, 0.0, 0.0, radius, Color.intern(r, g, b)))
+        self.tick = frame['tick']
+        self.frames += 1
+
+    @property
+    def balls(self) -> List[Ball]:
+        """Шарики на поле по последнему кадру сервера."""
+        if self._balls_cache is None:
+            self._balls_cache = list(self._balls.values())
+        return self._balls_cache
+
+    def get_ball_count(self) -> int:
+        """Возвращает количество шариков на поле."""
+        return len(self._balls)
+
+    def get_inventory_count(self) -> int:
+        """Возвращает количество шариков в инвентаре."""
+        return self.inventory.size()
+
+    # === Команды ===
+
+    def _send(self, command: bytes):
+        """Ставит команду в очередь отправки и пытается отправить."""
+        self._outgoing += command
+        self._flush()
+
+    def _flush(self):
+        """Отправляет сколько получится из очереди, не блокируясь."""
+        if not self._outgoing or not self.connected:
+            return
+        try:
+            sent = self._socket.send(self._outgoing)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self.connected = False
+            return
+        del self._outgoing[:sent]
+
+    def suck_ball_at_position(self, mouse_x: float, mouse_y: float) -> bool:
+        """
+        Отправляет всасывание шарика.
+
+        Returns:
+            True если соединение с сервером есть (результат будет виден
+            в следующем кадре)
+        """
+        self._send(pack_command(CMD_SUCK, mouse_x, mouse_y))
+        return self.connected
+
+    def spit_ball_at_position(self, mouse_x: float, mouse_y: float,
+                              vx: float = 0, vy: float = 0) -> bool:
+        """Отправляет выплевывание шарика (частоту ограничивает сервер)."""
+        self._send(pack_command(CMD_SPIT, mouse_x, mouse_y, vx, vy))
+        return self.connected
+
+    # Случайный шарик создается так же, как в GameLogic, генератором клиента
+    create_random_ball = GameLogic.create_random_ball
+
+    def add_ball(self, ball: Ball):
+        """Отправляет добавление шарика (на сервере он получит свой id)."""
+        color = ball.color
+        self._send(pack_command(CMD_ADD_BALL, ball.x, ball.y, ball.vx, ball.vy,
+                                ball.radius, color.r, color.g, color.b))
+
+    def add_random_ball(self):
+        """Отправляет добавление случайного шарика из генератора сервера."""
+        self._send(pack_command(CMD_ADD_RANDOM))
+
+    def clear_all_balls(self):
+        """Отправляет очистку поля."""
+        self._send(pack_command(CMD_CLEAR))
+
+    def close(self):
+        """Закрывает соединение с сервером."""
+        self.connected = False
+        self._socket.close()
+
+
+class ClientGUI(GameGUI):
+    """Графический интерфейс, показывающий игру с сервера."""
+
+    def __init__(self, game: RemoteGame):
+        """
+        Инициализирует интерфейс для удаленной игры.
+
+        Args:
+            game: Подключенная удаленная игра
+        """
+        super().__init__(game)
+        # Тики идут на сервере: кадр только принимает готовое состояние
+        self.fixed_timestep = False
+        self.interpolate = False
+
+    def _update_logic(self, frame_time: float):
+        """Принимает кадры сервера; при разрыве соединения завершает игру."""
+        self.game.poll()
+        if not self.game.connected:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Клиент игры про шарики: показывает игру с сервера (server.py)"
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help="адрес сервера")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="порт сервера")
+    parser.add_argument('--unix', metavar='PATH', help="подключиться к Unix-сокету сервера")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Главная функция запуска."""
+    args = parse_args(argv)
+    game = RemoteGame(args.unix or (args.host, args.port))
+    ClientGUI(game).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
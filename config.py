@@ -29,6 +29,24 @@ DELETE_ZONE_MARGIN = 10   # Отступ от края экрана
 # === ФИЗИКА ===
 SUCKING_RADIUS = 50.0     # Радиус "всасывания" шариков
 SPIT_VELOCITY_FACTOR = 0.05  # Множитель скорости при выплевывании
+SPIT_RATE_PER_SECOND = 10.0  # Максимум выплюнутых шариков в секунду (None - без ограничения)
+SPIT_BURST = 1            # Сколько шариков можно выплюнуть подряд без паузы
+
+# === СИМУЛЯЦИЯ ===
+SIMULATION_BACKEND = 'python'  # 'python' - объекты Ball, 'numpy' - массивы NumPy (нужен numpy)
+FIXED_TIMESTEP = False    # Фиксированный шаг логики вместо dt кадра
+LOGIC_TICKS_PER_SECOND = 60  # Частота тиков логики при фиксированном шаге
+MAX_CATCHUP_STEPS = 5     # Максимум тиков логики за один кадр
+INTERPOLATE_RENDERING = True  # Интерполировать позиции шариков между тиками
+SIMULATION_SEED = None    # Зерно генератора случайных шариков (None - случайное)
+REPLAY_RECORD_PATH = None  # Файл для записи сессии (см. replay.py), None - без записи
+
+# === ПОИСК СТОЛКНОВЕНИЙ ===
+COLLISION_BROAD_PHASE = 'grid'  # 'grid' - равномерная сетка, 'sap' - sweep and prune, 'brute' - перебор всех пар
+GRID_CELL_SIZE = MAX_BALL_RADIUS * 2  # Размер ячейки сетки (не меньше диаметра шарика)
+COLOR_MIX_CACHE_SIZE = 4096  # Размер LRU-кэша смешивания цветов (0 - без кэша)
+MIX_POLICY = 'overlap'    # 'overlap' - смешивать каждый тик касания, 'enter' - только при начале касания
+CONTINUOUS_COLLISIONS = False  # Ловить касания быстрых шариков, проскочивших друг друга за кадр
 
 # === ЦВЕТА ИНТЕРФЕЙСА ===
 BG_COLOR = (255, 255, 255)  # Белый фон
@@ -45,11 +63,13 @@ SUCK_RADIUS_BORDER = (100, 100, 255)  # Граница радиуса
 BALL_BORDER_WIDTH = 2     # Толщина обводки шарика
 BALL_HIGHLIGHT_FACTOR = 0.3  # Размер блика (% от радиуса)
 BALL_DARKEN_FACTOR = 0.7  # Затемнение для обводки
+BALL_SPRITE_CACHE_SIZE = 512  # Максимум заранее отрисованных спрайтов шариков
 
 # === ШРИФТЫ ===
 FONT_NAME = 'Arial'       # Название шрифта
 FONT_SIZE_NORMAL = 20     # Обычный размер
 FONT_SIZE_SMALL = 16      # Маленький размер
+TEXT_CACHE_SIZE = 128     # Максимум отрисованных строк в кэше
 
 # === ЦВЕТОВАЯ ПАЛИТРА ШАРИКОВ ===
 # Используется для создания начальных шариков
@@ -70,4 +90,13 @@ PREDEFINED_COLORS = {
 SHOW_FPS = True           # Показывать FPS
 SHOW_HELP_ON_START = True  # Показывать справку при старте
 ENABLE_VSYNC = False      # Вертикальная синхронизация (может снизить производительность)
+DIRTY_RECT_RENDERING = False  # Перерисовывать только изменившиеся области экрана
+
+# === ПРОФИЛИРОВАНИЕ ===
+PROFILING = False         # Замерять время фаз логики и этапов отрисовки
+PROFILE_WINDOW = 300      # Кадров в скользящей статистике (p50/p95/p99)
+PROFILE_OVERLAY = True    # Показывать график времени кадра (F3 - вкл/выкл)
+PROFILE_EXPORT_PATH = None  # Файл замеров по кадрам (.csv или JSON lines), None - без выгрузки
+PROFILE_LOGIC_COLOR = (90, 130, 230)  # Цвет логики на графике
+PROFILE_DRAW_COLOR = (240, 150, 60)   # Цвет отрисовки на графике
 
@@ -5,8 +5,12 @@
 
 import pygame
 import sys
-from typing import Tuple
-from logic import GameLogic, Ball, Color, create_predefined_colors
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from logic import GameLogic, Ball, Color, DeleteZone, create_game_logic, create_predefined_colors
+from profiling import NO_PHASE, PhaseProfiler, ProfileExporter, percentile
+from replay import ReplayRecorder
+from timestep import FixedTimestep
 
 # Импортируем настройки (можно использовать config.py для настройки)
 try:
@@ -29,11 +33,64 @@ except ImportError:
     SHOW_HELP_ON_START = True
 
 
+# Этапы отрисовки кадра в замере времени (остальные фазы - логика)
+DRAW_STAGES = ('draw_static', 'draw_balls', 'draw_inventory', 'draw_overlays', 'flip')
+
+
+class SurfaceCache:
+    """
+    Ограниченный LRU-кэш заранее отрисованных поверхностей.
+    
+    Когда кэш переполнен, вытесняется поверхность, которую дольше всех
+    не запрашивали.
+    """
+    
+    def __init__(self, max_size: int):
+        """
+        Инициализирует кэш.
+        
+        Args:
+            max_size: Максимальное количество поверхностей в кэше
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces: 'OrderedDict[Hashable, pygame.Surface]' = OrderedDict()
+    
+    def get(self, key: Hashable, factory: Callable[[], pygame.Surface]) -> pygame.Surface:
+        """Возвращает поверхность по ключу, создавая ее через factory при промахе."""
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = factory()
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+    
+    def __len__(self) -> int:
+        return len(self._surfaces)
+    
+    def clear(self):
+        """Очищает кэш."""
+        self._surfaces.clear()
+
+
 class GameGUI:
     """Класс графического интерфейса игры."""
     
-    def __init__(self):
-        """Инициализирует графический интерфейс."""
+    def __init__(self, game: Optional[GameLogic] = None):
+        """
+        Инициализирует графический интерфейс.
+        
+        Args:
+            game: Готовая игровая логика (например, RemoteGame из client.py);
+                None - создать локальную игру по настройкам config.py
+        """
         pygame.init()
         
         # Создаем окно
@@ -45,16 +102,21 @@ class GameGUI:
         self.clock = pygame.time.Clock()
         
         # Инициализируем игровую логику
-        self.game = GameLogic(WINDOW_WIDTH, WINDOW_HEIGHT - 100)  # Оставляем место для инвентаря
+        self.game = game if game is not None else self._create_game()
         
-        # Настраиваем зону удаления (правый нижний угол игрового поля)
-        delete_zone_size = 120
-        self.game.set_delete_zone(
-            WINDOW_WIDTH - delete_zone_size - 10,
-            WINDOW_HEIGHT - 100 - delete_zone_size - 10,
-            delete_zone_size,
-            delete_zone_size
-        )
+        # Замер времени фаз логики и этапов отрисовки (None - отключен)
+        self.profiler: Optional[PhaseProfiler] = None
+        self.show_profile = False
+        if globals().get('PROFILING', False):
+            export_path = globals().get('PROFILE_EXPORT_PATH')
+            self.profiler = PhaseProfiler(
+                window=globals().get('PROFILE_WINDOW', 300),
+                exporter=ProfileExporter(export_path) if export_path else None
+            )
+            self.game.profiler = self.profiler
+            self.show_profile = globals().get('PROFILE_OVERLAY', True)
+        self._profile_background: Optional[pygame.Surface] = None
+        self._profile_lines: List[pygame.Surface] = []
         
         # Параметры инвентаря
         self.inventory_y = WINDOW_HEIGHT - 95
@@ -68,12 +130,82 @@ class GameGUI:
         self.mouse_down = False
         self.right_mouse_down = False
         
-        # Создаем начальные шарики
-        self._create_initial_balls()
+        # Создаем начальные шарики (у переданной игры они уже есть)
+        if game is None:
+            self._create_initial_balls()
         
         # Для отображения инструкций
         self.show_help = globals().get('SHOW_HELP_ON_START', True)
         
+        # Фиксированный шаг логики (отрисовка не зависит от частоты тиков)
+        self.fixed_timestep = globals().get('FIXED_TIMESTEP', False)
+        ticks_per_second = globals().get('LOGIC_TICKS_PER_SECOND', 60)
+        self.timestep = FixedTimestep(
+            ticks_per_second,
+            globals().get('MAX_CATCHUP_STEPS', 5)
+        )
+        self.logic_dt = 60.0 / ticks_per_second  # dt логики: 1.0 = один кадр при 60 FPS
+        self.interpolate = self.fixed_timestep and globals().get('INTERPOLATE_RENDERING', True)
+        # id -> (x, y) до и после последнего тика
+        self._prev_positions: Dict[int, Tuple[float, float, float, float]] = {}
+        
+        # Кэш спрайтов шариков: ключ - (цвет, радиус, размер блика)
+        self.ball_sprites = SurfaceCache(globals().get('BALL_SPRITE_CACHE_SIZE', 512))
+        
+        # Кэш отрисованных строк: ключ - (шрифт, текст, цвет)
+        self.text_cache = SurfaceCache(globals().get('TEXT_CACHE_SIZE', 128))
+        
+        # Полупрозрачные слои строятся один раз и только выводятся
+        self._suck_radius_surface = None  # (радиус, поверхность)
+        self._help_layers = None
+        
+        # Отрисовка только изменившихся областей (dirty rectangles)
+        self.dirty_rendering = globals().get('DIRTY_RECT_RENDERING', False)
+        self._background: Optional[pygame.Surface] = None
+        self._background_key_value: tuple = ()
+        self._prev_dirty_rects: List[pygame.Rect] = []
+        self._last_inventory_key: Optional[tuple] = None
+        self._full_redraw = True
+        
+        # Панель инвентаря собирается в отдельную поверхность и выводится
+        # одним blit; пересобирается только при изменении инвентаря
+        self._inventory_panel: Optional[pygame.Surface] = None
+        self._inventory_panel_key: Optional[tuple] = None
+        
+    def _create_game(self) -> GameLogic:
+        """Создает локальную игровую логику по настройкам config.py."""
+        game = create_game_logic(
+            WINDOW_WIDTH,
+            WINDOW_HEIGHT - 100,  # Оставляем место для инвентаря
+            backend=globals().get('SIMULATION_BACKEND', 'python'),
+            broad_phase=globals().get('COLLISION_BROAD_PHASE', 'grid'),
+            cell_size=globals().get('GRID_CELL_SIZE', 60.0),
+            color_cache_size=globals().get('COLOR_MIX_CACHE_SIZE', 4096),
+            continuous_collisions=globals().get('CONTINUOUS_COLLISIONS', False),
+            mix_policy=globals().get('MIX_POLICY', 'overlap'),
+            seed=globals().get('SIMULATION_SEED')
+        )
+        
+        # Запись сессии для воспроизведения без GUI (replay.py)
+        record_path = globals().get('REPLAY_RECORD_PATH')
+        if record_path:
+            game = ReplayRecorder(game, record_path)
+        
+        # Настраиваем зону удаления (правый нижний угол игрового поля)
+        delete_zone_size = 120
+        game.set_delete_zone(
+            WINDOW_WIDTH - delete_zone_size - 10,
+            WINDOW_HEIGHT - 100 - delete_zone_size - 10,
+            delete_zone_size,
+            delete_zone_size
+        )
+        
+        # Ограничение частоты выплевывания: dt логики 1.0 = 1/60 секунды
+        spit_rate = globals().get('SPIT_RATE_PER_SECOND', 10.0)
+        if spit_rate:
+            game.set_spit_rate(spit_rate / 60.0, globals().get('SPIT_BURST', 1))
+        return game
+    
     def _create_initial_balls(self):
         """Создает начальные шарики на поле."""
         predefined_colors = create_predefined_colors()
@@ -113,6 +245,8 @@ class GameGUI:
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_h:
                         self.show_help = not self.show_help
+                    elif event.key == pygame.K_F3 and self.profiler is not None:
+                        self.show_profile = not self.show_profile
                     elif event.key == pygame.K_SPACE:
                         # Добавить новый случайный шарик
                         ball = self.game.create_random_ball()
@@ -136,166 +270,327 @@ class GameGUI:
                 center_x, center_y = WINDOW_WIDTH // 2, (WINDOW_HEIGHT - 100) // 2
                 vx = (mouse_x - center_x) * 0.05
                 vy = (mouse_y - center_y) * 0.05
+                # Частоту ограничивает логика (set_spit_rate), кадр не блокируется
                 self.game.spit_ball_at_position(mouse_x, mouse_y, vx, vy)
-                # Небольшая задержка между выплевываниями
-                pygame.time.wait(100)
             
             # Обновление игровой логики
-            self.game.update(dt * 60)  # Нормализуем dt для логики
+            self._update_logic(dt)
             
             # Отрисовка
             self._draw()
+            if self.profiler is not None:
+                self.profiler.end_frame()
         
+        if self.profiler is not None and self.profiler.exporter is not None:
+            self.profiler.exporter.close()
+        if hasattr(self.game, 'close'):
+            self.game.close()
         pygame.quit()
         sys.exit()
     
+    def _update_logic(self, frame_time: float):
+        """
+        Продвигает игровую логику на время кадра.
+        
+        Args:
+            frame_time: Длительность кадра в секундах
+        """
+        if not self.fixed_timestep:
+            self.game.update(frame_time * 60)  # Нормализуем dt для логики
+            return
+        
+        steps = self.timestep.advance(frame_time)
+        for step in range(steps):
+            last = self.interpolate and step == steps - 1
+            if last:
+                # Позиции перед последним тиком - начало интерполяции
+                before = {ball.id: (ball.x, ball.y) for ball in self.game.balls}
+            self.game.update(self.logic_dt)
+            if last:
+                self._prev_positions = {
+                    ball.id: before[ball.id] + (ball.x, ball.y)
+                    for ball in self.game.balls if ball.id in before
+                }
+    
+    def _ball_position(self, ball: Ball) -> Tuple[float, float]:
+        """Возвращает позицию для отрисовки шарика (с интерполяцией между тиками)."""
+        if self.interpolate:
+            prev = self._prev_positions.get(ball.id)
+            # Шарик, сдвинутый после тика (всосан и выплюнут, добавлен заново),
+            # рисуем на месте: иначе он протянется через весь экран
+            if prev is not None and prev[2] == ball.x and prev[3] == ball.y:
+                alpha = self.timestep.alpha
+                return (prev[0] + (ball.x - prev[0]) * alpha,
+                        prev[1] + (ball.y - prev[1]) * alpha)
+        return ball.x, ball.y
+    
     def _draw(self):
         """Отрисовывает все элементы игры."""
+        if self.dirty_rendering:
+            self._draw_dirty()
+            return
+        
+        # Фон, разделительная линия и зона удаления
+        with self._stage('draw_static'):
+            self._draw_static(self.screen)
+        
+        # Шарики на игровом поле
+        with self._stage('draw_balls'):
+            self._draw_balls()
+            
+            # Радиус всасывания (если зажата левая кнопка мыши)
+            if self.mouse_down:
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                if mouse_y < WINDOW_HEIGHT - 100:
+                    self._draw_suck_radius(mouse_x, mouse_y)
+        
+        # Инвентарь
+        with self._stage('draw_inventory'):
+            self._draw_inventory()
+        
+        with self._stage('draw_overlays'):
+            # Информация и помощь
+            self._draw_info()
+            
+            if self.show_help:
+                self._draw_help()
+            
+            if self.show_profile:
+                self._draw_profile()
+        
+        # Обновление экрана
+        with self._stage('flip'):
+            pygame.display.flip()
+    
+    def _stage(self, name: str):
+        """Возвращает контекст замера этапа отрисовки (заглушку, если замер отключен)."""
+        if self.profiler is None:
+            return NO_PHASE
+        return self.profiler.phase(name)
+    
+    def _draw_dirty(self):
+        """
+        Отрисовывает кадр, обновляя только изменившиеся области экрана.
+        
+        Области, занятые шариками и оверлеями в прошлом кадре, восстанавливаются
+        из закэшированного статического фона, после чего шарики и оверлеи
+        рисуются заново. На экран выводятся только эти прямоугольники.
+        """
+        screen = self.screen
+        field_rect = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT - 100)
+        
+        with self._stage('draw_static'):
+            background_key = self._background_key()
+            if self._background is None or background_key != self._background_key_value:
+                self._background = pygame.Surface(screen.get_size()).convert()
+                self._draw_static(self._background)
+                self._background_key_value = background_key
+                self._full_redraw = True
+            
+            if self._full_redraw:
+                screen.blit(self._background, (0, 0))
+                restored = []
+            else:
+                restored = self._prev_dirty_rects
+                for rect in restored:
+                    screen.blit(self._background, rect, rect)
+        
+        # Шарики и радиус всасывания не выходят за игровое поле:
+        # в полной отрисовке их перекрывает панель инвентаря
+        with self._stage('draw_balls'):
+            screen.set_clip(field_rect)
+            drawn = self._draw_balls(collect_rects=True)
+            if self.mouse_down:
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                if mouse_y < WINDOW_HEIGHT - 100:
+                    drawn.append(self._draw_suck_radius(mouse_x, mouse_y))
+            screen.set_clip(None)
+        
+        updated = list(restored)
+        with self._stage('draw_inventory'):
+            inventory_key = self._inventory_key()
+            if self._full_redraw or inventory_key != self._last_inventory_key:
+                self._draw_inventory()
+                self._last_inventory_key = inventory_key
+                updated.append(pygame.Rect(0, WINDOW_HEIGHT - 100, WINDOW_WIDTH, 100))
+        
+        # Оверлеи перерисовываются каждый кадр: полупрозрачный фон справки
+        # нельзя накладывать повторно на неочищенную область
+        with self._stage('draw_overlays'):
+            drawn.append(self._draw_info())
+            if self.show_help:
+                drawn.append(self._draw_help())
+            if self.show_profile:
+                drawn.append(self._draw_profile())
+        
+        with self._stage('flip'):
+            if self._full_redraw:
+                pygame.display.flip()
+                self._full_redraw = False
+            else:
+                pygame.display.update(updated + drawn)
+        self._prev_dirty_rects = drawn
+    
+    def _background_key(self) -> tuple:
+        """Возвращает ключ статического фона (меняется вместе с зонами удаления)."""
+        return tuple(zone.bounds() for zone in self.game.delete_zones)
+    
+    def _inventory_key(self) -> tuple:
+        """Возвращает ключ содержимого инвентаря для отслеживания изменений."""
+        inventory = self.game.inventory
+        return (id(inventory), inventory.version, inventory.max_size)
+    
+    def _draw_static(self, surface: pygame.Surface):
+        """Рисует неизменяемую часть кадра: фон, разделитель и зону удаления."""
         # Фон
-        self.screen.fill(BG_COLOR)
+        surface.fill(BG_COLOR)
         
         # Разделительная линия между игровым полем и инвентарем
         pygame.draw.line(
-            self.screen,
+            surface,
             INVENTORY_BORDER,
             (0, WINDOW_HEIGHT - 100),
             (WINDOW_WIDTH, WINDOW_HEIGHT - 100),
             2
         )
         
-        # Зона удаления
-        self._draw_delete_zone()
-        
-        # Шарики на игровом поле
-        self._draw_balls()
+        # Зоны удаления
+        for zone in self.game.delete_zones:
+            self._draw_delete_zone(surface, zone)
+    
+    def _draw_balls(self, collect_rects: bool = False) -> Optional[List[pygame.Rect]]:
+        """
+        Отрисовывает все шарики на поле одним пакетным blits.
         
-        # Радиус всасывания (если зажата левая кнопка мыши)
-        if self.mouse_down:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            if mouse_y < WINDOW_HEIGHT - 100:
-                self._draw_suck_radius(mouse_x, mouse_y)
+        Args:
+            collect_rects: Вернуть прямоугольники, занятые шариками
+        """
+        blits = []
+        for ball in self.game.balls:
+            x, y = self._ball_position(ball)
+            radius = int(ball.radius)
+            highlight = int(ball.radius * 0.3)
+            color = ball.color.to_tuple()
+            sprite = self.ball_sprites.get(
+                (color, radius, highlight),
+                lambda: self._render_ball_sprite(color, radius, highlight)
+            )
+            blits.append((sprite, (int(x) - radius, int(y) - radius)))
+        if collect_rects:
+            return self.screen.blits(blits)
+        self.screen.blits(blits, doreturn=False)
+        return None
+    
+    def _render_ball_sprite(self, color: Tuple[int, int, int], radius: int,
+                            highlight: int) -> pygame.Surface:
+        """
+        Отрисовывает спрайт шарика: заливка, обводка и блик.
         
-        # Инвентарь
-        self._draw_inventory()
+        Центр шарика находится в точке (radius, radius) спрайта.
+        """
+        size = 2 * radius + 1
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        center = (radius, radius)
         
-        # Информация и помощь
-        self._draw_info()
+        # Рисуем шарик
+        pygame.draw.circle(sprite, color, center, radius)
         
-        if self.show_help:
-            self._draw_help()
+        # Небольшая обводка для лучшей видимости
+        pygame.draw.circle(sprite, self._darken_color(Color.from_tuple(color)), center, radius, 2)
         
-        # Обновление экрана
-        pygame.display.flip()
-    
-    def _draw_balls(self):
-        """Отрисовывает все шарики на поле."""
-        for ball in self.game.balls:
-            # Рисуем шарик
-            pygame.draw.circle(
-                self.screen,
-                ball.color.to_tuple(),
-                (int(ball.x), int(ball.y)),
-                int(ball.radius)
-            )
-            
-            # Небольшая обводка для лучшей видимости
-            pygame.draw.circle(
-                self.screen,
-                self._darken_color(ball.color),
-                (int(ball.x), int(ball.y)),
-                int(ball.radius),
-                2
-            )
-            
-            # Блик для объемности
-            highlight_offset = int(ball.radius * 0.3)
-            pygame.draw.circle(
-                self.screen,
-                (255, 255, 255, 180),
-                (int(ball.x - highlight_offset), int(ball.y - highlight_offset)),
-                int(ball.radius * 0.3)
-            )
+        # Блик для объемности (на экране без альфа-канала блик непрозрачный)
+        pygame.draw.circle(
+            sprite,
+            (255, 255, 255),
+            (radius - highlight, radius - highlight),
+            highlight
+        )
+        return sprite
     
-    def _draw_delete_zone(self):
+    def _draw_delete_zone(self, surface: pygame.Surface, zone: DeleteZone):
         """Отрисовывает зону удаления шариков."""
-        if self.game.delete_zone:
-            zone = self.game.delete_zone
-            
-            # Фон зоны
-            pygame.draw.rect(
-                self.screen,
-                DELETE_ZONE_COLOR,
-                (zone.x, zone.y, zone.width, zone.height)
-            )
-            
-            # Граница зоны
-            pygame.draw.rect(
-                self.screen,
-                DELETE_ZONE_BORDER,
-                (zone.x, zone.y, zone.width, zone.height),
-                3
-            )
-            
-            # Текст "DELETE"
-            text = self.font.render("DELETE", True, DELETE_ZONE_BORDER)
-            text_rect = text.get_rect(
-                center=(zone.x + zone.width // 2, zone.y + zone.height // 2)
-            )
-            self.screen.blit(text, text_rect)
-            
-            # Иконка корзины (упрощенная)
-            center_x = int(zone.x + zone.width // 2)
-            center_y = int(zone.y + zone.height // 2 + 25)
-            pygame.draw.rect(
-                self.screen,
-                DELETE_ZONE_BORDER,
-                (center_x - 15, center_y - 10, 30, 20),
-                2
-            )
+        # Фон зоны
+        pygame.draw.rect(
+            surface,
+            DELETE_ZONE_COLOR,
+            (zone.x, zone.y, zone.width, zone.height)
+        )
+        
+        # Граница зоны
+        pygame.draw.rect(
+            surface,
+            DELETE_ZONE_BORDER,
+            (zone.x, zone.y, zone.width, zone.height),
+            3
+        )
+        
+        # Текст "DELETE"
+        text = self._render_text(self.font, "DELETE", DELETE_ZONE_BORDER)
+        text_rect = text.get_rect(
+            center=(zone.x + zone.width // 2, zone.y + zone.height // 2)
+        )
+        surface.blit(text, text_rect)
+        
+        # Иконка корзины (упрощенная)
+        center_x = int(zone.x + zone.width // 2)
+        center_y = int(zone.y + zone.height // 2 + 25)
+        pygame.draw.rect(
+            surface,
+            DELETE_ZONE_BORDER,
+            (center_x - 15, center_y - 10, 30, 20),
+            2
+        )
     
     def _draw_inventory(self):
-        """Отрисовывает панель инвентаря."""
+        """Отрисовывает панель инвентаря (пересобирает ее только при изменениях)."""
+        key = self._inventory_key()
+        if self._inventory_panel is None or key != self._inventory_panel_key:
+            self._inventory_panel = self._build_inventory_panel()
+            self._inventory_panel_key = key
+        self.screen.blit(self._inventory_panel, (0, WINDOW_HEIGHT - 100))
+    
+    def _build_inventory_panel(self) -> pygame.Surface:
+        """Собирает поверхность панели инвентаря: фон, заголовок, слоты и шарики."""
+        panel = pygame.Surface((WINDOW_WIDTH, 100))
+        
         # Фон инвентаря
-        pygame.draw.rect(
-            self.screen,
-            INVENTORY_BG,
-            (0, WINDOW_HEIGHT - 100, WINDOW_WIDTH, 100)
-        )
+        panel.fill(INVENTORY_BG)
         
         # Заголовок
-        title_text = self.font.render(
+        title_text = self._render_text(
+            self.font,
             f"Инвентарь ({self.game.get_inventory_count()}/{self.game.inventory.max_size})",
-            True,
             TEXT_COLOR
         )
-        self.screen.blit(title_text, (10, WINDOW_HEIGHT - 95))
+        panel.blit(title_text, (10, 5))
         
         # Отрисовка шариков в инвентаре
         slot_size = 60
         slot_margin = 10
         start_x = 10
-        start_y = WINDOW_HEIGHT - 60
+        start_y = 40
+        balls = self.game.inventory.balls
         
         for i in range(self.game.inventory.max_size):
             slot_x = start_x + i * (slot_size + slot_margin)
             
             # Рисуем слот
             pygame.draw.rect(
-                self.screen,
+                panel,
                 (220, 220, 220),
                 (slot_x, start_y, slot_size, slot_size),
                 0
             )
             pygame.draw.rect(
-                self.screen,
+                panel,
                 INVENTORY_BORDER,
                 (slot_x, start_y, slot_size, slot_size),
                 2
             )
             
             # Если в слоте есть шарик
-            if i < len(self.game.inventory.balls):
-                ball = self.game.inventory.balls[i]
+            if i < len(balls):
+                ball = balls[i]
                 center_x = slot_x + slot_size // 2
                 center_y = start_y + slot_size // 2
                 
@@ -304,7 +599,7 @@ class GameGUI:
                 
                 # Рисуем шарик
                 pygame.draw.circle(
-                    self.screen,
+                    panel,
                     ball.color.to_tuple(),
                     (center_x, center_y),
                     int(display_radius)
@@ -312,54 +607,122 @@ class GameGUI:
                 
                 # Обводка
                 pygame.draw.circle(
-                    self.screen,
+                    panel,
                     self._darken_color(ball.color),
                     (center_x, center_y),
                     int(display_radius),
                     2
                 )
+        return panel
     
-    def _draw_suck_radius(self, mouse_x: int, mouse_y: int):
-        """Отрисовывает радиус всасывания вокруг курсора."""
-        # Создаем полупрозрачную поверхность
-        radius_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-        pygame.draw.circle(
-            radius_surface,
-            SUCK_RADIUS_COLOR,
-            (mouse_x, mouse_y),
-            int(self.game.sucking_radius)
-        )
-        self.screen.blit(radius_surface, (0, 0))
+    def _draw_suck_radius(self, mouse_x: int, mouse_y: int) -> pygame.Rect:
+        """Отрисовывает радиус всасывания вокруг курсора и возвращает его область."""
+        radius = int(self.game.sucking_radius)
+        
+        # Полупрозрачный круг рисуется один раз на поверхности по его размеру
+        if self._suck_radius_surface is None or self._suck_radius_surface[0] != radius:
+            surface = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+            pygame.draw.circle(surface, SUCK_RADIUS_COLOR, (radius, radius), radius)
+            self._suck_radius_surface = (radius, surface)
+        area = self.screen.blit(self._suck_radius_surface[1], (mouse_x - radius, mouse_y - radius))
         
         # Граница радиуса
-        pygame.draw.circle(
+        return area.union(pygame.draw.circle(
             self.screen,
             (100, 100, 255),
             (mouse_x, mouse_y),
-            int(self.game.sucking_radius),
+            radius,
             2
-        )
+        ))
     
-    def _draw_info(self):
-        """Отрисовывает информацию о игре."""
+    def _draw_info(self) -> pygame.Rect:
+        """Отрисовывает информацию о игре и возвращает ее область."""
         # Количество шариков на поле
-        ball_count_text = self.small_font.render(
+        ball_count_text = self._render_text(
+            self.small_font,
             f"Шариков на поле: {self.game.get_ball_count()}",
-            True,
             TEXT_COLOR
         )
-        self.screen.blit(ball_count_text, (WINDOW_WIDTH - 200, 10))
+        area = self.screen.blit(ball_count_text, (WINDOW_WIDTH - 200, 10))
         
         # FPS
-        fps_text = self.small_font.render(
+        fps_text = self._render_text(
+            self.small_font,
             f"FPS: {int(self.clock.get_fps())}",
-            True,
             TEXT_COLOR
         )
-        self.screen.blit(fps_text, (WINDOW_WIDTH - 200, 35))
+        return area.union(self.screen.blit(fps_text, (WINDOW_WIDTH - 200, 35)))
+    
+    def _draw_profile(self) -> pygame.Rect:
+        """
+        Отрисовывает график времени кадров (логика и отрисовка) с
+        перцентилями и возвращает его область.
+        
+        Столбик - один кадр из скользящего окна профайлера; линия - бюджет
+        кадра при заданном FPS. Подписи обновляются раз в 30 кадров.
+        """
+        rect = pygame.Rect(WINDOW_WIDTH - 250, 60, 240, 120)
+        if self._profile_background is None:
+            self._profile_background = pygame.Surface(rect.size, pygame.SRCALPHA)
+            self._profile_background.fill((255, 255, 255, 200))
+            pygame.draw.rect(self._profile_background, INVENTORY_BORDER,
+                             self._profile_background.get_rect(), 1)
+        self.screen.blit(self._profile_background, rect)
+        
+        logic_color = globals().get('PROFILE_LOGIC_COLOR', (90, 130, 230))
+        draw_color = globals().get('PROFILE_DRAW_COLOR', (240, 150, 60))
+        graph = pygame.Rect(rect.x + 5, rect.y + 5, rect.width - 10, 60)
+        budget = 1000.0 / FPS  # Бюджет кадра, мс
+        scale = graph.height / (2 * budget)  # Пикселей на мс: по высоте два бюджета
+        
+        frames = self.profiler.frames
+        recent = list(frames)[-(graph.width // 2):]
+        logic_times = []
+        draw_times = []
+        for i, frame in enumerate(recent):
+            draw = sum(frame.get(name, 0.0) for name in DRAW_STAGES) * 1000
+            logic = sum(frame.values()) * 1000 - draw
+            logic_times.append(logic)
+            draw_times.append(draw)
+            x = graph.x + i * 2
+            logic_top = graph.bottom - min(graph.height, logic * scale)
+            draw_top = max(graph.top, logic_top - draw * scale)
+            pygame.draw.line(self.screen, logic_color, (x, graph.bottom), (x, logic_top))
+            pygame.draw.line(self.screen, draw_color, (x, logic_top), (x, draw_top))
+        budget_y = graph.bottom - int(budget * scale)
+        pygame.draw.line(self.screen, TEXT_COLOR, (graph.x, budget_y), (graph.right, budget_y))
+        
+        if not self._profile_lines or self.profiler.frame_count % 30 == 0:
+            self._profile_lines = [
+                self.small_font.render(
+                    f"{label}: {percentile(times, 50):.1f} / {percentile(times, 95):.1f}"
+                    f" / {percentile(times, 99):.1f} мс",
+                    True, color
+                )
+                for label, times, color in (("логика", logic_times, logic_color),
+                                            ("отрисовка", draw_times, draw_color))
+            ]
+        for i, line in enumerate(self._profile_lines):
+            self.screen.blit(line, (graph.x, graph.bottom + 5 + i * 22))
+        return rect
+    
+    def _draw_help(self) -> pygame.Rect:
+        """Отрисовывает справку по управлению и возвращает ее область."""
+        if self._help_layers is None:
+            self._help_layers = self._build_help_layers()
+        background, foreground, position = self._help_layers
+        
+        # Фон смешивается с текущей сценой, поэтому выводится каждый кадр
+        self.screen.blit(background, position)
+        return self.screen.blit(foreground, position)
     
-    def _draw_help(self):
-        """Отрисовывает справку по управлению."""
+    def _build_help_layers(self) -> Tuple[pygame.Surface, pygame.Surface, Tuple[int, int]]:
+        """
+        Строит слои справки: полупрозрачный фон и слой с рамкой и текстом.
+        
+        Returns:
+            (фон, передний план, позиция на экране)
+        """
         help_texts = [
             "Управление:",
             "ЛКМ - всосать шарик",
@@ -369,22 +732,50 @@ class GameGUI:
             "H - показать/скрыть справку",
             "ESC - выход"
         ]
+        if self.profiler is not None:
+            help_texts.insert(-1, "F3 - график времени кадра")
         
         # Фон для справки
         help_bg_rect = pygame.Rect(10, 10, 220, len(help_texts) * 25 + 10)
-        help_surface = pygame.Surface((help_bg_rect.width, help_bg_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(help_surface, (255, 255, 255, 200), help_surface.get_rect())
-        self.screen.blit(help_surface, (help_bg_rect.x, help_bg_rect.y))
-        
-        pygame.draw.rect(self.screen, INVENTORY_BORDER, help_bg_rect, 2)
+        background = pygame.Surface(help_bg_rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(background, (255, 255, 255, 200), background.get_rect())
         
-        # Текст справки
+        rendered = []
+        bounds = help_bg_rect.copy()
         for i, text in enumerate(help_texts):
-            if i == 0:
-                rendered_text = self.font.render(text, True, TEXT_COLOR)
-            else:
-                rendered_text = self.small_font.render(text, True, TEXT_COLOR)
-            self.screen.blit(rendered_text, (20, 15 + i * 25))
+            font = self.font if i == 0 else self.small_font
+            surface = self._render_text(font, text, TEXT_COLOR)
+            rect = surface.get_rect(topleft=(20, 15 + i * 25))
+            rendered.append((surface, rect))
+            bounds.union_ip(rect)
+        
+        # Прозрачный слой цвета текста: текст, выведенный на него, сохраняет
+        # свой цвет и альфу, поэтому результат совпадает с выводом на экран
+        foreground = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        foreground.fill((*TEXT_COLOR, 0))
+        pygame.draw.rect(foreground, INVENTORY_BORDER, help_bg_rect.move(-bounds.x, -bounds.y), 2)
+        for surface, rect in rendered:
+            foreground.blit(surface, rect.move(-bounds.x, -bounds.y))
+        
+        # Фон лежит в левом верхнем углу bounds (bounds содержит help_bg_rect)
+        if bounds.topleft != help_bg_rect.topleft:
+            shifted = pygame.Surface(bounds.size, pygame.SRCALPHA)
+            shifted.blit(background, (help_bg_rect.x - bounds.x, help_bg_rect.y - bounds.y))
+            background = shifted
+        return background, foreground, bounds.topleft
+    
+    def _render_text(self, font: pygame.font.Font, text: str,
+                     color: Tuple[int, int, int]) -> pygame.Surface:
+        """
+        Возвращает отрисованный текст из кэша.
+        
+        Неизменный текст отрисовывается один раз, а счетчики - только
+        когда меняется их значение.
+        """
+        return self.text_cache.get(
+            (font, text, color),
+            lambda: font.render(text, True, color)
+        )
     
     def _darken_color(self, color: Color) -> Tuple[int, int, int]:
         """Затемняет цвет для создания обводки."""
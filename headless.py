@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Запуск симуляции без графического интерфейса.
+Прогоняет заданное число тиков GameLogic без pygame и выводит
+пропускную способность и время по фазам обновления.
+
+Пример:
+    python3 headless.py --balls 5000 --ticks 300 --width 4000 --height 3000
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import List, Optional
+
+from logic import GameLogic, create_game_logic
+from profiling import PhaseProfiler, ProfileExporter
+from replay import ReplayRecorder
+
+# Фазы GameLogic.update в порядке выполнения
+PHASES = ('move', 'boundary', 'collisions', 'mixing', 'delete')
+
+# Тиков в окне перцентилей: память профайлера не растет с длиной прогона
+PROFILE_WINDOW = 10_000
+
+
+def build_game(balls: int, width: float, height: float, seed: int = 0,
+               backend: str = 'python', broad_phase: str = 'grid',
+               delete_zone: bool = False, ccd: bool = False,
+               workers: int = 2, record: Optional[str] = None) -> GameLogic:
+    """
+    Создает игровую логику со случайными шариками.
+
+    Args:
+        balls: Количество шариков
+        width: Ширина поля
+        height: Высота поля
+        seed: Зерно генератора случайных шариков
+        backend: Бэкенд симуляции ('python', 'numpy' или 'sharded')
+        broad_phase: Алгоритм поиска касаний ('grid', 'brute' или 'sap')
+        delete_zone: Добавить зону удаления в правом нижнем углу
+        ccd: Искать касания быстрых шариков по пути за тик
+        workers: Количество процессов-полос для бэкенда 'sharded'
+        record: Путь для записи сессии (см. replay.py); None - без записи
+
+    Returns:
+        Готовый к запуску GameLogic (при записи - обернутый в ReplayRecorder)
+    """
+    options = {'workers': workers} if backend == 'sharded' else {}
+    game = create_game_logic(width, height, backend=backend, broad_phase=broad_phase,
+                             continuous_collisions=ccd, seed=seed, **options)
+    if record:
+        game = ReplayRecorder(game, record)
+    if delete_zone:
+        size = min(width, height) * 0.1
+        game.set_delete_zone(width - size, height - size, size, size)
+    for _ in range(balls):
+        game.add_ball(game.create_random_ball())
+    return game
+
+
+def run_headless(game: GameLogic, ticks: int, dt: float = 1.0,
+                 exporter: Optional[ProfileExporter] = None,
+                 profile_window: int = PROFILE_WINDOW) -> dict:
+    """
+    Прогоняет симуляцию и собирает статистику.
+
+    Args:
+        game: Игровая логика
+        ticks: Количество тиков
+        dt: Шаг времени одного тика
+        exporter: Выгрузка времени фаз каждого тика (None - без выгрузки)
+        profile_window: Сколько последних тиков учитывают перцентили
+            (0 - только суммы времени фаз)
+
+    Returns:
+        Словарь с общим временем, пропускной способностью, временем фаз
+        и перцентилями времени фаз за тик (в миллисекундах)
+    """
+    profiler = PhaseProfiler(window=min(ticks, profile_window), exporter=exporter)
+    previous_profiler = game.profiler
+    game.profiler = profiler
+
+    ball_ticks = 0
+    start = time.perf_counter()
+    try:
+        for _ in range(ticks):
+            ball_ticks += game.get_ball_count()
+            game.update(dt)
+            profiler.end_frame()
+    finally:
+        game.profiler = previous_profiler
+    elapsed = time.perf_counter() - start
+
+    return {
+        'ticks': ticks,
+        'seconds': elapsed,
+        'ticks_per_second': ticks / elapsed if elapsed > 0 else 0.0,
+        'ball_ticks_per_second': ball_ticks / elapsed if elapsed > 0 else 0.0,
+        'final_ball_count': game.get_ball_count(),
+        'phases': {name: profiler.totals.get(name, 0.0) for name in PHASES},
+        'percentiles': {
+            name: {q: seconds * 1000 for q, seconds in profiler.percentiles(name).items()}
+            for name in PHASES
+        },
+    }
+
+
+def format_report(result: dict) -> str:
+    """Форматирует результат прогона в читаемый текст."""
+    lines = [
+        f"Тиков: {result['ticks']} за {result['seconds']:.3f} с",
+        f"Тиков/с: {result['ticks_per_second']:.1f}",
+        f"Шарико-тиков/с: {result['ball_ticks_per_second']:.0f}",
+        f"Шариков в конце: {result['final_ball_count']}",
+        "",
+        "Время по фазам:",
+    ]
+    phase_total = sum(result['phases'].values()) or 1.0
+    for name, seconds in result['phases'].items():
+        share = seconds / phase_total * 100
+        per_tick = seconds / result['ticks'] * 1000 if result['ticks'] else 0.0
+        lines.append(f"  {name:<11} {seconds:8.3f} с  {per_tick:8.3f} мс/тик  {share:5.1f}%")
+    lines.append("")
+    lines.append("Перцентили времени фазы за тик, мс:")
+    lines.append(f"  {'':<11} {'p50':>12} {'p95':>8} {'p99':>8}")
+    for name, stats in result['percentiles'].items():
+        lines.append(f"  {name:<11} {stats['p50']:12.3f} {stats['p95']:8.3f} {stats['p99']:8.3f}")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Запуск симуляции шариков без GUI с замером производительности"
+    )
+    parser.add_argument('--balls', type=int, default=1000, help="количество шариков")
+    parser.add_argument('--width', type=float, default=1000, help="ширина поля")
+    parser.add_argument('--height', type=float, default=600, help="высота поля")
+    parser.add_argument('--ticks', type=int, default=300, help="количество тиков")
+    parser.add_argument('--dt', type=float, default=1.0, help="шаг времени тика")
+    parser.add_argument('--seed', type=int, default=0, help="зерно генератора")
+    parser.add_argument('--backend', choices=('python', 'numpy', 'sharded'), default='python',
+                        help="бэкенд симуляции")
+    parser.add_argument('--workers', type=int, default=2,
+                        help="количество процессов-полос для --backend sharded")
+    parser.add_argument('--broad-phase', choices=GameLogic.BROAD_PHASES, default='grid',
+                        help="алгоритм поиска касаний")
+    parser.add_argument('--delete-zone', action='store_true',
+                        help="добавить зону удаления в правом нижнем углу")
+    parser.add_argument('--ccd', action='store_true',
+                        help="искать касания быстрых шариков по пути за тик")
+    parser.add_argument('--profile-export', metavar='PATH',
+                        help="выгрузить время фаз каждого тика (.csv или JSON lines)")
+    parser.add_argument('--profile-window', type=int, default=PROFILE_WINDOW, metavar='TICKS',
+                        help="сколько последних тиков учитывают перцентили")
+    parser.add_argument('--record', metavar='PATH',
+                        help="записать сессию для replay.py")
+    parser.add_argument('--json', action='store_true',
+                        help="вывести результат в формате JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Главная функция запуска."""
+    args = parse_args(argv)
+    game = build_game(args.balls, args.width, args.height, seed=args.seed,
+                      backend=args.backend, broad_phase=args.broad_phase,
+                      delete_zone=args.delete_zone, ccd=args.ccd,
+                      workers=args.workers, record=args.record)
+    exporter = ProfileExporter(args.profile_export, PHASES) if args.profile_export else None
+    try:
+        result = run_headless(game, args.ticks, dt=args.dt, exporter=exporter,
+                              profile_window=args.profile_window)
+    finally:
+        if exporter is not None:
+            exporter.close()
+        if hasattr(game, 'close'):
+            game.close()
+    result.update({
+        'balls': args.balls,
+        'width': args.width,
+        'height': args.height,
+        'seed': args.seed,
+        'backend': args.backend,
+        'workers': args.workers,
+        'broad_phase': args.broad_phase,
+        'ccd': args.ccd,
+    })
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(format_report(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,19 +4,87 @@
 взаимодействием и смешиванием цветов.
 """
 
+import hashlib
+import itertools
 import math
 import random
-from typing import List, Tuple, Optional
-from dataclasses import dataclass, field
+import struct
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Set, Tuple, Optional
+from dataclasses import FrozenInstanceError, dataclass, field, fields
 
+try:
+    import numpy as np
+except ImportError:  # NumPy - необязательная зависимость
+    np = None
 
-@dataclass
+from profiling import NO_PHASE, PhaseProfiler
+
+
+def _with_slots(cls):
+    """
+    Пересоздает dataclass с __slots__ вместо __dict__ у экземпляров.
+    
+    Аналог dataclass(slots=True) из Python 3.10 для более старых версий:
+    экземпляр хранит только поля и занимает заметно меньше памяти.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        namespace.pop(name, None)  # Значения по умолчанию уже в __init__
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = names
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    
+    if cls.__dataclass_params__.frozen:
+        # Запреты записи от dataclass ссылаются на старый класс через
+        # super(cls, self): создаем их заново для нового класса
+        def __setattr__(self, name, value):
+            if type(self) is slotted or name in names:
+                raise FrozenInstanceError(f"cannot assign to field {name!r}")
+            super(slotted, self).__setattr__(name, value)
+        
+        def __delattr__(self, name):
+            if type(self) is slotted or name in names:
+                raise FrozenInstanceError(f"cannot delete field {name!r}")
+            super(slotted, self).__delattr__(name)
+        
+        slotted.__setattr__ = __setattr__
+        slotted.__delattr__ = __delattr__
+    return slotted
+
+
+# Пул интернированных цветов: одинаковые цвета - один объект
+_interned_colors: Dict[Tuple[int, int, int], 'Color'] = {}
+_INTERN_LIMIT = 65536  # При переполнении пул очищается (цвета остаются валидными)
+
+
+@_with_slots
+@dataclass(frozen=True)
 class Color:
-    """Класс для представления цвета в формате RGB."""
+    """
+    Класс для представления цвета в формате RGB.
+    
+    Цвет неизменяемый, поэтому один объект можно безопасно разделять
+    между шариками (см. Color.intern).
+    """
     r: int  # 0-255
     g: int  # 0-255
     b: int  # 0-255
     
+    @classmethod
+    def intern(cls, r: int, g: int, b: int) -> 'Color':
+        """Возвращает общий объект для цвета (r, g, b), создавая его при необходимости."""
+        key = (r, g, b)
+        color = _interned_colors.get(key)
+        if color is None:
+            if len(_interned_colors) >= _INTERN_LIMIT:
+                _interned_colors.clear()
+            color = cls(r, g, b)
+            _interned_colors[key] = color
+        return color
+    
     def to_tuple(self) -> Tuple[int, int, int]:
         """Возвращает цвет в виде кортежа (r, g, b)."""
         return (self.r, self.g, self.b)
@@ -34,8 +102,25 @@ class Color:
         if not isinstance(other, Color):
             return False
         return self.r == other.r and self.g == other.g and self.b == other.b
+    
+    def __hash__(self):
+        return hash((self.r, self.g, self.b))
+    
+    def __reduce__(self):
+        # Неизменяемый объект со __slots__ нельзя восстановить через setattr
+        return (Color, (self.r, self.g, self.b))
+
 
+# Счетчик идентификаторов шариков: id уникален в пределах процесса
+_ball_ids = itertools.count(1)
 
+
+def take_ball_ids(count: int) -> Iterator[int]:
+    """Выдает count новых id шариков (для массовой загрузки шариков)."""
+    return itertools.islice(_ball_ids, count)
+
+
+@_with_slots
 @dataclass
 class Ball:
     """Класс для представления шарика."""
@@ -45,7 +130,7 @@ class Ball:
     vy: float  # Скорость по Y
     radius: float  # Радиус шарика
     color: Color  # Цвет шарика
-    id: int = field(default_factory=lambda: random.randint(0, 1000000))
+    id: int = field(default_factory=lambda: next(_ball_ids))
     
     def move(self, dt: float = 1.0):
         """Двигает шарик согласно его скорости."""
@@ -76,11 +161,12 @@ class Ball:
             vx=self.vx,
             vy=self.vy,
             radius=self.radius,
-            color=Color(self.color.r, self.color.g, self.color.b),
+            color=self.color,  # Цвет неизменяемый: копировать не нужно
             id=self.id
         )
 
 
+
 class ColorMixer:
     """Класс для смешивания цветов шариков."""
     
@@ -174,11 +260,153 @@ class ColorMixer:
         else:
             r, g, b = c, 0, x
         
-        return Color(
+        return Color.intern(
             int((r + m) * 255),
             int((g + m) * 255),
             int((b + m) * 255)
         )
+    
+    @staticmethod
+    def mix_many(colors_a, colors_b):
+        """
+        Смешивает массивы цветов попарно за один вызов.
+        
+        Выполняет те же операции, что и mix_colors, но над массивами NumPy,
+        поэтому результат побитово совпадает со скалярным путем.
+        
+        Args:
+            colors_a: Массив RGB-троек формы (N, 3)
+            colors_b: Массив RGB-троек формы (N, 3)
+            
+        Returns:
+            Массив смешанных RGB-троек формы (N, 3) с типом int64
+        """
+        if np is None:
+            raise ImportError("Для ColorMixer.mix_many нужен NumPy: pip install numpy")
+        
+        rgb1 = np.asarray(colors_a, dtype=np.float64).reshape(-1, 3)
+        rgb2 = np.asarray(colors_b, dtype=np.float64).reshape(-1, 3)
+        if rgb1.shape != rgb2.shape:
+            raise ValueError("Массивы цветов должны быть одинаковой длины")
+        
+        h1, s1, v1 = ColorMixer._rgb_to_hsv_many(rgb1)
+        h2, s2, v2 = ColorMixer._rgb_to_hsv_many(rgb2)
+        
+        # Тон: короткий путь через 0/360, если тона далеко друг от друга
+        wrapped = np.where(h1 > h2, (h1 + (h2 + 360)) / 2, (h2 + (h1 + 360)) / 2) % 360
+        new_h = np.where(np.abs(h1 - h2) > 180, wrapped, h1 * 0.5 + h2 * 0.5)
+        
+        # Насыщенность с усилением и яркость - как в mix_colors
+        new_s = np.minimum(100, (s1 + s2) / 2 * 1.2)
+        new_v = (v1 + v2) / 2
+        
+        return ColorMixer._hsv_to_rgb_many(new_h, new_s, new_v)
+    
+    @staticmethod
+    def _rgb_to_hsv_many(rgb) -> tuple:
+        """Конвертирует массив RGB (N, 3) в массивы H, S, V."""
+        r = rgb[:, 0] / 255.0
+        g = rgb[:, 1] / 255.0
+        b = rgb[:, 2] / 255.0
+        max_c = np.maximum(np.maximum(r, g), b)
+        min_c = np.minimum(np.minimum(r, g), b)
+        diff = max_c - min_c
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            h = np.where(
+                max_c == r, (60 * ((g - b) / diff) + 360) % 360,
+                np.where(max_c == g, (60 * ((b - r) / diff) + 120) % 360,
+                         (60 * ((r - g) / diff) + 240) % 360))
+            h = np.where(diff == 0, 0.0, h)
+            s = np.where(max_c == 0, 0.0, (diff / max_c) * 100)
+        v = max_c * 100
+        return h, s, v
+    
+    @staticmethod
+    def _hsv_to_rgb_many(h, s, v):
+        """Конвертирует массивы H, S, V в массив RGB (N, 3) с типом int64."""
+        s = s / 100.0
+        v = v / 100.0
+        c = v * s
+        x = c * (1 - np.abs((h / 60) % 2 - 1))
+        m = v - c
+        zero = np.zeros_like(h)
+        
+        sector = np.searchsorted(np.array([60.0, 120.0, 180.0, 240.0, 300.0]), h, side='right')
+        r = np.choose(sector, (c, x, zero, zero, x, c))
+        g = np.choose(sector, (x, c, c, x, zero, zero))
+        b = np.choose(sector, (zero, zero, x, c, c, x))
+        
+        result = np.empty((len(h), 3), dtype=np.int64)
+        result[:, 0] = (r + m) * 255
+        result[:, 1] = (g + m) * 255
+        result[:, 2] = (b + m) * 255
+        return result
+
+
+class CachedColorMixer(ColorMixer):
+    """
+    Смешивание цветов с ограниченным LRU-кэшем результатов.
+    
+    Пересекающиеся шарики касаются друг друга много кадров подряд, поэтому
+    одни и те же пары цветов смешиваются снова и снова. Результат берется
+    из кэша и побитово совпадает с ColorMixer.mix_colors.
+    """
+    
+    def __init__(self, max_size: int = 4096):
+        """
+        Инициализирует смеситель.
+        
+        Args:
+            max_size: Максимальное количество пар цветов в кэше
+        """
+        if max_size <= 0:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: 'OrderedDict[tuple, Color]' = OrderedDict()
+    
+    def mix_colors(self, color1: Color, color2: Color) -> Color:
+        """
+        Смешивает два цвета, используя кэш.
+        
+        Возвращаемый объект Color общий для всех попаданий в кэш,
+        его нельзя изменять на месте.
+        """
+        rgb1 = (color1.r, color1.g, color1.b)
+        rgb2 = (color2.r, color2.g, color2.b)
+        # Смешивание симметрично, поэтому (a, b) и (b, a) - одна запись
+        key = (rgb1, rgb2) if rgb1 <= rgb2 else (rgb2, rgb1)
+        
+        cache = self._cache
+        result = cache.get(key)
+        if result is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return result
+        
+        self.misses += 1
+        result = ColorMixer.mix_colors(color1, color2)
+        cache[key] = result
+        if len(cache) > self.max_size:
+            cache.popitem(last=False)
+        return result
+    
+    def cache_info(self) -> dict:
+        """Возвращает статистику кэша: попадания, промахи и заполненность."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._cache),
+            'max_size': self.max_size,
+        }
+    
+    def clear_cache(self):
+        """Очищает кэш и сбрасывает счетчики."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
 
 
 @dataclass
@@ -197,6 +425,94 @@ class DeleteZone:
     def contains_ball(self, ball: Ball) -> bool:
         """Проверяет, находится ли шарик в зоне удаления."""
         return self.contains_point(ball.x, ball.y)
+    
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Возвращает границы зоны (x0, y0, x1, y1) включительно."""
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+
+class BallStore:
+    """
+    Хранилище шариков с доступом по id.
+    
+    Шарики лежат в плотном списке, а словарь id -> индекс позволяет
+    добавлять и удалять шарик за O(1): удаленный шарик заменяется
+    последним элементом списка.
+    """
+    
+    def __init__(self):
+        """Инициализирует пустое хранилище."""
+        self.items: List[Ball] = []
+        self._index: Dict[int, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def __iter__(self) -> Iterator[Ball]:
+        return iter(self.items)
+    
+    def __contains__(self, ball: Ball) -> bool:
+        return ball.id in self._index
+    
+    def add(self, ball: Ball):
+        """
+        Добавляет шарик в конец хранилища.
+        
+        Raises:
+            ValueError: если шарик с таким id уже есть
+        """
+        if ball.id in self._index:
+            raise ValueError(f"Шарик с id {ball.id} уже добавлен")
+        self._index[ball.id] = len(self.items)
+        self.items.append(ball)
+    
+    def remove(self, ball: Ball) -> bool:
+        """
+        Удаляет шарик по id, перемещая на его место последний шарик.
+        
+        Returns:
+            True если шарик удален, False если его нет в хранилище
+        """
+        index = self._index.pop(ball.id, None)
+        if index is None:
+            return False
+        last = self.items.pop()
+        if index < len(self.items):
+            self.items[index] = last
+            self._index[last.id] = index
+        return True
+    
+    def retain(self, predicate) -> List[Ball]:
+        """
+        Оставляет только шарики, для которых predicate(ball) истинен.
+        
+        Выполняется за один проход и сохраняет порядок оставшихся шариков.
+        
+        Returns:
+            Список удаленных шариков
+        """
+        kept = []
+        removed = []
+        for ball in self.items:
+            (kept if predicate(ball) else removed).append(ball)
+        if removed:
+            self.items[:] = kept
+            self._index = {ball.id: i for i, ball in enumerate(kept)}
+        return removed
+    
+    def get(self, ball_id: int) -> Optional[Ball]:
+        """Возвращает шарик по id (None если шарика нет)."""
+        index = self._index.get(ball_id)
+        return None if index is None else self.items[index]
+    
+    def index_of(self, ball_id: int) -> Optional[int]:
+        """Возвращает индекс шарика в списке по id (None если шарика нет)."""
+        return self._index.get(ball_id)
+    
+    def clear(self):
+        """Удаляет все шарики."""
+        self.items.clear()
+        self._index.clear()
 
 
 class Inventory:
@@ -209,8 +525,19 @@ class Inventory:
         Args:
             max_size: Максимальное количество шариков (None = без ограничений)
         """
-        self.balls: List[Ball] = []
+        # Словарь сохраняет порядок добавления: последний шарик - на вершине
+        self._balls: Dict[int, Ball] = {}
+        self._ordered: Optional[List[Ball]] = None
         self.max_size = max_size
+        # Счетчик изменений: растет при каждом изменении содержимого
+        self.version = 0
+    
+    @property
+    def balls(self) -> List[Ball]:
+        """Шарики в инвентаре в порядке добавления (только для чтения)."""
+        if self._ordered is None:
+            self._ordered = list(self._balls.values())
+        return self._ordered
     
     def add_ball(self, ball: Ball) -> bool:
         """
@@ -218,10 +545,16 @@ class Inventory:
         
         Returns:
             True если шарик добавлен, False если инвентарь полон
+            
+        Raises:
+            ValueError: если шарик с таким id уже в инвентаре
         """
-        if self.max_size is not None and len(self.balls) >= self.max_size:
+        if self.is_full():
             return False
-        self.balls.append(ball)
+        if ball.id in self._balls:
+            raise ValueError(f"Шарик с id {ball.id} уже в инвентаре")
+        self._balls[ball.id] = ball
+        self._changed()
         return True
     
     def remove_ball(self, ball: Ball) -> bool:
@@ -231,79 +564,369 @@ class Inventory:
         Returns:
             True если шарик удален, False если шарика нет в инвентаре
         """
-        if ball in self.balls:
-            self.balls.remove(ball)
-            return True
-        return False
+        if self._balls.pop(ball.id, None) is None:
+            return False
+        self._changed()
+        return True
     
     def get_ball_at_index(self, index: int) -> Optional[Ball]:
         """Возвращает шарик по индексу."""
-        if 0 <= index < len(self.balls):
+        if 0 <= index < len(self._balls):
             return self.balls[index]
         return None
     
     def pop_ball(self) -> Optional[Ball]:
         """Извлекает последний шарик из инвентаря."""
-        if self.balls:
-            return self.balls.pop()
+        if self._balls:
+            self._changed()
+            return self._balls.popitem()[1]
         return None
     
+    def clear(self):
+        """Удаляет все шарики из инвентаря."""
+        if self._balls:
+            self._balls.clear()
+            self._changed()
+    
+    def _changed(self):
+        """Сбрасывает кэш списка и увеличивает счетчик изменений."""
+        self._ordered = None
+        self.version += 1
+    
     def is_full(self) -> bool:
         """Проверяет, полон ли инвентарь."""
-        return self.max_size is not None and len(self.balls) >= self.max_size
+        return self.max_size is not None and len(self._balls) >= self.max_size
     
     def is_empty(self) -> bool:
         """Проверяет, пуст ли инвентарь."""
-        return len(self.balls) == 0
+        return len(self._balls) == 0
     
     def size(self) -> int:
         """Возвращает количество шариков в инвентаре."""
-        return len(self.balls)
+        return len(self._balls)
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты действий ("ведро токенов").
+    
+    Токены накапливаются со скоростью rate за единицу времени симуляции,
+    но не больше burst. Каждое действие тратит один токен, поэтому подряд
+    можно выполнить не больше burst действий, а дальше - не чаще rate.
+    Время продвигает GameLogic.update, поэтому ограничение не останавливает
+    ни отрисовку, ни обработку событий.
+    """
+    
+    # Допуск на ошибку округления при накоплении дробных токенов
+    _EPSILON = 1e-9
+    
+    def __init__(self, rate: float, burst: float = 1.0):
+        """
+        Инициализирует ограничитель с полным запасом токенов.
+        
+        Args:
+            rate: Количество действий за единицу времени симуляции
+            burst: Максимальный запас токенов (действий подряд)
+        """
+        if rate <= 0:
+            raise ValueError("Частота должна быть положительной")
+        if burst < 1:
+            raise ValueError("Запас токенов должен быть не меньше одного")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+    
+    def advance(self, dt: float):
+        """Пополняет запас токенов за прошедшее время."""
+        if dt > 0:
+            self.tokens = min(self.burst, self.tokens + dt * self.rate)
+    
+    def ready(self) -> bool:
+        """Проверяет, можно ли выполнить действие сейчас."""
+        return self.tokens >= 1.0 - self._EPSILON
+    
+    def try_acquire(self) -> bool:
+        """
+        Тратит токен, если он есть.
+        
+        Returns:
+            True если действие разрешено, False если нужно подождать
+        """
+        if not self.ready():
+            return False
+        self.tokens = max(0.0, self.tokens - 1.0)
+        return True
+    
+    def reset(self):
+        """Восстанавливает полный запас токенов."""
+        self.tokens = float(self.burst)
+
+
+class SpatialGrid:
+    """
+    Равномерная сетка для поиска соседних шариков.
+    
+    Поле делится на квадратные ячейки размером cell_size. Если cell_size
+    не меньше удвоенного максимального радиуса, касающиеся шарики всегда
+    лежат в одной или в соседних ячейках. Сетка также отвечает на запросы
+    "какие объекты рядом с точкой" для курсора.
+    """
+    
+    # Соседи "вперед": вместе с самой ячейкой покрывают все пары ровно один раз
+    _FORWARD_NEIGHBOURS = ((1, -1), (1, 0), (1, 1), (0, 1))
+    
+    def __init__(self, cell_size: float):
+        """
+        Инициализирует сетку.
+        
+        Args:
+            cell_size: Размер ячейки сетки
+        """
+        if cell_size <= 0:
+            raise ValueError("Размер ячейки должен быть положительным")
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], list] = {}
+        # Ячейка, в которую попал объект при добавлении (по id(item))
+        self._item_cells: Dict[int, Tuple[int, int]] = {}
+    
+    def cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        """Возвращает координаты ячейки, в которую попадает точка."""
+        return (int(math.floor(x / self.cell_size)),
+                int(math.floor(y / self.cell_size)))
+    
+    def insert(self, item, x: float, y: float):
+        """Добавляет объект в ячейку, соответствующую точке (x, y)."""
+        cell = self.cell_of(x, y)
+        self.cells.setdefault(cell, []).append(item)
+        self._item_cells[id(item)] = cell
+    
+    def remove(self, item) -> bool:
+        """
+        Удаляет объект из ячейки, в которую он попал при добавлении.
+        
+        Координаты объекта могли измениться после insert, поэтому ячейка
+        берется из записи, а не из текущей позиции.
+        
+        Returns:
+            True если объект найден и удален
+        """
+        cell = self._item_cells.pop(id(item), None)
+        if cell is None:
+            return False
+        items = self.cells.get(cell)
+        if items:
+            for i, other in enumerate(items):
+                if other is item:
+                    del items[i]
+                    if not items:
+                        del self.cells[cell]
+                    return True
+        return False
+    
+    def query(self, x: float, y: float, reach: float) -> Iterator:
+        """Перебирает объекты из ячеек, пересекающих квадрат [x ± reach, y ± reach]."""
+        min_cx, min_cy = self.cell_of(x - reach, y - reach)
+        max_cx, max_cy = self.cell_of(x + reach, y + reach)
+        cells = self.cells
+        
+        # Для больших областей дешевле пройти по непустым ячейкам
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(cells):
+            for (cx, cy), items in cells.items():
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy:
+                    yield from items
+            return
+        
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                items = cells.get((cx, cy))
+                if items:
+                    yield from items
+    
+    def candidate_pairs(self) -> Iterator[tuple]:
+        """Перебирает пары объектов из одной или соседних ячеек."""
+        cells = self.cells
+        for (cx, cy), items in cells.items():
+            count = len(items)
+            for a in range(count):
+                for b in range(a + 1, count):
+                    yield items[a], items[b]
+            
+            for dx, dy in self._FORWARD_NEIGHBOURS:
+                neighbour = cells.get((cx + dx, cy + dy))
+                if neighbour:
+                    for item in items:
+                        for other in neighbour:
+                            yield item, other
 
 
 class GameLogic:
     """Основной класс игровой логики."""
     
-    def __init__(self, width: float, height: float):
+    # Доступные алгоритмы широкой фазы поиска столкновений
+    BROAD_PHASES = ('grid', 'brute', 'sap')
+    
+    # Запас к границам интервалов в sweep and prune: ошибки округления
+    # x ± radius не должны отсечь касающуюся пару
+    _SAP_MARGIN = 1e-6
+    
+    # Когда смешивать цвета касающихся шариков: 'overlap' - каждый тик
+    # касания, 'enter' - только в тик, когда касание началось
+    MIX_POLICIES = ('overlap', 'enter')
+    
+    def __init__(self, width: float, height: float,
+                 broad_phase: str = 'grid', cell_size: float = 60.0,
+                 color_cache_size: int = 4096, spatial_index: bool = True,
+                 continuous_collisions: bool = False, mix_policy: str = 'overlap',
+                 track_contacts: bool = False, seed: Optional[int] = None):
         """
         Инициализирует игровую логику.
         
         Args:
             width: Ширина игрового поля
             height: Высота игрового поля
+            broad_phase: Алгоритм поиска касаний: 'grid' (равномерная сетка),
+                'sap' (sweep and prune по оси X) или 'brute' (перебор всех пар)
+            cell_size: Размер ячейки сетки (обычно 2 * MAX_BALL_RADIUS)
+            color_cache_size: Размер кэша смешивания цветов (0 - без кэша)
+            spatial_index: Использовать сетку для запросов курсора
+                (всасывание, поиск шарика, шарики в области)
+            continuous_collisions: Искать касания быстрых шариков по всему
+                пути за тик, а не только в конечных позициях
+            mix_policy: Когда смешивать цвета: 'overlap' или 'enter'
+            track_contacts: Вести набор контактов и события начала/конца
+                касания (для политики 'enter' включается всегда)
+            seed: Зерно генератора случайных шариков (None - случайное);
+                с одинаковым зерном create_random_ball выдает одинаковые шарики
         """
+        if broad_phase not in self.BROAD_PHASES:
+            raise ValueError(f"Неизвестная широкая фаза: {broad_phase}")
+        if mix_policy not in self.MIX_POLICIES:
+            raise ValueError(f"Неизвестная политика смешивания: {mix_policy}")
         self.width = width
         self.height = height
-        self.balls: List[Ball] = []
+        self.broad_phase = broad_phase
+        self.cell_size = cell_size
+        self._store = BallStore()
+        self.spatial_index = spatial_index
+        self.continuous_collisions = continuous_collisions
+        self.mix_policy = mix_policy
+        self.track_contacts = track_contacts
+        # Собственный генератор: запуск воспроизводится по зерну (см. replay.py)
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Контакты между тиками: пары id (меньший, больший)
+        self._contacts: Set[Tuple[int, int]] = set()
+        # События последнего тика в порядке пар касания
+        self.entered_contacts: List[Tuple[int, int]] = []
+        self.exited_contacts: List[Tuple[int, int]] = []
+        # Сетка шариков по текущим позициям; сбрасывается при движении
+        self._grid: Optional[SpatialGrid] = None
+        self._grid_max_radius = 0.0
+        # Шарики, упорядоченные по левой границе, с прошлого тика (для 'sap')
+        self._sweep_order: Optional[List[Ball]] = None
+        # id удаленных шариков, еще лежащих в _sweep_order (убираются при сортировке)
+        self._sweep_removed: Set[int] = set()
+        # Замер времени фаз update (None - замер отключен)
+        self.profiler: Optional[PhaseProfiler] = None
         self.inventory = Inventory(max_size=10)  # Максимум 10 шариков в инвентаре
-        self.delete_zone: Optional[DeleteZone] = None
+        # Зоны удаления: шарик, центр которого попал в любую из них, удаляется
+        self.delete_zones: List[DeleteZone] = []
+        # Шарики, удаленные зонами в последнем тике: (id, итоговый цвет)
+        self.removed_balls: List[Tuple[int, Color]] = []
         self.sucking_radius = 50.0  # Радиус "всасывания" от курсора
-        self.color_mixer = ColorMixer()
+        # Ограничение частоты выплевывания (None - без ограничения)
+        self.spit_limiter: Optional[RateLimiter] = None
+        if color_cache_size > 0:
+            self.color_mixer: ColorMixer = CachedColorMixer(color_cache_size)
+        else:
+            self.color_mixer = ColorMixer()
+    
+    @property
+    def delete_zone(self) -> Optional[DeleteZone]:
+        """Первая зона удаления (None если зон нет)."""
+        return self.delete_zones[0] if self.delete_zones else None
+    
+    @delete_zone.setter
+    def delete_zone(self, zone: Optional[DeleteZone]):
+        self.delete_zones = [zone] if zone is not None else []
     
     def set_delete_zone(self, x: float, y: float, width: float, height: float):
-        """Устанавливает зону удаления на экране."""
-        self.delete_zone = DeleteZone(x, y, width, height)
+        """Устанавливает единственную зону удаления на экране."""
+        self.delete_zones = [DeleteZone(x, y, width, height)]
+    
+    def add_delete_zone(self, x: float, y: float, width: float,
+                        height: float) -> DeleteZone:
+        """Добавляет еще одну зону удаления."""
+        zone = DeleteZone(x, y, width, height)
+        self.delete_zones.append(zone)
+        return zone
+    
+    def set_spit_rate(self, rate: Optional[float], burst: float = 1.0):
+        """
+        Ограничивает частоту выплевывания шариков.
+        
+        Args:
+            rate: Шариков за единицу времени симуляции (dt = 1.0 - один кадр
+                при 60 FPS); None снимает ограничение
+            burst: Сколько шариков можно выплюнуть подряд без ожидания
+        """
+        self.spit_limiter = RateLimiter(rate, burst) if rate is not None else None
+    
+    @property
+    def balls(self) -> List[Ball]:
+        """
+        Шарики на поле (только для чтения: изменяйте через add/remove_ball).
+        
+        После ручного сдвига шариков вызовите invalidate_spatial_index().
+        """
+        return self._store.items
     
     def add_ball(self, ball: Ball):
         """Добавляет шарик на игровое поле."""
-        self.balls.append(ball)
+        self._store.add(ball)
+        if self._grid is not None:
+            if 2 * ball.radius > self._grid.cell_size:
+                # Ячейка меньше диаметра нового шарика: сетку нужно перестроить
+                self._grid = None
+            else:
+                self._grid.insert(ball, ball.x, ball.y)
+                self._grid_max_radius = max(self._grid_max_radius, ball.radius)
+        if self._sweep_order is not None:
+            self._sweep_order.append(ball)
     
     def remove_ball(self, ball: Ball):
-        """Удаляет шарик с игрового поля."""
-        if ball in self.balls:
-            self.balls.remove(ball)
+        """
+        Удаляет шарик с игрового поля за O(1).
+        
+        На место удаленного шарика встает последний шарик списка.
+        """
+        stored = self._store.get(ball.id)
+        if stored is None:
+            return
+        self._store.remove(stored)
+        if self._grid is not None:
+            self._grid.remove(stored)
+        if self._sweep_order is not None:
+            self._sweep_removed.add(stored.id)
+    
+    def get_ball_by_id(self, ball_id: int) -> Optional[Ball]:
+        """Возвращает шарик на поле по id (None если шарика нет)."""
+        return self._store.get(ball_id)
     
     def create_random_ball(self) -> Ball:
-        """Создает случайный шарик."""
-        x = random.uniform(50, self.width - 50)
-        y = random.uniform(50, self.height - 50)
-        vx = random.uniform(-2, 2)
-        vy = random.uniform(-2, 2)
-        radius = random.uniform(15, 30)
+        """Создает случайный шарик из генератора игры (см. seed)."""
+        rng = self.rng
+        x = rng.uniform(50, self.width - 50)
+        y = rng.uniform(50, self.height - 50)
+        vx = rng.uniform(-2, 2)
+        vy = rng.uniform(-2, 2)
+        radius = rng.uniform(15, 30)
         color = Color(
-            random.randint(50, 255),
-            random.randint(50, 255),
-            random.randint(50, 255)
+            rng.randint(50, 255),
+            rng.randint(50, 255),
+            rng.randint(50, 255)
         )
         return Ball(x, y, vx, vy, radius, color)
     
@@ -314,23 +937,87 @@ class GameLogic:
         Args:
             dt: Временной шаг (дельта времени)
         """
-        # Двигаем все шарики
+        if self.spit_limiter is not None:
+            self.spit_limiter.advance(dt)
+        
+        # Двигаем все шарики (сетка по старым позициям больше не годится)
+        with self._phase('move'):
+            start = self._positions() if self.continuous_collisions else None
+            self._move_balls(dt)
+        with self._phase('boundary'):
+            self._handle_boundaries()
+        self._grid = None
+        
+        # Проверяем столкновения и смешиваем цвета
+        with self._phase('collisions'):
+            pairs = self.find_touching_pairs()
+            if start is not None:
+                swept = self._find_swept_pairs(start)
+                if swept:
+                    # Пересечений нет: касающиеся в конце тика сюда не попадают
+                    pairs = sorted(pairs + swept)
+            if self.track_contacts or self.mix_policy == 'enter':
+                pairs = self._update_contacts(pairs)
+        with self._phase('mixing'):
+            self._mix_pairs(pairs)
+        
+        # Проверяем, какие шарики в зоне удаления
+        with self._phase('delete'):
+            self._handle_delete_zone()
+    
+    def _phase(self, name: str):
+        """Возвращает контекст замера фазы (заглушку, если замер отключен)."""
+        if self.profiler is None:
+            return NO_PHASE
+        return self.profiler.phase(name)
+    
+    def _move_balls(self, dt: float):
+        """Двигает все шарики согласно их скорости."""
         for ball in self.balls:
             ball.move(dt)
+    
+    def _handle_boundaries(self):
+        """Обрабатывает отскок всех шариков от границ поля."""
+        for ball in self.balls:
             self._handle_boundary_collision(ball)
+    
+    def _handle_delete_zone(self):
+        """
+        Удаляет шарики, попавшие в зоны удаления, и запоминает их
+        в removed_balls.
         
-        # Проверяем столкновения и смешиваем цвета
-        self._handle_ball_collisions()
+        Все зоны проверяются за один проход с сохранением порядка: границы
+        зон вычисляются заранее, а общий охватывающий прямоугольник сразу
+        отсекает шарики вдали от зон.
+        """
+        self.removed_balls = []
+        if not self.delete_zones:
+            return
+        bounds = [zone.bounds() for zone in self.delete_zones]
+        left = min(b[0] for b in bounds)
+        top = min(b[1] for b in bounds)
+        right = max(b[2] for b in bounds)
+        bottom = max(b[3] for b in bounds)
         
-        # Проверяем, какие шарики в зоне удаления
-        if self.delete_zone:
-            balls_to_remove = []
-            for ball in self.balls:
-                if self.delete_zone.contains_ball(ball):
-                    balls_to_remove.append(ball)
-            
-            for ball in balls_to_remove:
-                self.remove_ball(ball)
+        def outside(ball: Ball) -> bool:
+            x = ball.x
+            y = ball.y
+            if not (left <= x <= right and top <= y <= bottom):
+                return True
+            for x0, y0, x1, y1 in bounds:
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    return False
+            return True
+        
+        removed = self._store.retain(outside)
+        if not removed:
+            return
+        self.removed_balls = [(ball.id, ball.color) for ball in removed]
+        if self._grid is not None:
+            for ball in removed:
+                self._grid.remove(ball)
+        if self._sweep_order is not None:
+            self._sweep_removed.update(ball.id for ball in removed)
     
     def _handle_boundary_collision(self, ball: Ball):
         """Обрабатывает столкновение шарика с границами экрана."""
@@ -352,20 +1039,341 @@ class GameLogic:
     
     def _handle_ball_collisions(self):
         """Обрабатывает столкновения шариков и смешивание цветов."""
+        pairs = self.find_touching_pairs()
+        if self.track_contacts or self.mix_policy == 'enter':
+            pairs = self._update_contacts(pairs)
+        self._mix_pairs(pairs)
+    
+    @property
+    def contacts(self) -> Set[Tuple[int, int]]:
+        """Пары id касающихся шариков после последнего тика (только для чтения)."""
+        return self._contacts
+    
+    def _update_contacts(self, pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Обновляет набор контактов и события начала/конца касания.
+        
+        Args:
+            pairs: Касающиеся пары индексов этого тика
+        
+        Returns:
+            Пары для смешивания по политике mix_policy: все касающиеся
+            или только те, у которых касание началось в этом тике
+        """
+        keys = self._pair_keys(pairs)
+        previous = self._contacts
+        current = set(keys)
+        entered = [key not in previous for key in keys]
+        self.entered_contacts = [key for key, new in zip(keys, entered) if new]
+        self.exited_contacts = sorted(previous - current)
+        self._contacts = current
+        if self.mix_policy == 'enter':
+            return [pair for pair, new in zip(pairs, entered) if new]
+        return pairs
+    
+    def _pair_keys(self, pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Переводит пары индексов в пары id (меньший id первым)."""
+        balls = self.balls
+        keys = []
+        for i, j in pairs:
+            id1 = balls[i].id
+            id2 = balls[j].id
+            keys.append((id1, id2) if id1 < id2 else (id2, id1))
+        return keys
+    
+    def _mix_pairs(self, pairs: List[Tuple[int, int]]):
+        """Смешивает цвета касающихся шариков в порядке списка пар."""
+        for i, j in pairs:
+            ball1 = self.balls[i]
+            ball2 = self.balls[j]
+            
+            # Смешиваем цвета
+            new_color = self.color_mixer.mix_colors(ball1.color, ball2.color)
+            ball1.color = new_color
+            ball2.color = new_color
+            
+            # Шарики НЕ отталкиваются (по требованию)
+            # Просто продолжают двигаться
+    
+    def find_touching_pairs(self) -> List[Tuple[int, int]]:
+        """
+        Находит все пары касающихся шариков.
+        
+        Returns:
+            Отсортированный список пар индексов (i, j), i < j. Порядок
+            совпадает для всех алгоритмов широкой фазы, поэтому результат
+            смешивания от выбора алгоритма не зависит.
+        """
+        if self.broad_phase == 'brute':
+            return self._find_touching_pairs_brute()
+        if self.broad_phase == 'sap':
+            return self._find_touching_pairs_sap()
+        return self._find_touching_pairs_grid()
+    
+    def _find_touching_pairs_brute(self) -> List[Tuple[int, int]]:
+        """Перебирает все пары шариков (O(n²))."""
+        pairs = []
         n = len(self.balls)
         for i in range(n):
             for j in range(i + 1, n):
-                ball1 = self.balls[i]
-                ball2 = self.balls[j]
-                
-                if ball1.is_touching(ball2):
-                    # Смешиваем цвета
-                    new_color = self.color_mixer.mix_colors(ball1.color, ball2.color)
-                    ball1.color = new_color
-                    ball2.color = new_color
-                    
-                    # Шарики НЕ отталкиваются (по требованию)
-                    # Просто продолжают двигаться
+                if self.balls[i].is_touching(self.balls[j]):
+                    pairs.append((i, j))
+        return pairs
+    
+    def _find_touching_pairs_grid(self) -> List[Tuple[int, int]]:
+        """Проверяет только шарики из одной или соседних ячеек сетки."""
+        if not self.balls:
+            return []
+        
+        index_of = self._store.index_of
+        pairs = []
+        for ball1, ball2 in self._spatial_index().candidate_pairs():
+            if ball1.is_touching(ball2):
+                i = index_of(ball1.id)
+                j = index_of(ball2.id)
+                pairs.append((i, j) if i < j else (j, i))
+        pairs.sort()
+        return pairs
+    
+    def _find_touching_pairs_sap(self) -> List[Tuple[int, int]]:
+        """
+        Sweep and prune: проход по шарикам, отсортированным по левой границе.
+        
+        Для каждого шарика проверяются только следующие за ним шарики,
+        чей интервал по X начинается до его правой границы; кандидаты
+        дополнительно отсекаются по перекрытию интервалов по Y. В отличие
+        от сетки, стоимость не зависит от разброса радиусов.
+        """
+        if len(self.balls) < 2:
+            return []
+        order, lefts = self._sorted_sweep_order()
+        xs = [ball.x for ball in order]
+        ys = [ball.y for ball in order]
+        radii = [ball.radius for ball in order]
+        sqrt = math.sqrt
+        margin = self._SAP_MARGIN
+        count = len(order)
+        found = []
+        for a in range(count):
+            x1 = xs[a]
+            y1 = ys[a]
+            r1 = radii[a]
+            right = x1 + r1 + margin
+            b = a + 1
+            while b < count and lefts[b] <= right:
+                reach = r1 + radii[b]
+                dy = y1 - ys[b]
+                if abs(dy) <= reach + margin:
+                    # Та же проверка, что и в Ball.is_touching
+                    dx = x1 - xs[b]
+                    if sqrt(dx * dx + dy * dy) <= reach:
+                        found.append((a, b))
+                b += 1
+        
+        index_of = self._store.index_of
+        pairs = []
+        for a, b in found:
+            i = index_of(order[a].id)
+            j = index_of(order[b].id)
+            pairs.append((i, j) if i < j else (j, i))
+        pairs.sort()
+        return pairs
+    
+    def _sorted_sweep_order(self) -> Tuple[List[Ball], List[float]]:
+        """
+        Упорядочивает шарики по левой границе (x - radius).
+        
+        Между тиками шарики сдвигаются на несколько пикселей, поэтому
+        порядок прошлого тика почти верен и досортировывается вставками
+        за O(n + число перестановок). Полная сортировка нужна только
+        в первый раз. Удаленные между тиками шарики отмечены в
+        _sweep_removed и выбрасываются из порядка здесь же.
+        
+        Returns:
+            Шарики по возрастанию левой границы и сами левые границы
+        """
+        order = self._sweep_order
+        if order is None:
+            order = sorted(self.balls, key=lambda ball: ball.x - ball.radius)
+            self._sweep_order = order
+            return order, [ball.x - ball.radius for ball in order]
+        
+        if self._sweep_removed:
+            removed = self._sweep_removed
+            get = self._store.get
+            kept = set()
+            live = []
+            for ball in order:
+                if ball.id in removed:
+                    # Шарик мог вернуться на поле: оставляем одну живую запись
+                    if get(ball.id) is not ball or ball.id in kept:
+                        continue
+                    kept.add(ball.id)
+                live.append(ball)
+            order[:] = live
+            removed.clear()
+        
+        lefts = [ball.x - ball.radius for ball in order]
+        for k in range(1, len(order)):
+            left = lefts[k]
+            if lefts[k - 1] <= left:
+                continue
+            ball = order[k]
+            m = k - 1
+            while m >= 0 and lefts[m] > left:
+                lefts[m + 1] = lefts[m]
+                order[m + 1] = order[m]
+                m -= 1
+            lefts[m + 1] = left
+            order[m + 1] = ball
+        return order, lefts
+    
+    def _positions(self) -> List[Tuple[float, float]]:
+        """Возвращает текущие позиции шариков в порядке списка balls."""
+        return [(ball.x, ball.y) for ball in self.balls]
+    
+    @staticmethod
+    def _swept_contact(px: float, py: float, vx: float, vy: float,
+                       end_dx: float, end_dy: float, reach: float) -> bool:
+        """
+        Проверяет касание двух шариков во время тика (time of impact).
+        
+        Шарики движутся по прямой от начальных позиций к конечным. Засчитываются
+        только "проскоки": относительное смещение больше суммы радиусов, а
+        в начале и в конце тика шарики не касаются.
+        
+        Args:
+            px, py: Смещение второго шарика относительно первого в начале тика
+            vx, vy: Относительное смещение за тик
+            end_dx, end_dy: Разность конечных позиций (как в is_touching)
+            reach: Сумма радиусов
+        """
+        vv = vx * vx + vy * vy
+        if vv <= reach * reach:
+            return False
+        if math.sqrt(px * px + py * py) <= reach:
+            return False  # Касались в начале тика: уже смешаны на прошлом
+        if math.sqrt(end_dx * end_dx + end_dy * end_dy) <= reach:
+            return False  # Касаются в конце тика: найдены обычным поиском
+        # Момент наибольшего сближения на отрезке [0, 1]
+        t = min(1.0, max(0.0, -(px * vx + py * vy) / vv))
+        cx = px + vx * t
+        cy = py + vy * t
+        return math.sqrt(cx * cx + cy * cy) <= reach
+    
+    def _find_swept_pairs(self, start: List[Tuple[float, float]]) -> List[Tuple[int, int]]:
+        """
+        Находит пары, проскочившие друг сквозь друга за тик.
+        
+        Проскочить могут только пары, где хотя бы один шарик сместился
+        больше своего радиуса. Для таких "быстрых" шариков кандидаты
+        берутся из сетки вокруг середины пути; пары быстрых шариков
+        проверяются между собой напрямую.
+        
+        Отскок от границы срезает путь: он считается прямым отрезком
+        от начальной позиции к конечной.
+        
+        Args:
+            start: Позиции шариков до движения (см. _positions)
+        
+        Returns:
+            Отсортированный список пар индексов (i, j), i < j
+        """
+        balls = self.balls
+        fast = []
+        for i, ball in enumerate(balls):
+            sx, sy = start[i]
+            dx = ball.x - sx
+            dy = ball.y - sy
+            if dx * dx + dy * dy > ball.radius * ball.radius:
+                fast.append(i)
+        if not fast:
+            return []
+        
+        def check(i: int, j: int) -> bool:
+            ball1, ball2 = balls[i], balls[j]
+            sx1, sy1 = start[i]
+            sx2, sy2 = start[j]
+            return self._swept_contact(
+                sx2 - sx1, sy2 - sy1,
+                (ball2.x - sx2) - (ball1.x - sx1), (ball2.y - sy2) - (ball1.y - sy1),
+                ball1.x - ball2.x, ball1.y - ball2.y,
+                ball1.radius + ball2.radius
+            )
+        
+        grid = self._spatial_index()
+        index_of = self._store.index_of
+        fast_set = set(fast)
+        pairs = set()
+        for i in fast:
+            ball = balls[i]
+            sx, sy = start[i]
+            half_path = math.hypot(ball.x - sx, ball.y - sy) / 2
+            # Медленный шарик сместился не больше своего радиуса
+            reach = half_path + ball.radius + 2 * self._grid_max_radius
+            for other in grid.query((sx + ball.x) / 2, (sy + ball.y) / 2, reach):
+                j = index_of(other.id)
+                if j not in fast_set and check(i, j):
+                    pairs.add((i, j) if i < j else (j, i))
+        for a, i in enumerate(fast):
+            for j in fast[a + 1:]:
+                if check(i, j):
+                    pairs.add((i, j))
+        return sorted(pairs)
+    
+    def _spatial_index(self) -> SpatialGrid:
+        """
+        Возвращает сетку шариков по текущим позициям, строя ее при необходимости.
+        
+        Сетка перестраивается после движения в update и поддерживается
+        в актуальном состоянии при добавлении и удалении шариков.
+        """
+        if self._grid is None:
+            balls = self.balls
+            max_radius = max((ball.radius for ball in balls), default=0.0)
+            # Ячейка не может быть меньше диаметра самого большого шарика,
+            # иначе касающиеся шарики окажутся не в соседних ячейках
+            grid = SpatialGrid(max(self.cell_size, 2 * max_radius))
+            for ball in balls:
+                grid.insert(ball, ball.x, ball.y)
+            self._grid = grid
+            self._grid_max_radius = max_radius
+        return self._grid
+    
+    def invalidate_spatial_index(self):
+        """
+        Сбрасывает сетку запросов курсора.
+        
+        Сетка перестраивается в update, а add_ball, spit_ball_at_position
+        и remove_ball поддерживают ее сами. Если шарики из balls сдвинуты
+        (или изменен их радиус) вручную между тиками, вызовите этот метод:
+        иначе запросы будут искать сдвинутые шарики на старых местах.
+        """
+        self._grid = None
+    
+    def _query_candidates(self, x: float, y: float,
+                          reach: Optional[float] = None) -> List[Ball]:
+        """
+        Возвращает шарики, центры которых могут лежать ближе reach к точке.
+        
+        Шарики идут в порядке списка balls, поэтому запросы возвращают те же
+        шарики, что и полный перебор. Без reach берется максимальный радиус
+        шарика (для попадания точки внутрь шарика).
+        """
+        if not self.spatial_index:
+            return self.balls
+        grid = self._spatial_index()
+        if reach is None:
+            reach = self._grid_max_radius
+        index_of = self._store.index_of
+        found = []
+        for ball in grid.query(x, y, reach):
+            index = index_of(ball.id)
+            # Шарика с таким id уже нет на поле (или это другой объект)
+            if index is not None and self.balls[index] is ball:
+                found.append((index, ball))
+        found.sort(key=lambda item: item[0])
+        return [ball for _, ball in found]
     
     def suck_ball_at_position(self, mouse_x: float, mouse_y: float) -> bool:
         """
@@ -385,7 +1393,7 @@ class GameLogic:
         closest_ball = None
         min_distance = self.sucking_radius
         
-        for ball in self.balls:
+        for ball in self._query_candidates(mouse_x, mouse_y, self.sucking_radius):
             distance = math.sqrt((ball.x - mouse_x) ** 2 + (ball.y - mouse_y) ** 2)
             if distance < min_distance:
                 min_distance = distance
@@ -412,9 +1420,12 @@ class GameLogic:
             
         Returns:
             True если шарик был выплюнут, False если инвентарь пуст
+            или не истекла пауза между выплевываниями (см. set_spit_rate)
         """
         if self.inventory.is_empty():
             return False
+        if self.spit_limiter is not None and not self.spit_limiter.try_acquire():
+            return False
         
         ball = self.inventory.pop_ball()
         if ball:
@@ -441,7 +1452,7 @@ class GameLogic:
         Returns:
             Ball если найден, None иначе
         """
-        for ball in self.balls:
+        for ball in self._query_candidates(x, y):
             if ball.is_point_inside(x, y):
                 return ball
         return None
@@ -459,7 +1470,7 @@ class GameLogic:
             Список шариков в области
         """
         balls_in_area = []
-        for ball in self.balls:
+        for ball in self._query_candidates(x, y, radius):
             distance = math.sqrt((ball.x - x) ** 2 + (ball.y - y) ** 2)
             if distance <= radius:
                 balls_in_area.append(ball)
@@ -473,13 +1484,66 @@ class GameLogic:
         """Возвращает количество шариков в инвентаре."""
         return self.inventory.size()
     
+    def state_checksum(self) -> int:
+        """
+        Возвращает 64-битную контрольную сумму состояния поля.
+        
+        Учитывает количество шариков на поле и в инвентаре, позиции
+        и цвета шариков в порядке хранения. id не учитываются: они
+        уникальны в пределах процесса и от зерна не зависят.
+        Одинаковое состояние дает одинаковую сумму на всех бэкендах.
+        """
+        balls = self.balls
+        count = len(balls)
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(struct.pack('<QQ', count, self.inventory.size()))
+        digest.update(struct.pack(f'<{count}d', *[ball.x for ball in balls]))
+        digest.update(struct.pack(f'<{count}d', *[ball.y for ball in balls]))
+        digest.update(bytes([
+            channel for ball in balls
+            for channel in (ball.color.r, ball.color.g, ball.color.b)
+        ]))
+        return int.from_bytes(digest.digest(), 'little')
+    
     def clear_all_balls(self):
         """Удаляет все шарики с поля."""
-        self.balls.clear()
+        self._store.clear()
+        self._grid = None
+        self._sweep_order = None
+        self._sweep_removed = set()
+        self._contacts = set()
     
     def clear_inventory(self):
         """Очищает инвентарь."""
-        self.inventory.balls.clear()
+        self.inventory.clear()
+
+
+def create_game_logic(width: float, height: float, backend: str = 'python',
+                      **kwargs) -> GameLogic:
+    """
+    Создает игровую логику с выбранным бэкендом симуляции.
+    
+    Args:
+        width: Ширина игрового поля
+        height: Высота игрового поля
+        backend: 'python' (объекты Ball), 'numpy' (массивы NumPy) или
+            'sharded' (массивы в общей памяти, полосы поля в отдельных процессах)
+        **kwargs: Дополнительные параметры конструктора GameLogic
+            (для 'sharded' также workers)
+        
+    Returns:
+        Экземпляр GameLogic, NumpyGameLogic или ShardedGameLogic
+    """
+    if backend == 'python':
+        return GameLogic(width, height, **kwargs)
+    if backend == 'numpy':
+        # Импортируем лениво: NumPy - необязательная зависимость
+        from logic_numpy import NumpyGameLogic
+        return NumpyGameLogic(width, height, **kwargs)
+    if backend == 'sharded':
+        from sharded import ShardedGameLogic
+        return ShardedGameLogic(width, height, **kwargs)
+    raise ValueError(f"Неизвестный бэкенд симуляции: {backend}")
 
 
 # Вспомогательные функции для создания предустановленных цветов
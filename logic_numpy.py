@@ -0,0 +1,786 @@
+"""
+NumPy-бэкенд игровой логики для игры про шарики.
+Хранит состояние шариков в непрерывных массивах (structure of arrays)
+и выполняет движение, отскоки и удаление векторизованно.
+
+Требует NumPy (необязательная зависимость): pip install numpy
+"""
+
+import hashlib
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from logic import Ball, Color, GameLogic, take_ball_ids
+
+# Соседние ячейки сетки "вперед" (см. SpatialGrid)
+GRID_OFFSETS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class BallView:
+    """
+    Представление шарика, хранящегося в массивах NumPyGameLogic.
+
+    Ведет себя как Ball: чтение и запись атрибутов идут напрямую в массивы.
+    Привязано к id шарика, поэтому остается корректным при удалении
+    других шариков.
+    """
+
+    __slots__ = ('_logic', '_id')
+
+    def __init__(self, logic: 'NumpyGameLogic', ball_id: int):
+        self._logic = logic
+        self._id = ball_id
+
+    def _index(self) -> int:
+        """Возвращает текущий индекс шарика в массивах."""
+        index = self._logic._index_of(self._id)
+        if index is None:
+            raise LookupError(f"Шарик {self._id} удален с игрового поля")
+        return index
+
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @property
+    def x(self) -> float:
+        return float(self._logic._x[self._index()])
+
+    @x.setter
+    def x(self, value: float):
+        self._logic._x[self._index()] = value
+
+    @property
+    def y(self) -> float:
+        return float(self._logic._y[self._index()])
+
+    @y.setter
+    def y(self, value: float):
+        self._logic._y[self._index()] = value
+
+    @property
+    def vx(self) -> float:
+        return float(self._logic._vx[self._index()])
+
+    @vx.setter
+    def vx(self, value: float):
+        self._logic._vx[self._index()] = value
+
+    @property
+    def vy(self) -> float:
+        return float(self._logic._vy[self._index()])
+
+    @vy.setter
+    def vy(self, value: float):
+        self._logic._vy[self._index()] = value
+
+    @property
+    def radius(self) -> float:
+        return float(self._logic._radius[self._index()])
+
+    @radius.setter
+    def radius(self, value: float):
+        self._logic._radius[self._index()] = value
+
+    @property
+    def color(self) -> Color:
+        index = self._index()
+        logic = self._logic
+        return Color.intern(int(logic._r[index]), int(logic._g[index]), int(logic._b[index]))
+
+    @color.setter
+    def color(self, value: Color):
+        index = self._index()
+        logic = self._logic
+        logic._r[index] = value.r
+        logic._g[index] = value.g
+        logic._b[index] = value.b
+
+    def move(self, dt: float = 1.0):
+        """Двигает шарик согласно его скорости (как Ball.move)."""
+        index = self._index()
+        logic = self._logic
+        logic._x[index] += logic._vx[index] * dt
+        logic._y[index] += logic._vy[index] * dt
+
+    # Поведение полностью совпадает с Ball
+    distance_to = Ball.distance_to
+    is_touching = Ball.is_touching
+    is_point_inside = Ball.is_point_inside
+    copy = Ball.copy
+
+    def __repr__(self) -> str:
+        return (f"BallView(id={self._id}, x={self.x}, y={self.y}, "
+                f"radius={self.radius}, color={self.color})")
+
+
+class NumpyGameLogic(GameLogic):
+    """
+    Игровая логика с хранением шариков в массивах NumPy.
+
+    Координаты, скорости, радиусы и компоненты цвета лежат в отдельных
+    непрерывных массивах, поэтому стоимость тика растет с пропускной
+    способностью памяти, а не с количеством байткода Python.
+    Атрибут balls возвращает список BallView для совместимости с GUI.
+    """
+
+    _INITIAL_CAPACITY = 64
+
+    # Можно ли принимать чужие массивы (load_arrays) как хранилище без копии
+    _ADOPT_ARRAYS = True
+
+    # Массивы состояния: имя атрибута и тип элементов
+    _FIELDS = (
+        ('_x', np.float64), ('_y', np.float64),
+        ('_vx', np.float64), ('_vy', np.float64),
+        ('_radius', np.float64),
+        ('_r', np.int64), ('_g', np.int64), ('_b', np.int64),
+        ('_ids', np.int64),
+    )
+
+    def __init__(self, width: float, height: float, **kwargs):
+        """
+        Инициализирует игровую логику.
+
+        Args:
+            width: Ширина игрового поля
+            height: Высота игрового поля
+            **kwargs: Параметры GameLogic (broad_phase, cell_size)
+        """
+        self._count = 0
+        self._allocate(self._INITIAL_CAPACITY)
+        self._views: Dict[int, BallView] = {}
+        self._id_to_index: Optional[Dict[int, int]] = {}
+        self._balls_cache: Optional[List[BallView]] = None
+        super().__init__(width, height, **kwargs)
+
+    # === Хранилище ===
+
+    def _allocate(self, capacity: int):
+        """Выделяет массивы заданной емкости, сохраняя текущие данные."""
+        count = self._count
+        get = self.__dict__.get
+        for name, dtype in self._FIELDS:
+            new = self._new_array(name, capacity, dtype)
+            old = get(name)
+            if old is not None:
+                new[:count] = old[:count]
+            setattr(self, name, new)
+
+    def _new_array(self, name: str, capacity: int, dtype) -> np.ndarray:
+        """Создает обнуленный массив состояния (переопределяется для общей памяти)."""
+        return np.zeros(capacity, dtype=dtype)
+
+    def _arrays(self) -> Tuple[np.ndarray, ...]:
+        """Возвращает все массивы состояния."""
+        return (self._x, self._y, self._vx, self._vy, self._radius,
+                self._r, self._g, self._b, self._ids)
+
+    def _invalidate(self):
+        """Сбрасывает кэши после изменения состава или порядка шариков."""
+        self._id_to_index = None
+        self._balls_cache = None
+
+    def _index_of(self, ball_id: int) -> Optional[int]:
+        """Возвращает индекс шарика по id (None если шарика нет)."""
+        if self._id_to_index is None:
+            ids = self._ids[:self._count].tolist()
+            self._id_to_index = {ball_id: i for i, ball_id in enumerate(ids)}
+        return self._id_to_index.get(ball_id)
+
+    def _view(self, ball_id: int) -> BallView:
+        """Возвращает (и кэширует) представление шарика."""
+        view = self._views.get(ball_id)
+        if view is None:
+            view = BallView(self, ball_id)
+            self._views[ball_id] = view
+        return view
+
+    def _compact(self, keep: np.ndarray):
+        """Оставляет только шарики, отмеченные маской keep (порядок сохраняется)."""
+        count = self._count
+        removed_ids = self._ids[:count][~keep].tolist()
+        kept = int(np.count_nonzero(keep))
+        for array in self._arrays():
+            array[:kept] = array[:count][keep]
+        self._count = kept
+        if self._sweep_order is not None:
+            # Переводим порядок sweep and prune на новые индексы
+            new_index = np.cumsum(keep) - 1
+            order = self._sweep_order_hint(count)
+            self._sweep_order = new_index[order[keep[order]]]
+        for ball_id in removed_ids:
+            self._views.pop(ball_id, None)
+        self._invalidate()
+
+    @property
+    def balls(self) -> List[BallView]:
+        """Шарики на поле в виде списка BallView."""
+        if self._balls_cache is None:
+            self._balls_cache = [self._view(ball_id)
+                                 for ball_id in self._ids[:self._count].tolist()]
+        return self._balls_cache
+
+    def add_ball(self, ball: Ball):
+        """
+        Добавляет шарик на игровое поле (данные копируются в массивы).
+
+        Raises:
+            ValueError: если шарик с таким id уже на поле
+        """
+        if self._index_of(ball.id) is not None:
+            raise ValueError(f"Шарик с id {ball.id} уже добавлен")
+        if self._count == len(self._x):
+            self._allocate(len(self._x) * 2)
+
+        index = self._count
+        self._x[index] = ball.x
+        self._y[index] = ball.y
+        self._vx[index] = ball.vx
+        self._vy[index] = ball.vy
+        self._radius[index] = ball.radius
+        color = ball.color
+        self._r[index] = color.r
+        self._g[index] = color.g
+        self._b[index] = color.b
+        self._ids[index] = ball.id
+        self._count += 1
+
+        if self._id_to_index is not None:
+            self._id_to_index[ball.id] = index
+        self._balls_cache = None
+
+    def remove_ball(self, ball: Ball):
+        """
+        Удаляет шарик с игрового поля за O(1).
+
+        Как и в GameLogic, на место удаленного шарика встает последний.
+        """
+        index = self._index_of(ball.id)
+        if index is None:
+            return
+        last = self._count - 1
+        if index < last:
+            for array in self._arrays():
+                array[index] = array[last]
+            self._id_to_index[int(self._ids[index])] = index
+        del self._id_to_index[ball.id]
+        self._views.pop(ball.id, None)
+        self._count = last
+        self._balls_cache = None
+
+    def load_arrays(self, arrays: Dict[str, np.ndarray]):
+        """
+        Заменяет шарики на поле шариками из массивов.
+
+        Массивы нужного типа (float64 для координат, скоростей и радиуса,
+        int64 для каналов цвета) становятся хранилищем без копирования -
+        например, столбцы снимка, отображенного в память (snapshot.py).
+        Шарики получают новые id.
+
+        Args:
+            arrays: Массивы одной длины с ключами x, y, vx, vy, radius, r, g, b
+        """
+        count = len(arrays['x'])
+        self.clear_all_balls()
+        if count == 0:
+            return
+        ids = np.fromiter(take_ball_ids(count), dtype=np.int64, count=count)
+        if self._ADOPT_ARRAYS:
+            for name, dtype in self._FIELDS:
+                if name != '_ids':
+                    setattr(self, name, np.asarray(arrays[name[1:]], dtype=dtype))
+            self._ids = ids
+        else:
+            if len(self._x) < count:
+                self._allocate(1 << (count - 1).bit_length())
+            for name, _ in self._FIELDS:
+                source = ids if name == '_ids' else arrays[name[1:]]
+                getattr(self, name)[:count] = source
+        self._count = count
+
+    def get_ball_by_id(self, ball_id: int) -> Optional[BallView]:
+        """Возвращает шарик на поле по id (None если шарика нет)."""
+        if self._index_of(ball_id) is None:
+            return None
+        return self._view(ball_id)
+
+    def clear_all_balls(self):
+        """Удаляет все шарики с поля."""
+        self._count = 0
+        self._views.clear()
+        self._invalidate()
+        self._sweep_order = None
+        self._contacts = set()
+
+    def get_ball_count(self) -> int:
+        """Возвращает количество шариков на поле."""
+        return self._count
+
+    def state_checksum(self) -> int:
+        """Контрольная сумма состояния, как GameLogic.state_checksum."""
+        n = self._count
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(struct.pack('<QQ', n, self.inventory.size()))
+        digest.update(self._x[:n].astype('<f8').tobytes())
+        digest.update(self._y[:n].astype('<f8').tobytes())
+        colors = np.stack((self._r[:n], self._g[:n], self._b[:n]), axis=1)
+        digest.update(colors.astype(np.uint8).tobytes())
+        return int.from_bytes(digest.digest(), 'little')
+
+    # === Симуляция ===
+
+    def _move_balls(self, dt: float):
+        """Векторизованно двигает шарики."""
+        n = self._count
+        self._x[:n] += self._vx[:n] * dt
+        self._y[:n] += self._vy[:n] * dt
+
+    def _handle_boundaries(self):
+        """Векторизованно обрабатывает отскок от границ."""
+        n = self._count
+        bounce_arrays(self._x[:n], self._y[:n], self._vx[:n], self._vy[:n],
+                      self._radius[:n], self.width, self.height)
+
+    def _handle_delete_zone(self):
+        """
+        Удаляет шарики во всех зонах удаления одной векторизованной
+        компакцией и запоминает их в removed_balls.
+        """
+        self.removed_balls = []
+        if not self.delete_zones or self._count == 0:
+            return
+        n = self._count
+        x = self._x[:n]
+        y = self._y[:n]
+        inside = None
+        for left, top, right, bottom in (zone.bounds() for zone in self.delete_zones):
+            mask = (left <= x) & (x <= right) & (top <= y) & (y <= bottom)
+            if inside is None:
+                inside = mask
+            else:
+                inside |= mask
+        removed = np.nonzero(inside)[0]
+        if len(removed) == 0:
+            return
+        self.removed_balls = [
+            (ball_id, Color.intern(r, g, b))
+            for ball_id, r, g, b in zip(self._ids[removed].tolist(), self._r[removed].tolist(),
+                                        self._g[removed].tolist(), self._b[removed].tolist())
+        ]
+        self._compact(~inside)
+
+    def _mix_pairs(self, pairs: List[Tuple[int, int]]):
+        """
+        Смешивает цвета касающихся шариков.
+
+        Все пары собраны заранее и смешиваются пакетами через
+        ColorMixer.mix_many. Пары разбиты на раунды так, что в одном раунде
+        каждый шарик встречается не больше одного раза, а порядок смешиваний
+        для каждого шарика совпадает с последовательным проходом.
+        """
+        if not pairs:
+            return
+
+        n = self._count
+        colors = np.stack((self._r[:n], self._g[:n], self._b[:n]), axis=1)
+        mix_many = self.color_mixer.mix_many
+        for i, j in self._mixing_rounds(pairs, n):
+            mixed = mix_many(colors[i], colors[j])
+            colors[i] = mixed
+            colors[j] = mixed
+
+        self._r[:n] = colors[:, 0]
+        self._g[:n] = colors[:, 1]
+        self._b[:n] = colors[:, 2]
+
+    @staticmethod
+    def _mixing_rounds(pairs: List[Tuple[int, int]],
+                       count: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Разбивает упорядоченные пары на раунды независимых смешиваний.
+
+        Раунд пары на единицу больше последнего раунда любого из ее шариков,
+        поэтому зависимости между парами с общим шариком сохраняются.
+        """
+        last_round = [0] * count
+        rounds = []
+        for i, j in pairs:
+            current = max(last_round[i], last_round[j]) + 1
+            last_round[i] = current
+            last_round[j] = current
+            rounds.append(current)
+
+        pair_array = np.array(pairs, dtype=np.int64)
+        round_array = np.array(rounds, dtype=np.int64)
+        order = np.argsort(round_array, kind='stable')
+        pair_array = pair_array[order]
+        bounds = np.flatnonzero(np.diff(round_array[order])) + 1
+        return [(chunk[:, 0], chunk[:, 1]) for chunk in np.split(pair_array, bounds)]
+
+    def _positions(self):
+        """Возвращает копии массивов координат (начало тика для поиска проскоков)."""
+        n = self._count
+        return self._x[:n].copy(), self._y[:n].copy()
+
+    def _find_swept_pairs(self, start) -> List[Tuple[int, int]]:
+        """
+        Находит пары, проскочившие друг сквозь друга за тик.
+
+        Как и в GameLogic._find_swept_pairs, медленные кандидаты быстрого
+        шарика берутся из ячеек сетки вокруг середины его пути (диапазоны
+        ключей ячеек через searchsorted), а быстрые шарики проверяются
+        попарно. Все пары проверяются одним векторизованным проходом.
+        """
+        n = self._count
+        sx, sy = start
+        x, y, radius = self._x[:n], self._y[:n], self._radius[:n]
+        mx = x - sx
+        my = y - sy
+        fast = np.nonzero(mx * mx + my * my > radius * radius)[0]
+        if len(fast) == 0:
+            return []
+
+        # Сетка по текущим позициям, как в grid_touching_pairs
+        max_radius = float(radius.max())
+        cell_size = max(self.cell_size, 2 * max_radius)
+        cx = np.floor(x / cell_size).astype(np.int64)
+        cy = np.floor(y / cell_size).astype(np.int64)
+        min_cx, max_cx = int(cx.min()), int(cx.max())
+        min_cy, max_cy = int(cy.min()), int(cy.max())
+        stride = max_cy - min_cy + 1
+        keys = (cx - min_cx) * stride + (cy - min_cy)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+
+        # Квадрат вокруг середины пути; медленный шарик сместился не больше радиуса
+        reach = np.sqrt(mx[fast] * mx[fast] + my[fast] * my[fast]) / 2 + radius[fast] + 2 * max_radius
+        mid_x = (sx[fast] + x[fast]) / 2
+        mid_y = (sy[fast] + y[fast]) / 2
+        cx0 = np.maximum(np.floor((mid_x - reach) / cell_size).astype(np.int64), min_cx)
+        cx1 = np.minimum(np.floor((mid_x + reach) / cell_size).astype(np.int64), max_cx)
+        cy0 = np.maximum(np.floor((mid_y - reach) / cell_size).astype(np.int64), min_cy)
+        cy1 = np.minimum(np.floor((mid_y + reach) / cell_size).astype(np.int64), max_cy)
+        columns = np.maximum(cx1 - cx0 + 1, 0)
+        columns[cy1 < cy0] = 0
+
+        # Каждый столбец квадрата - непрерывный диапазон отсортированных ключей
+        owner = np.repeat(np.arange(len(fast)), columns)
+        column = np.repeat(cx0, columns) + (
+            np.arange(int(columns.sum())) - np.repeat(np.cumsum(columns) - columns, columns))
+        base = (column - min_cx) * stride
+        lo = np.searchsorted(sorted_keys, base + (cy0[owner] - min_cy), side='left')
+        hi = np.searchsorted(sorted_keys, base + (cy1[owner] - min_cy), side='right')
+        counts = hi - lo
+        total = int(counts.sum())
+        first = fast[np.repeat(owner, counts)]
+        second = order[np.repeat(lo, counts)
+                       + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)]
+        is_fast = np.zeros(n, dtype=bool)
+        is_fast[fast] = True
+        slow = ~is_fast[second]
+        first, second = first[slow], second[slow]
+
+        # Пары быстрых шариков проверяются все
+        a, b = np.triu_indices(len(fast), k=1)
+        i = np.concatenate((first, fast[a]))
+        j = np.concatenate((second, fast[b]))
+
+        # Те же формулы и порядок операций, что и в GameLogic._swept_contact
+        px = sx[j] - sx[i]
+        py = sy[j] - sy[i]
+        vx = mx[j] - mx[i]
+        vy = my[j] - my[i]
+        reach = radius[i] + radius[j]
+        vv = vx * vx + vy * vy
+        end_dx = x[i] - x[j]
+        end_dy = y[i] - y[j]
+        candidates = np.nonzero(
+            (vv > reach * reach)
+            & (np.sqrt(px * px + py * py) > reach)
+            & (np.sqrt(end_dx * end_dx + end_dy * end_dy) > reach)
+        )[0]
+        px, py, vx, vy = px[candidates], py[candidates], vx[candidates], vy[candidates]
+        t = np.minimum(1.0, np.maximum(0.0, -(px * vx + py * vy) / vv[candidates]))
+        cx = px + vx * t
+        cy = py + vy * t
+        hit = candidates[np.sqrt(cx * cx + cy * cy) <= reach[candidates]]
+        hit_i, hit_j = i[hit], j[hit]
+        return sorted(set(zip(np.minimum(hit_i, hit_j).tolist(),
+                              np.maximum(hit_i, hit_j).tolist())))
+
+    def _pair_keys(self, pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Переводит пары индексов в пары id векторизованно."""
+        if not pairs:
+            return []
+        index = np.array(pairs, dtype=np.int64)
+        id1 = self._ids[index[:, 0]]
+        id2 = self._ids[index[:, 1]]
+        return list(zip(np.minimum(id1, id2).tolist(), np.maximum(id1, id2).tolist()))
+
+    def _find_touching_pairs_brute(self) -> List[Tuple[int, int]]:
+        """Перебирает все пары, сравнивая каждый шарик с остальными разом."""
+        n = self._count
+        x, y, radius = self._x[:n], self._y[:n], self._radius[:n]
+        pairs = []
+        for i in range(n - 1):
+            dx = x[i] - x[i + 1:]
+            dy = y[i] - y[i + 1:]
+            touching = np.sqrt(dx * dx + dy * dy) <= radius[i] + radius[i + 1:]
+            for j in (np.nonzero(touching)[0] + i + 1).tolist():
+                pairs.append((i, j))
+        return pairs
+
+    def _find_touching_pairs_grid(self) -> List[Tuple[int, int]]:
+        """Ищет касания в соседних ячейках сетки векторизованно."""
+        n = self._count
+        if n < 2:
+            return []
+        x, y, radius = self._x[:n], self._y[:n], self._radius[:n]
+        cell_size = max(self.cell_size, 2 * float(radius.max()))
+        i, j = grid_touching_pairs(x, y, radius, cell_size)
+        order = np.lexsort((j, i))
+        return list(zip(i[order].tolist(), j[order].tolist()))
+
+    def _sweep_order_hint(self, n: int) -> np.ndarray:
+        """
+        Возвращает порядок прошлого тика как перестановку индексов 0..n-1.
+
+        add_ball и remove_ball порядок не трогают: при удалении на место
+        шарика встает последний, поэтому лишними оказываются индексы >= n,
+        а добавленные шарики получают индексы после прежних. Порядок
+        служит только подсказкой сортировке, так что шарик, занявший
+        место удаленного, может стоять не на своем месте.
+        """
+        order = self._sweep_order
+        if order is None:
+            return np.arange(n)
+        if len(order) > n:
+            return order[order < n]
+        if len(order) < n:
+            return np.concatenate((order, np.arange(len(order), n)))
+        return order
+
+    def _find_touching_pairs_sap(self) -> List[Tuple[int, int]]:
+        """Sweep and prune по оси X: диапазоны кандидатов через searchsorted."""
+        n = self._count
+        if n < 2:
+            return []
+        x, y, radius = self._x[:n], self._y[:n], self._radius[:n]
+        margin = self._SAP_MARGIN
+
+        # Порядок прошлого тика почти отсортирован: устойчивая сортировка
+        # (timsort) находит в нем готовые серии и досортировывает за ~O(n)
+        order = self._sweep_order_hint(n)
+        lefts = x[order] - radius[order]
+        order = order[np.argsort(lefts, kind='stable')]
+        self._sweep_order = order
+        i, j = sweep_touching_pairs(x, y, radius, order, margin)
+        order = np.lexsort((j, i))
+        return list(zip(i[order].tolist(), j[order].tolist()))
+
+    # === Запросы по позиции ===
+
+    def _distances_to(self, px: float, py: float) -> np.ndarray:
+        """Возвращает расстояния от точки до центров всех шариков."""
+        n = self._count
+        dx = self._x[:n] - px
+        dy = self._y[:n] - py
+        return np.sqrt(dx * dx + dy * dy)
+
+    def suck_ball_at_position(self, mouse_x: float, mouse_y: float) -> bool:
+        """
+        Пытается "всосать" шарик в инвентарь в позиции курсора.
+
+        Args:
+            mouse_x: Координата X курсора
+            mouse_y: Координата Y курсора
+
+        Returns:
+            True если шарик был всосан, False иначе
+        """
+        if self.inventory.is_full() or self._count == 0:
+            return False
+
+        distances = self._distances_to(mouse_x, mouse_y)
+        index = int(np.argmin(distances))
+        if not distances[index] < self.sucking_radius:
+            return False
+
+        # В инвентарь попадает обычный Ball: массивы хранят только поле
+        view = self._view(int(self._ids[index]))
+        ball = view.copy()
+        self.remove_ball(view)
+        self.inventory.add_ball(ball)
+        return True
+
+    def get_ball_at_position(self, x: float, y: float) -> Optional[BallView]:
+        """
+        Возвращает шарик в указанной позиции (если есть).
+
+        Args:
+            x: Координата X
+            y: Координата Y
+
+        Returns:
+            BallView если найден, None иначе
+        """
+        if self._count == 0:
+            return None
+        inside = np.nonzero(self._distances_to(x, y) <= self._radius[:self._count])[0]
+        if len(inside) == 0:
+            return None
+        return self._view(int(self._ids[inside[0]]))
+
+    def get_balls_in_area(self, x: float, y: float, radius: float) -> List[BallView]:
+        """
+        Возвращает все шарики в указанной области.
+
+        Args:
+            x: Центр области X
+            y: Центр области Y
+            radius: Радиус области
+
+        Returns:
+            Список шариков в области
+        """
+        if self._count == 0:
+            return []
+        inside = np.nonzero(self._distances_to(x, y) <= radius)[0]
+        ids = self._ids[inside].tolist()
+        return [self._view(ball_id) for ball_id in ids]
+
+
+def move_arrays(x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+                radius: np.ndarray, dt: float, width: float, height: float):
+    """
+    Двигает шарики на месте и обрабатывает отскок от границ поля.
+
+    Та же логика, что и в GameLogic._move_balls и _handle_boundaries,
+    выполненная над массивами.
+    """
+    x += vx * dt
+    y += vy * dt
+    bounce_arrays(x, y, vx, vy, radius, width, height)
+
+
+def bounce_arrays(x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+                  radius: np.ndarray, width: float, height: float):
+    """Обрабатывает на месте отскок шариков от границ поля (_handle_boundary_collision)."""
+    left = x - radius < 0
+    right = ~left & (x + radius > width)
+    x[left] = radius[left]
+    vx[left] = np.abs(vx[left])
+    x[right] = width - radius[right]
+    vx[right] = -np.abs(vx[right])
+
+    top = y - radius < 0
+    bottom = ~top & (y + radius > height)
+    y[top] = radius[top]
+    vy[top] = np.abs(vy[top])
+    y[bottom] = height - radius[bottom]
+    vy[bottom] = -np.abs(vy[bottom])
+
+
+def grid_touching_pairs(x: np.ndarray, y: np.ndarray, radius: np.ndarray,
+                        cell_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Находит касающиеся пары в соседних ячейках равномерной сетки.
+
+    Args:
+        x, y, radius: Массивы шариков
+        cell_size: Размер ячейки (не меньше наибольшего диаметра)
+
+    Returns:
+        Массивы индексов (i, j), i < j, в произвольном порядке. Проверка
+        касания та же, что и в Ball.is_touching.
+    """
+    cx = np.floor(x / cell_size).astype(np.int64)
+    cy = np.floor(y / cell_size).astype(np.int64)
+    cx -= cx.min() - 1
+    cy -= cy.min() - 1
+    stride = int(cy.max()) + 2
+    keys = cx * stride + cy
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    n = len(x)
+    ball_indices = np.arange(n)
+
+    found_i = []
+    found_j = []
+    for dx, dy in GRID_OFFSETS:
+        neighbour_keys = keys + (dx * stride + dy)
+        start = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+        end = np.searchsorted(sorted_keys, neighbour_keys, side='right')
+        counts = end - start
+        total = int(counts.sum())
+        if total == 0:
+            continue
+
+        # Разворачиваем диапазоны [start, end) в плоский список кандидатов
+        first = np.repeat(ball_indices, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        second = order[np.repeat(start, counts) + offsets]
+
+        if dx == 0 and dy == 0:
+            mask = first < second
+            first, second = first[mask], second[mask]
+
+        i = np.minimum(first, second)
+        j = np.maximum(first, second)
+        ddx = x[i] - x[j]
+        ddy = y[i] - y[j]
+        touching = np.sqrt(ddx * ddx + ddy * ddy) <= radius[i] + radius[j]
+        found_i.append(i[touching])
+        found_j.append(j[touching])
+
+    if not found_i:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(found_i), np.concatenate(found_j)
+
+
+def sweep_touching_pairs(x: np.ndarray, y: np.ndarray, radius: np.ndarray,
+                         order: np.ndarray, margin: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Находит касающиеся пары проходом sweep and prune.
+
+    Args:
+        x, y, radius: Массивы шариков
+        order: Индексы шариков по возрастанию левой границы (x - radius)
+        margin: Запас к границам интервалов на ошибки округления
+
+    Returns:
+        Массивы индексов (i, j), i < j, в произвольном порядке. Проверка
+        касания та же, что и в Ball.is_touching.
+    """
+    lefts = x[order] - radius[order]
+    rights = x[order] + radius[order] + margin
+
+    # Для каждого шарика - следующие за ним, чей интервал начинается раньше
+    # его правой границы
+    n = len(order)
+    positions = np.arange(n)
+    end = np.searchsorted(lefts, rights, side='right')
+    counts = np.maximum(end - positions - 1, 0)
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    first_pos = np.repeat(positions, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    first = order[first_pos]
+    second = order[first_pos + 1 + offsets]
+
+    i = np.minimum(first, second)
+    j = np.maximum(first, second)
+    reach = radius[i] + radius[j]
+    overlap_y = np.abs(y[i] - y[j]) <= reach + margin
+    i, j, reach = i[overlap_y], j[overlap_y], reach[overlap_y]
+    ddx = x[i] - x[j]
+    ddy = y[i] - y[j]
+    touching = np.sqrt(ddx * ddx + ddy * ddy) <= reach
+    return i[touching], j[touching]
@@ -0,0 +1,201 @@
+"""
+Замер времени по фазам для игры про шарики.
+Позволяет узнать, сколько времени занимает каждая фаза обновления логики
+и каждый этап отрисовки кадра: суммарно, по скользящему окну последних
+замеров (p50/p95/p99) и по кадрам с выгрузкой в CSV или JSON lines.
+
+Когда замер отключен (профайлер не задан), код замера сводится к
+контексту-заглушке NO_PHASE и почти ничего не стоит.
+"""
+
+import csv
+import json
+import math
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Deque, Dict, Iterable, List, Optional, Sequence
+
+
+# Контекст-заглушка, когда замер отключен: почти ничего не стоит
+NO_PHASE = nullcontext()
+
+# Перцентили скользящей статистики
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """
+    Возвращает перцентиль q (0-100) методом ближайшего ранга.
+
+    Для пустой последовательности возвращает 0.0.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _Phase:
+    """Контекстный менеджер, замеряющий одну фазу."""
+
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler: 'PhaseProfiler', name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class ProfileExporter:
+    """
+    Пишет замеры по кадрам в файл: CSV, если путь оканчивается на .csv,
+    иначе JSON lines. Время - в миллисекундах.
+    """
+
+    def __init__(self, path: str, columns: Optional[Sequence[str]] = None):
+        """
+        Открывает файл выгрузки.
+
+        Args:
+            path: Путь к файлу
+            columns: Фазы-столбцы CSV (None - фазы первого кадра); фазы,
+                не вошедшие в столбцы, в CSV не пишутся
+        """
+        self.path = path
+        self.columns: Optional[List[str]] = list(columns) if columns else None
+        self._csv = path.lower().endswith('.csv')
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write(self, frame: int, phases: Dict[str, float]):
+        """Записывает кадр: номер и время фаз в секундах."""
+        row = {name: seconds * 1000 for name, seconds in phases.items()}
+        if not self._csv:
+            self._file.write(json.dumps({'frame': frame, **row}) + '\n')
+            return
+        if self._writer is None:
+            if self.columns is None:
+                self.columns = list(row)
+            self._writer = csv.DictWriter(self._file, ['frame', *self.columns],
+                                          restval=0.0, extrasaction='ignore')
+            self._writer.writeheader()
+        row['frame'] = frame
+        self._writer.writerow(row)
+
+    def close(self):
+        """Закрывает файл выгрузки."""
+        self._file.close()
+
+    def __enter__(self) -> 'ProfileExporter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class PhaseProfiler:
+    """
+    Накапливает суммарное время и количество вызовов по фазам.
+
+    С окном window хранит последние window замеров каждой фазы (для
+    перцентилей) и последние window кадров; кадр завершается вызовом
+    end_frame() и, если задан exporter, выгружается в файл.
+    """
+
+    def __init__(self, window: int = 0, exporter: Optional[ProfileExporter] = None):
+        """
+        Инициализирует пустую статистику.
+
+        Args:
+            window: Размер скользящего окна (0 - только суммы)
+            exporter: Выгрузка кадров в файл (None - без выгрузки)
+        """
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.window = window
+        self.exporter = exporter
+        self.samples: Dict[str, Deque[float]] = {}
+        self.frames: Deque[Dict[str, float]] = deque(maxlen=window or None)
+        self.frame_count = 0
+        self._frame: Dict[str, float] = {}
+        self._phases: Dict[str, _Phase] = {}
+
+    def phase(self, name: str) -> _Phase:
+        """
+        Возвращает контекстный менеджер для замера фазы.
+
+        Пример:
+            with profiler.phase('move'):
+                game._move_balls(dt)
+        """
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = _Phase(self, name)
+            self._phases[name] = phase
+        return phase
+
+    def record(self, name: str, seconds: float):
+        """Добавляет замер длительности фазы."""
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+        self._frame[name] = self._frame.get(name, 0.0) + seconds
+        if self.window:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def end_frame(self) -> Dict[str, float]:
+        """
+        Завершает кадр: сохраняет время фаз кадра в окно и выгрузку.
+
+        Returns:
+            Суммарное время каждой фазы за кадр
+        """
+        frame = self._frame
+        self._frame = {}
+        self.frame_count += 1
+        if self.window:
+            self.frames.append(frame)
+        if self.exporter is not None:
+            self.exporter.write(self.frame_count, frame)
+        return frame
+
+    def percentiles(self, name: str,
+                    quantiles: Sequence[float] = PERCENTILES) -> Dict[str, float]:
+        """
+        Возвращает перцентили длительности фазы по скользящему окну.
+
+        Returns:
+            {'p50': ..., 'p95': ..., 'p99': ...} в секундах
+        """
+        samples = self.samples.get(name, ())
+        return {f"p{q:g}": percentile(samples, q) for q in quantiles}
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Возвращает перцентили всех фаз по скользящему окну."""
+        return {name: self.percentiles(name) for name in self.samples}
+
+    def total(self) -> float:
+        """Возвращает суммарное время всех фаз."""
+        return sum(self.totals.values())
+
+    def reset(self):
+        """Сбрасывает накопленную статистику."""
+        self.totals.clear()
+        self.counts.clear()
+        self.samples.clear()
+        self.frames.clear()
+        self.frame_count = 0
+        self._frame = {}
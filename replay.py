@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Запись и воспроизведение сессий игры про шарики.
+ReplayRecorder оборачивает игровую логику и пишет в компактный двоичный
+журнал команды игрока (всасывание, выплевывание, добавление, очистка)
+и тики. Вместе с зерном генератора журнал однозначно задает сессию:
+replay() прогоняет ее без GUI с максимальной скоростью и сверяет
+периодические контрольные суммы состояния, чтобы поймать расхождение
+сразу на том тике, где оно появилось.
+
+Формат файла:
+    заголовок: b'BRPL', версия (uint16), длина JSON (uint32), JSON с
+        параметрами поля, зерном и настройками на момент начала записи
+    записи: код команды (1 байт) и аргументы в little-endian
+        (см. _COMMANDS), тик занимает 9 байт
+
+Пример:
+    python3 replay.py session.replay --backend numpy
+"""
+
+import argparse
+import json
+import math
+import struct
+import sys
+import time
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from logic import Ball, Color, GameLogic, create_game_logic
+
+_MAGIC = b'BRPL'
+_VERSION = 2  # 2: несколько зон удаления (delete_zones, OP_ADD_DELETE_ZONE)
+_HEADER = struct.Struct('<4sHI')
+
+# Коды команд журнала
+OP_TICK = 1  # update(dt)
+OP_SUCK = 2  # suck_ball_at_position(x, y)
+OP_SPIT = 3  # spit_ball_at_position(x, y, vx, vy)
+OP_ADD_RANDOM = 4  # add_ball(create_random_ball())
+OP_ADD_BALL = 5  # add_ball(Ball(x, y, vx, vy, radius, Color(r, g, b)))
+OP_RANDOM_BALL = 6  # create_random_ball() без добавления (сдвигает генератор)
+OP_CLEAR = 7  # clear_all_balls()
+OP_CLEAR_INVENTORY = 8  # clear_inventory()
+OP_DELETE_ZONE = 9  # set_delete_zone(x, y, width, height)
+OP_SPIT_RATE = 10  # set_spit_rate(rate, burst), rate = NaN - без ограничения
+OP_CHECKSUM = 11  # номер тика и state_checksum() после него
+OP_ADD_DELETE_ZONE = 12  # add_delete_zone(x, y, width, height)
+
+# Аргументы команд
+_COMMANDS = {
+    OP_TICK: struct.Struct('<d'),
+    OP_SUCK: struct.Struct('<dd'),
+    OP_SPIT: struct.Struct('<dddd'),
+    OP_ADD_RANDOM: struct.Struct('<'),
+    OP_ADD_BALL: struct.Struct('<5d3B'),
+    OP_RANDOM_BALL: struct.Struct('<'),
+    OP_CLEAR: struct.Struct('<'),
+    OP_CLEAR_INVENTORY: struct.Struct('<'),
+    OP_DELETE_ZONE: struct.Struct('<4d'),
+    OP_SPIT_RATE: struct.Struct('<dd'),
+    OP_CHECKSUM: struct.Struct('<QQ'),
+    OP_ADD_DELETE_ZONE: struct.Struct('<4d'),
+}
+
+# Контрольная сумма по умолчанию раз в секунду игры (60 тиков)
+DEFAULT_CHECKSUM_INTERVAL = 60
+
+
+def _ball_state(ball: Ball) -> tuple:
+    """Возвращает поля шарика, которые пишутся в журнал."""
+    return (ball.x, ball.y, ball.vx, ball.vy, ball.radius,
+            ball.color.r, ball.color.g, ball.color.b)
+
+
+class ReplayRecorder:
+    """
+    Обертка игровой логики, записывающая сессию в журнал.
+
+    Пишет update, suck_ball_at_position, spit_ball_at_position, add_ball,
+    create_random_ball, clear_all_balls, clear_inventory, set_delete_zone,
+    add_delete_zone и set_spit_rate; остальные атрибуты (balls, inventory,
+    profiler, ...) читаются и изменяются у обернутой логики напрямую.
+    Прочие изменения состояния (например, remove_ball) в журнал не
+    попадают, и при воспроизведении их выдаст несовпадение контрольной
+    суммы.
+    """
+
+    _OWN_ATTRIBUTES = frozenset(('game', 'ticks', 'checksum_interval',
+                                 '_file', '_pending'))
+
+    def __init__(self, game: GameLogic, file: Union[str, BinaryIO],
+                 checksum_interval: int = DEFAULT_CHECKSUM_INTERVAL):
+        """
+        Начинает запись.
+
+        Args:
+            game: Только что созданная игровая логика (без шариков на поле
+                и в инвентаре, генератор не использовался)
+            file: Путь к журналу или открытый двоичный файл
+            checksum_interval: Через сколько тиков писать контрольную
+                сумму (0 - только в конце записи)
+
+        Raises:
+            ValueError: если на поле или в инвентаре уже есть шарики
+        """
+        if game.get_ball_count() or game.get_inventory_count():
+            raise ValueError("Запись нужно начинать с пустого поля и инвентаря")
+        self.game = game
+        self.ticks = 0
+        self.checksum_interval = checksum_interval
+        # Созданные, но еще не добавленные случайные шарики и их поля
+        self._pending: List[Tuple[Ball, tuple]] = []
+        self._file = open(file, 'wb') if isinstance(file, str) else file
+
+        limiter = game.spit_limiter
+        header = {
+            'width': game.width,
+            'height': game.height,
+            'seed': game.seed,
+            'broad_phase': game.broad_phase,
+            'cell_size': game.cell_size,
+            'continuous_collisions': game.continuous_collisions,
+            'mix_policy': game.mix_policy,
+            'sucking_radius': game.sucking_radius,
+            'inventory_size': game.inventory.max_size,
+            'delete_zones': [[zone.x, zone.y, zone.width, zone.height]
+                             for zone in game.delete_zones],
+            'spit_rate': [limiter.rate, limiter.burst] if limiter else None,
+        }
+        payload = json.dumps(header).encode('utf-8')
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, len(payload)))
+        self._file.write(payload)
+
+    def __getattr__(self, name: str):
+        return getattr(self.game, name)
+
+    def __setattr__(self, name: str, value):
+        if name in self._OWN_ATTRIBUTES:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.game, name, value)
+
+    def _write(self, op: int, *args):
+        """Пишет команду в журнал."""
+        self._file.write(bytes((op,)) + _COMMANDS[op].pack(*args))
+
+    def _flush_pending(self, count: Optional[int] = None):
+        """Пишет первые count созданных, но не добавленных шариков."""
+        count = len(self._pending) if count is None else count
+        for _ in range(count):
+            self._write(OP_RANDOM_BALL)
+        del self._pending[:count]
+
+    def _write_checksum(self):
+        """Пишет контрольную сумму текущего состояния."""
+        self._write(OP_CHECKSUM, self.ticks, self.game.state_checksum())
+
+    # === Записываемые команды ===
+
+    def update(self, dt: float = 1.0):
+        """Записывает и выполняет тик."""
+        self._flush_pending()
+        self._write(OP_TICK, dt)
+        self.game.update(dt)
+        self.ticks += 1
+        if self.checksum_interval and self.ticks % self.checksum_interval == 0:
+            self._write_checksum()
+
+    def suck_ball_at_position(self, mouse_x: float, mouse_y: float) -> bool:
+        """Записывает и выполняет всасывание."""
+        self._write(OP_SUCK, mouse_x, mouse_y)
+        return self.game.suck_ball_at_position(mouse_x, mouse_y)
+
+    def spit_ball_at_position(self, mouse_x: float, mouse_y: float,
+                              vx: float = 0, vy: float = 0) -> bool:
+        """Записывает и выполняет выплевывание."""
+        self._write(OP_SPIT, mouse_x, mouse_y, vx, vy)
+        return self.game.spit_ball_at_position(mouse_x, mouse_y, vx, vy)
+
+    def create_random_ball(self) -> Ball:
+        """
+        Создает случайный шарик.
+
+        В журнал ничего не пишется, пока шарик не добавлен: неизмененный
+        шарик записывается одним байтом (OP_ADD_RANDOM).
+        """
+        ball = self.game.create_random_ball()
+        self._pending.append((ball, _ball_state(ball)))
+        return ball
+
+    def add_ball(self, ball: Ball):
+        """Записывает и выполняет добавление шарика."""
+        for index, (pending, state) in enumerate(self._pending):
+            if pending is ball:
+                if _ball_state(ball) == state:
+                    self._flush_pending(index)
+                    del self._pending[0]
+                    self._write(OP_ADD_RANDOM)
+                    return self.game.add_ball(ball)
+                # Шарик изменили после создания: генератор сдвигается,
+                # а сам шарик пишется целиком
+                self._flush_pending(index + 1)
+                break
+        self._write(OP_ADD_BALL, *_ball_state(ball))
+        return self.game.add_ball(ball)
+
+    def clear_all_balls(self):
+        """Записывает и выполняет очистку поля."""
+        self._write(OP_CLEAR)
+        self.game.clear_all_balls()
+
+    def clear_inventory(self):
+        """Записывает и выполняет очистку инвентаря."""
+        self._write(OP_CLEAR_INVENTORY)
+        self.game.clear_inventory()
+
+    def set_delete_zone(self, x: float, y: float, width: float, height: float):
+        """Записывает и выполняет установку зоны удаления."""
+        self._write(OP_DELETE_ZONE, x, y, width, height)
+        self.game.set_delete_zone(x, y, width, height)
+
+    def add_delete_zone(self, x: float, y: float, width: float, height: float):
+        """Записывает и выполняет добавление зоны удаления."""
+        self._write(OP_ADD_DELETE_ZONE, x, y, width, height)
+        return self.game.add_delete_zone(x, y, width, height)
+
+    def set_spit_rate(self, rate: Optional[float], burst: float = 1.0):
+        """Записывает и выполняет ограничение частоты выплевывания."""
+        self._write(OP_SPIT_RATE, math.nan if rate is None else rate, burst)
+        self.game.set_spit_rate(rate, burst)
+
+    # === Завершение ===
+
+    def close(self):
+        """
+        Завершает запись контрольной суммой конечного состояния и
+        закрывает журнал и игровую логику (если у нее есть close).
+        """
+        if self._file.closed:
+            return
+        self._flush_pending()
+        if not self.checksum_interval or self.ticks % self.checksum_interval:
+            self._write_checksum()
+        self._file.close()
+        if hasattr(self.game, 'close'):
+            self.game.close()
+
+    def __enter__(self) -> 'ReplayRecorder':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def read_replay(path: str) -> Tuple[dict, Iterator[Tuple[int, tuple]]]:
+    """
+    Читает журнал.
+
+    Returns:
+        Заголовок и итератор команд (код, аргументы)
+
+    Raises:
+        ValueError: если файл не является журналом поддерживаемой версии
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path}: файл слишком короткий для журнала")
+    magic, version, length = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError(f"{path}: не журнал сессии")
+    if version != _VERSION:
+        raise ValueError(f"{path}: неподдерживаемая версия журнала {version}")
+    start = _HEADER.size + length
+    header = json.loads(data[_HEADER.size:start].decode('utf-8'))
+    return header, _iter_commands(data, start)
+
+
+def _iter_commands(data: bytes, offset: int) -> Iterator[Tuple[int, tuple]]:
+    """Разбирает записи журнала начиная с offset."""
+    end = len(data)
+    while offset < end:
+        op = data[offset]
+        command = _COMMANDS.get(op)
+        if command is None:
+            raise ValueError(f"Неизвестная команда {op} по смещению {offset}")
+        offset += 1
+        yield op, command.unpack_from(data, offset)
+        offset += command.size
+
+
+def create_game_from_header(header: dict, backend: str = 'python',
+                            **kwargs) -> GameLogic:
+    """
+    Создает игровую логику в состоянии начала записи.
+
+    Args:
+        header: Заголовок журнала
+        backend: Бэкенд симуляции
+        **kwargs: Параметры create_game_logic поверх записанных
+            (например, broad_phase или workers)
+    """
+    options = {
+        'seed': header['seed'],
+        'broad_phase': header['broad_phase'],
+        'cell_size': header['cell_size'],
+        'continuous_collisions': header['continuous_collisions'],
+        'mix_policy': header['mix_policy'],
+    }
+    options.update(kwargs)
+    game = create_game_logic(header['width'], header['height'], backend=backend, **options)
+    game.sucking_radius = header['sucking_radius']
+    game.inventory.max_size = header['inventory_size']
+    for zone in header['delete_zones']:
+        game.add_delete_zone(*zone)
+    if header['spit_rate']:
+        game.set_spit_rate(*header['spit_rate'])
+    return game
+
+
+def replay(path: str, backend: str = 'python', verify: bool = True,
+           **kwargs) -> dict:
+    """
+    Воспроизводит журнал без GUI с максимальной скоростью.
+
+    Args:
+        path: Путь к журналу
+        backend: Бэкенд симуляции
+        verify: Сверять контрольные суммы (при расхождении воспроизведение
+            останавливается)
+        **kwargs: Параметры create_game_logic поверх записанных
+
+    Returns:
+        Словарь с количеством тиков и команд, временем, числом проверенных
+        контрольных сумм и номером тика первого расхождения (None - нет)
+    """
+    header, commands = read_replay(path)
+    game = create_game_from_header(header, backend, **kwargs)
+
+    def add_ball(x, y, vx, vy, radius, r, g, b):
+        game.add_ball(Ball(x, y, vx, vy, radius, Color(r, g, b)))
+
+    def set_spit_rate(rate, burst):
+        game.set_spit_rate(None if math.isnan(rate) else rate, burst)
+
+    handlers = {
+        OP_TICK: game.update,
+        OP_SUCK: game.suck_ball_at_position,
+        OP_SPIT: game.spit_ball_at_position,
+        OP_ADD_RANDOM: lambda: game.add_ball(game.create_random_ball()),
+        OP_ADD_BALL: add_ball,
+        OP_RANDOM_BALL: game.create_random_ball,
+        OP_CLEAR: game.clear_all_balls,
+        OP_CLEAR_INVENTORY: game.clear_inventory,
+        OP_DELETE_ZONE: game.set_delete_zone,
+        OP_ADD_DELETE_ZONE: game.add_delete_zone,
+        OP_SPIT_RATE: set_spit_rate,
+    }
+
+    ticks = 0
+    count = 0
+    checked = 0
+    divergence = None
+    start = time.perf_counter()
+    try:
+        for op, args in commands:
+            count += 1
+            if op == OP_CHECKSUM:
+                if not verify:
+                    continue
+                tick, expected = args
+                checked += 1
+                if game.state_checksum() != expected:
+                    divergence = tick
+                    break
+                continue
+            handlers[op](*args)
+            if op == OP_TICK:
+                ticks += 1
+        elapsed = time.perf_counter() - start
+        final_ball_count = game.get_ball_count()
+    finally:
+        if hasattr(game, 'close'):
+            game.close()
+
+    return {
+        'ticks': ticks,
+        'commands': count,
+        'seconds': elapsed,
+        'ticks_per_second': ticks / elapsed if elapsed > 0 else 0.0,
+        'checksums': checked,
+        'divergence': divergence,
+        'final_ball_count': final_ball_count,
+        'seed': header['seed'],
+    }
+
+
+def format_report(result: dict) -> str:
+    """Форматирует результат воспроизведения в читаемый текст."""
+    lines = [
+        f"Тиков: {result['ticks']} за {result['seconds']:.3f} с",
+        f"Тиков/с: {result['ticks_per_second']:.1f}",
+        f"Команд: {result['commands']}",
+        f"Шариков в конце: {result['final_ball_count']}",
+        f"Проверено контрольных сумм: {result['checksums']}",
+    ]
+    if result['divergence'] is None:
+        lines.append("Расхождений нет")
+    else:
+        lines.append(f"РАСХОЖДЕНИЕ: состояние после тика {result['divergence']} "
+                     f"не совпадает с записью")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Воспроизведение записанной сессии без GUI"
+    )
+    parser.add_argument('path', help="файл журнала")
+    parser.add_argument('--backend', choices=('python', 'numpy', 'sharded'), default='python',
+                        help="бэкенд симуляции")
+    parser.add_argument('--workers', type=int, default=2,
+                        help="количество процессов-полос для --backend sharded")
+    parser.add_argument('--broad-phase', choices=GameLogic.BROAD_PHASES,
+                        help="алгоритм поиска касаний (по умолчанию - из записи)")
+    parser.add_argument('--no-verify', action='store_true',
+                        help="не сверять контрольные суммы")
+    parser.add_argument('--json', action='store_true',
+                        help="вывести результат в формате JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Главная функция запуска."""
+    args = parse_args(argv)
+    options = {}
+    if args.broad_phase:
+        options['broad_phase'] = args.broad_phase
+    if args.backend == 'sharded':
+        options['workers'] = args.workers
+    result = replay(args.path, backend=args.backend, verify=not args.no_verify, **options)
+    result['backend'] = args.backend
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(format_report(result))
+    return 0 if result['divergence'] is None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
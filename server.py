@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Сервер игры про шарики.
+Крутит GameLogic без GUI с фиксированной частотой тиков на asyncio и
+раздает состояние тонким клиентам (client.py) через локальный сокет.
+Клиенты присылают команды (всасывание, выплевывание, добавление,
+очистка), а сервер после каждого тика рассылает кадр-дельту: только
+удаленные и новые шарики, изменившиеся позиции и цвета.
+
+Кадр кодируется один раз за тик и отправляется всем клиентам одним и
+тем же объектом bytes, без ожидания отправки: тик не ждет медленных
+клиентов. Клиент, у которого в буфере отправки накопилось больше
+max_buffer байт, отключается.
+
+Протокол (little-endian):
+    сервер -> клиент: сообщения uint32 длина + тип (1 байт) + данные
+        MSG_HELLO: JSON с размером поля, зонами удаления, радиусом
+            всасывания, емкостью инвентаря и частотой тиков
+        MSG_FRAME: _FRAME (тик, флаги, количество записей в секциях),
+            затем секции: удаленные id (uint32), новые шарики (_ADDED),
+            сдвинутые (_MOVED), перекрашенные (_RECOLORED) и, с флагом
+            FRAME_INVENTORY, инвентарь (uint16 количество + _INVENTORY_BALL)
+        Первый кадр клиента - опорный (FRAME_KEYFRAME): все шарики в
+        секции новых, клиент сбрасывает свое состояние.
+    клиент -> сервер: код команды (1 байт) и аргументы (см. _COMMANDS)
+
+Пример:
+    python3 server.py --port 8765 --balls 200 --backend numpy
+    python3 client.py --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from headless import build_game
+from logic import Ball, Color, GameLogic
+from timestep import FixedTimestep
+
+PROTOCOL_VERSION = 1
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Сколько байт может скопиться в буфере отправки клиента до отключения
+DEFAULT_MAX_BUFFER = 1 << 20
+
+# Длина сообщения сервера
+_LENGTH = struct.Struct('<I')
+
+# Типы сообщений сервера
+MSG_HELLO = 1
+MSG_FRAME = 2
+
+# Флаги кадра
+FRAME_KEYFRAME = 1  # Опорный кадр: клиент заменяет все свое состояние
+FRAME_INVENTORY = 2  # В кадре есть секция инвентаря
+
+# Заголовок кадра: тик, флаги, количество удаленных, новых, сдвинутых
+# и перекрашенных шариков
+_FRAME = struct.Struct('<QBIIII')
+_REMOVED = struct.Struct('<I')  # id
+_ADDED = struct.Struct('<IfffBBB')  # id, x, y, радиус, r, g, b
+_MOVED = struct.Struct('<Iff')  # id, x, y
+_RECOLORED = struct.Struct('<IBBB')  # id, r, g, b
+_INVENTORY_COUNT = struct.Struct('<H')
+_INVENTORY_BALL = struct.Struct('<fBBB')  # радиус, r, g, b
+
+# Коды команд клиента
+CMD_SUCK = 1  # suck_ball_at_position(x, y)
+CMD_SPIT = 2  # spit_ball_at_position(x, y, vx, vy)
+CMD_ADD_RANDOM = 3  # add_ball(create_random_ball())
+CMD_ADD_BALL = 4  # add_ball(Ball(x, y, vx, vy, radius, Color(r, g, b)))
+CMD_CLEAR = 5  # clear_all_balls()
+
+# Аргументы команд
+_COMMANDS = {
+    CMD_SUCK: struct.Struct('<dd'),
+    CMD_SPIT: struct.Struct('<dddd'),
+    CMD_ADD_RANDOM: struct.Struct('<'),
+    CMD_ADD_BALL: struct.Struct('<5d3B'),
+    CMD_CLEAR: struct.Struct('<'),
+}
+
+# Столбцы массивов NumPy-бэкенда в порядке строки шарика
+_ROW_ARRAYS = ('_ids', '_x', '_y', '_radius', '_r', '_g', '_b')
+
+
+def pack_message(kind: int, payload: bytes) -> bytes:
+    """Кодирует сообщение сервера: длина, тип и данные."""
+    return _LENGTH.pack(len(payload) + 1) + bytes((kind,)) + payload
+
+
+def unpack_messages(buffer: bytearray) -> List[Tuple[int, bytes]]:
+    """
+    Извлекает из буфера все полностью пришедшие сообщения сервера.
+
+    Разобранные байты удаляются из буфера, неполное сообщение остается
+    до следующего чтения.
+
+    Returns:
+        Список (тип, данные)
+    """
+    messages = []
+    offset = 0
+    end = len(buffer)
+    while end - offset >= _LENGTH.size:
+        (length,) = _LENGTH.unpack_from(buffer, offset)
+        start = offset + _LENGTH.size
+        if end - start < length:
+            break
+        messages.append((buffer[start], bytes(buffer[start + 1:start + length])))
+        offset = start + length
+    del buffer[:offset]
+    return messages
+
+
+def pack_command(op: int, *args) -> bytes:
+    """Кодирует команду клиента: код и аргументы."""
+    return bytes((op,)) + _COMMANDS[op].pack(*args)
+
+
+def valid_command(op: int, args: tuple) -> bool:
+    """
+    Проверяет аргументы команды клиента до ее выполнения.
+
+    Координаты и скорости должны быть конечными, радиус - конечным
+    и положительным. NaN в позиции шарика иначе сломал бы следующий тик
+    логики у всех клиентов. Каналы цвета не проверяются: формат 'B'
+    и так ограничивает их диапазоном 0..255.
+    """
+    numbers = args
+    if op == CMD_ADD_BALL:
+        numbers = args[:5]
+        if not args[4] > 0:
+            return False
+    return all(math.isfinite(value) for value in numbers)
+
+
+def _ball_rows(game: GameLogic) -> Iterable[tuple]:
+    """
+    Возвращает строки (id, x, y, радиус, r, g, b) шариков на поле.
+
+    У NumPy-бэкенда строки собираются из массивов, минуя BallView.
+    """
+    if hasattr(game, '_ids'):
+        n = game.get_ball_count()
+        return zip(*(getattr(game, name)[:n].tolist() for name in _ROW_ARRAYS))
+    return ((ball.id, ball.x, ball.y, ball.radius,
+             ball.color.r, ball.color.g, ball.color.b) for ball in game.balls)
+
+
+def _pack_records(record: struct.Struct, items: List[tuple]) -> bytes:
+    """Кодирует секцию кадра из записей одного формата."""
+    pack = record.pack
+    return b''.join([pack(*item) for item in items])
+
+
+class DeltaEncoder:
+    """
+    Кодирует состояние игры в кадры-дельты относительно предыдущего кадра.
+
+    Хранит последнее разосланное состояние (строки шариков по id)
+    и секцию инвентаря, поэтому опорный кадр для нового клиента
+    строится без обращения к игре и точно продолжается следующими
+    дельтами.
+    """
+
+    def __init__(self):
+        """Инициализирует пустое состояние."""
+        self.tick = 0
+        self._state: Dict[int, tuple] = {}
+        self._inventory_version: Optional[int] = None
+        self._inventory = _INVENTORY_COUNT.pack(0)
+
+    def delta(self, game: GameLogic, tick: int) -> bytes:
+        """
+        Кодирует изменения с прошлого кадра и запоминает новое состояние.
+
+        Args:
+            game: Игровая логика
+            tick: Номер тика
+
+        Returns:
+            Данные сообщения MSG_FRAME
+        """
+        previous = self._state
+        get = previous.get
+        state = {}
+        added = []
+        moved = []
+        recolored = []
+        for row in _ball_rows(game):
+            ball_id, x, y, radius, r, g, b = row
+            state[ball_id] = row
+            old = get(ball_id)
+            if old is None or old[3] != radius:
+                added.append(row)
+            elif old != row:
+                if old[1] != x or old[2] != y:
+                    moved.append((ball_id, x, y))
+                if old[4] != r or old[5] != g or old[6] != b:
+                    recolored.append((ball_id, r, g, b))
+        removed = [(ball_id,) for ball_id in previous.keys() - state.keys()]
+        self._state = state
+        self.tick = tick
+
+        flags = 0
+        inventory = b''
+        if game.inventory.version != self._inventory_version:
+            self._inventory_version = game.inventory.version
+            balls = game.inventory.balls
+            self._inventory = _INVENTORY_COUNT.pack(len(balls)) + _pack_records(
+                _INVENTORY_BALL,
+                [(ball.radius, ball.color.r, ball.color.g, ball.color.b) for ball in balls]
+            )
+            flags |= FRAME_INVENTORY
+            inventory = self._inventory
+
+        return b''.join((
+            _FRAME.pack(tick, flags, len(removed), len(added), len(moved), len(recolored)),
+            _pack_records(_REMOVED, removed),
+            _pack_records(_ADDED, added),
+            _pack_records(_MOVED, moved),
+            _pack_records(_RECOLORED, recolored),
+            inventory,
+        ))
+
+    def keyframe(self) -> bytes:
+        """Кодирует последнее разосланное состояние опорным кадром."""
+        added = list(self._state.values())
+        return b''.join((
+            _FRAME.pack(self.tick, FRAME_KEYFRAME | FRAME_INVENTORY, 0, len(added), 0, 0),
+            _pack_records(_ADDED, added),
+            self._inventory,
+        ))
+
+
+def decode_frame(payload: bytes) -> dict:
+    """
+    Разбирает данные сообщения MSG_FRAME.
+
+    Returns:
+        Словарь: 'tick', 'keyframe', списки записей 'removed' (id),
+        'added', 'moved', 'recolored' и 'inventory' (None - инвентарь
+        не менялся)
+    """
+    tick, flags, *counts = _FRAME.unpack_from(payload)
+    offset = _FRAME.size
+    sections = []
+    for record, count in zip((_REMOVED, _ADDED, _MOVED, _RECOLORED), counts):
+        end = offset + record.size * count
+        sections.append(list(record.iter_unpack(payload[offset:end])))
+        offset = end
+    inventory = None
+    if flags & FRAME_INVENTORY:
+        (count,) = _INVENTORY_COUNT.unpack_from(payload, offset)
+        offset += _INVENTORY_COUNT.size
+        inventory = list(_INVENTORY_BALL.iter_unpack(
+            payload[offset:offset + _INVENTORY_BALL.size * count]))
+    removed, added, moved, recolored = sections
+    return {
+        'tick': tick,
+        'keyframe': bool(flags & FRAME_KEYFRAME),
+        'removed': [ball_id for ball_id, in removed],
+        'added': added,
+        'moved': moved,
+        'recolored': recolored,
+        'inventory': inventory,
+    }
+
+
+class GameServer:
+    """
+    Сервер: тикает игровую логику с фиксированной частотой, выполняет
+    команды клиентов и рассылает им кадры-дельты.
+
+    Команды выполняются сразу по приходу, между тиками (asyncio работает
+    в одном потоке). Кадр кодируется один раз за тик, сколько бы ни было
+    клиентов; рассылка только кладет его в буферы отправки.
+    """
+
+    def __init__(self, game: GameLogic, ticks_per_second: float = 60,
+                 max_catchup_steps: int = 5, max_buffer: int = DEFAULT_MAX_BUFFER):
+        """
+        Инициализирует сервер.
+
+        Args:
+            game: Игровая логика (можно обернутую в ReplayRecorder)
+            ticks_per_second: Частота тиков логики
+            max_catchup_steps: Максимум тиков подряд, если сервер отстал
+            max_buffer: Предел буфера отправки клиента в байтах; клиент,
+                не успевающий принимать кадры, отключается
+        """
+        self.game = game
+        self.timestep = FixedTimestep(ticks_per_second, max_catchup_steps)
+        self.logic_dt = 60.0 / ticks_per_second  # dt логики: 1.0 = один кадр при 60 FPS
+        self.ticks_per_second = ticks_per_second
+        self.max_buffer = max_buffer
+        self.tick = 0
+        self.clients: Set[asyncio.StreamWriter] = set()
+        self.dropped_clients = 0
+        self.frame_bytes = 0  # Суммарный размер закодированных кадров
+        self.encoder = DeltaEncoder()
+        self.encoder.delta(game, 0)
+        self._keyframe: Optional[bytes] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers_running: Set[asyncio.Task] = set()
+        self._stopped: Optional[asyncio.Event] = None
+
+        def add_ball(x, y, vx, vy, radius, r, g, b):
+            game.add_ball(Ball(x, y, vx, vy, radius, Color(r, g, b)))
+
+        self._handlers = {
+            CMD_SUCK: game.suck_ball_at_position,
+            CMD_SPIT: game.spit_ball_at_position,
+            CMD_ADD_RANDOM: lambda: game.add_ball(game.create_random_ball()),
+            CMD_ADD_BALL: add_ball,
+            CMD_CLEAR: game.clear_all_balls,
+        }
+
+    def hello(self) -> bytes:
+        """Возвращает сообщение MSG_HELLO с параметрами игры."""
+        game = self.game
+        header = {
+            'version': PROTOCOL_VERSION,
+            'width': game.width,
+            'height': game.height,
+            'delete_zones': [[zone.x, zone.y, zone.width, zone.height]
+                             for zone in game.delete_zones],
+            'sucking_radius': game.sucking_radius,
+            'inventory_size': game.inventory.max_size,
+            'ticks_per_second': self.ticks_per_second,
+        }
+        return pack_message(MSG_HELLO, json.dumps(header).encode('utf-8'))
+
+    def step(self, ticks: int = 1) -> bytes:
+        """
+        Выполняет тики логики и рассылает кадр с их итогом.
+
+        Returns:
+            Разосланное сообщение MSG_FRAME
+        """
+        for _ in range(ticks):
+            self.game.update(self.logic_dt)
+            self.tick += 1
+        frame = pack_message(MSG_FRAME, self.encoder.delta(self.game, self.tick))
+        self._keyframe = None
+        self.frame_bytes += len(frame)
+        self.broadcast(frame)
+        return frame
+
+    def broadcast(self, message: bytes):
+        """
+        Кладет сообщение в буферы отправки всех клиентов.
+
+        Клиенты, чей буфер превысил max_buffer, отключаются: кадры -
+        дельты, поэтому пропустить кадр клиенту нельзя.
+        """
+        for writer in list(self.clients):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self._drop(writer)
+            else:
+                writer.write(message)
+
+    def _drop(self, writer: asyncio.StreamWriter):
+        """Отключает медленного клиента."""
+        self.clients.discard(writer)
+        self.dropped_clients += 1
+        writer.transport.abort()
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        """
+        Принимает клиента: шлет приветствие и опорный кадр, читает команды.
+
+        Клиент отключается при неизвестной команде, некорректных
+        аргументах (см. valid_command) и ошибке выполнения команды.
+        """
+        if self._keyframe is None:
+            self._keyframe = pack_message(MSG_FRAME, self.encoder.keyframe())
+        writer.write(self.hello())
+        writer.write(self._keyframe)
+        self.clients.add(writer)
+        task = asyncio.current_task()
+        self._handlers_running.add(task)
+        try:
+            while True:
+                op = (await reader.readexactly(1))[0]
+                command = _COMMANDS.get(op)
+                if command is None:
+                    break  # Неизвестная команда - клиент говорит на другом протоколе
+                args = command.unpack(await reader.readexactly(command.size))
+                if not valid_command(op, args):
+                    break  # Некорректные аргументы - отключаем клиента
+                try:
+                    self._handlers[op](*args)
+                except Exception as e:
+                    # Ошибка команды отключает только этого клиента, тики идут дальше
+                    print(f"Ошибка команды {op} клиента: {e}", file=sys.stderr)
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            self._handlers_running.discard(task)
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    path: Optional[str] = None):
+        """
+        Начинает принимать клиентов.
+
+        Args:
+            host: Адрес TCP
+            port: Порт TCP (0 - любой свободный, см. address)
+            path: Путь Unix-сокета вместо TCP
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port)
+
+    @property
+    def address(self):
+        """Адрес, на котором сервер принимает клиентов."""
+        return self._server.sockets[0].getsockname()
+
+    async def run(self, ticks: int = 0):
+        """
+        Тикает логику с фиксированной частотой до stop().
+
+        Args:
+            ticks: Остановиться после стольких тиков (0 - без ограничения)
+        """
+        loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        timestep = self.timestep
+        last = loop.time()
+        while not self._stopped.is_set():
+            now = loop.time()
+            steps = timestep.advance(now - last)
+            last = now
+            if ticks:
+                steps = min(steps, ticks - self.tick)
+            if steps:
+                self.step(steps)
+                if ticks and self.tick >= ticks:
+                    break
+            try:
+                await asyncio.wait_for(self._stopped.wait(),
+                                       timestep.step - timestep.accumulator)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        """Останавливает цикл тиков."""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def close(self):
+        """Отключает клиентов и перестает принимать новых."""
+        for writer in list(self.clients):
+            writer.close()
+        self.clients.clear()
+        # Обработчики клиентов завершаются, получив конец потока
+        await asyncio.gather(*self._handlers_running, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Сервер симуляции шариков для удаленных клиентов (client.py)"
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help="адрес TCP")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="порт TCP")
+    parser.add_argument('--unix', metavar='PATH', help="слушать Unix-сокет вместо TCP")
+    parser.add_argument('--balls', type=int, default=70, help="начальное количество шариков")
+    parser.add_argument('--width', type=float, default=1000,
+                        help="ширина поля (по умолчанию - как в GUI)")
+    parser.add_argument('--height', type=float, default=600,
+                        help="высота поля (по умолчанию - как в GUI)")
+    parser.add_argument('--tps', type=float, default=60, help="частота тиков логики")
+    parser.add_argument('--ticks', type=int, default=0,
+                        help="остановиться после стольких тиков (0 - работать до Ctrl+C)")
+    parser.add_argument('--seed', type=int, help="зерно генератора (по умолчанию - случайное)")
+    parser.add_argument('--backend', choices=('python', 'numpy', 'sharded'), default='python',
+                        help="бэкенд симуляции")
+    parser.add_argument('--workers', type=int, default=2,
+                        help="количество процессов-полос для --backend sharded")
+    parser.add_argument('--spit-rate', type=float, default=10.0,
+                        help="максимум выплюнутых шариков в секунду (0 - без ограничения)")
+    parser.add_argument('--max-buffer', type=int, default=DEFAULT_MAX_BUFFER,
+                        help="предел буфера отправки клиента в байтах")
+    parser.add_argument('--record', metavar='PATH',
+                        help="записать сессию для replay.py")
+    return parser.parse_args(argv)
+
+
+async def serve(args: argparse.Namespace, game: GameLogic) -> GameServer:
+    """Запускает сервер по аргументам командной строки и ждет его остановки."""
+    server = GameServer(game, args.tps, max_buffer=args.max_buffer)
+    await server.start(args.host, args.port, path=args.unix)
+    address = args.unix or "{}:{}".format(*server.address[:2])
+    print(f"Сервер слушает {address}, {args.tps:g} тиков/с, "
+          f"шариков: {game.get_ball_count()}")
+    try:
+        await server.run(args.ticks)
+    finally:
+        await server.close()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Главная функция запуска."""
+    args = parse_args(argv)
+    game = build_game(args.balls, args.width, args.height, seed=args.seed,
+                      backend=args.backend, delete_zone=True,
+                      workers=args.workers, record=args.record)
+    if args.spit_rate:
+        game.set_spit_rate(args.spit_rate / 60.0)  # dt логики 1.0 = 1/60 секунды
+    server = None
+    try:
+        server = asyncio.run(serve(args, game))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if hasattr(game, 'close'):
+            game.close()
+    if server is not None:
+        print(f"Тиков: {server.tick}, отключено медленных клиентов: {server.dropped_clients}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
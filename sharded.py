@@ -0,0 +1,347 @@
+"""
+Многопроцессная симуляция больших полей для игры про шарики.
+Поле делится на вертикальные полосы, каждой полосой владеет отдельный
+процесс. Состояние шариков лежит в общей памяти (multiprocessing.shared_memory),
+поэтому процессы не копируют его между тиками.
+
+Тик выполняется так:
+    1. Каждый процесс двигает шарики своей полосы.
+    2. Шарики, пересекшие границу, переходят к соседней полосе (миграция).
+    3. Каждый процесс ищет касания своих шариков с шариками полосы и
+       "гало" - каймы шириной в два максимальных радиуса из соседних полос.
+       Пару сообщает полоса, которой принадлежит шарик с меньшим индексом,
+       поэтому каждая пара находится ровно один раз.
+    4. Координатор сливает пары в общий отсортированный список, смешивает
+       цвета и удаляет шарики в зоне удаления, как NumpyGameLogic.
+
+Результат тика побитово совпадает с GameLogic.update при том же зерне.
+
+Требует NumPy и Python 3.8+.
+
+Пример:
+    with ShardedGameLogic(20000, 20000, workers=4) as game:
+        for _ in range(100000):
+            game.add_ball(game.create_random_ball())
+        game.update()
+"""
+
+import multiprocessing
+import weakref
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from logic_numpy import NumpyGameLogic, grid_touching_pairs, move_arrays
+
+
+# Массивы, которые нужны процессам полос
+_WORKER_FIELDS = ('_x', '_y', '_vx', '_vy', '_radius', '_owner')
+
+
+def _attach(names: Dict[str, str], capacity: int, dtypes: Dict[str, str]):
+    """Подключается к блокам общей памяти и создает поверх них массивы."""
+    blocks = []
+    arrays = {}
+    for name, block_name in names.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(capacity, dtype=dtypes[name], buffer=block.buf)
+    return blocks, arrays
+
+
+def _release(blocks, unlink: bool = False):
+    """
+    Закрывает блоки общей памяти.
+
+    Массивы поверх закрытого блока указывают на освобожденную память,
+    поэтому к этому моменту на них не должно остаться ссылок.
+    """
+    for block in blocks:
+        block.close()
+        if unlink:
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _worker_main(conn, strip: int, width: float, height: float):
+    """
+    Цикл процесса полосы: выполняет команды координатора.
+
+    Команды:
+        ('attach', names, capacity, dtypes) - подключиться к новым массивам
+        ('move', count, dt) - сдвинуть шарики полосы
+        ('pairs', count, left, right, halo, cell_size) - найти касания
+        ('stop',) - завершиться
+    """
+    blocks: list = []
+    arrays: Dict[str, np.ndarray] = {}
+    try:
+        while True:
+            command, *args = conn.recv()
+            if command == 'attach':
+                names, capacity, dtypes = args
+                arrays = {}
+                _release(blocks)
+                blocks, arrays = _attach(names, capacity, dtypes)
+                conn.send(None)
+            elif command == 'move':
+                count, dt = args
+                conn.send(_move_strip(arrays, strip, count, dt, width, height))
+            elif command == 'pairs':
+                conn.send(_strip_pairs(arrays, strip, *args))
+            elif command == 'stop':
+                break
+    finally:
+        arrays = {}
+        _release(blocks)
+        conn.close()
+
+
+def _move_strip(arrays: Dict[str, np.ndarray], strip: int, count: int,
+                dt: float, width: float, height: float) -> int:
+    """
+    Двигает шарики полосы теми же формулами, что и NumpyGameLogic.
+
+    Returns:
+        Количество сдвинутых шариков
+    """
+    own = np.nonzero(arrays['_owner'][:count] == strip)[0]
+    if len(own) == 0:
+        return 0
+    x = arrays['_x'][own]
+    y = arrays['_y'][own]
+    vx = arrays['_vx'][own]
+    vy = arrays['_vy'][own]
+    move_arrays(x, y, vx, vy, arrays['_radius'][own], dt, width, height)
+    arrays['_x'][own] = x
+    arrays['_y'][own] = y
+    arrays['_vx'][own] = vx
+    arrays['_vy'][own] = vy
+    return len(own)
+
+
+def _strip_pairs(arrays: Dict[str, np.ndarray], strip: int, count: int,
+                 left: float, right: float, halo: float,
+                 cell_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ищет касания шариков полосы [left, right) с шариками полосы и гало.
+
+    Returns:
+        Массивы глобальных индексов (i, j), i < j, где шарик i принадлежит
+        полосе
+    """
+    x = arrays['_x'][:count]
+    owner = arrays['_owner'][:count]
+    local = np.nonzero((x >= left - halo) & (x <= right + halo))[0]
+    if len(local) < 2:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    i, j = grid_touching_pairs(x[local], arrays['_y'][local],
+                               arrays['_radius'][local], cell_size)
+    gi = local[i]
+    gj = local[j]
+    first = np.minimum(gi, gj)
+    second = np.maximum(gi, gj)
+    mine = owner[first] == strip
+    return first[mine], second[mine]
+
+
+def _shutdown(processes: list, connections: list, blocks: list):
+    """Останавливает процессы полос и освобождает общую память."""
+    for conn in connections:
+        try:
+            conn.send(('stop',))
+        except (BrokenPipeError, OSError):
+            pass
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    for conn in connections:
+        conn.close()
+    _release(blocks, unlink=True)
+    blocks.clear()
+
+
+class ShardedGameLogic(NumpyGameLogic):
+    """
+    Игровая логика, распределенная по процессам-полосам.
+
+    Хранилище и все операции, кроме движения и поиска касаний, унаследованы
+    от NumpyGameLogic; массивы состояния выделяются в общей памяти.
+    Процессы нужно остановить вызовом close() (или использовать объект
+    как контекстный менеджер).
+    """
+
+    # Массивы состояния должны лежать в общей памяти: load_arrays копирует
+    _ADOPT_ARRAYS = False
+
+    def __init__(self, width: float, height: float, workers: int = 2,
+                 start_method: Optional[str] = None, **kwargs):
+        """
+        Инициализирует логику и запускает процессы полос.
+
+        Args:
+            width: Ширина игрового поля
+            height: Высота игрового поля
+            workers: Количество процессов (вертикальных полос)
+            start_method: Способ запуска процессов ('fork', 'spawn', ...;
+                None - по умолчанию для платформы)
+            **kwargs: Параметры GameLogic (broad_phase игнорируется: полосы
+                всегда ищут касания по сетке)
+        """
+        if workers < 1:
+            raise ValueError("Нужен хотя бы один процесс")
+        self.workers = workers
+        self.migrations = 0  # Сколько раз шарики переходили между полосами
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self._live_blocks: list = []  # Текущие блоки (для финализатора)
+        self._attached = False
+        super().__init__(width, height, **kwargs)
+
+        self._strip_width = width / workers
+        context = multiprocessing.get_context(start_method)
+        self._connections = []
+        self._processes = []
+        for strip in range(workers):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_worker_main,
+                args=(child_conn, strip, width, height),
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self._processes, self._connections, self._live_blocks
+        )
+
+    # === Общая память ===
+
+    def _new_array(self, name: str, capacity: int, dtype) -> np.ndarray:
+        """Создает массив состояния в новом блоке общей памяти."""
+        size = max(1, capacity * np.dtype(dtype).itemsize)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self._blocks[name] = block
+        array = np.ndarray(capacity, dtype=dtype, buffer=block.buf)
+        array[:] = 0
+        return array
+
+    def _allocate(self, capacity: int):
+        """Выделяет массивы в общей памяти, включая массив владельцев полос."""
+        retired = list(self._blocks.values())
+        super()._allocate(capacity)
+        self._owner = self._new_array('_owner', capacity, np.int16)
+        self._live_blocks[:] = self._blocks.values()
+        # Данные скопированы, старые массивы заменены: блоки можно освободить.
+        # Процессы полос держат свое отображение до следующего attach.
+        _release(retired, unlink=True)
+        self._attached = False
+
+    def _sync_workers(self):
+        """Подключает процессы полос к текущим массивам, если они изменились."""
+        if self._attached:
+            return
+        names = {name: self._blocks[name].name for name in _WORKER_FIELDS}
+        dtypes = {name: getattr(self, name).dtype.str for name in _WORKER_FIELDS}
+        self._broadcast(('attach', names, len(self._x), dtypes))
+        self._attached = True
+
+    def _broadcast(self, message: tuple) -> list:
+        """Отправляет команду всем процессам и собирает ответы."""
+        for conn in self._connections:
+            conn.send(message)
+        return [conn.recv() for conn in self._connections]
+
+    def close(self):
+        """
+        Останавливает процессы полос и освобождает общую память.
+
+        Состояние копируется в обычную память, поэтому шарики можно читать
+        и после закрытия; тики после закрытия недоступны.
+        """
+        if not self._finalizer.alive:
+            return
+        for name, _ in self._FIELDS:
+            setattr(self, name, np.array(getattr(self, name)))
+        self._owner = np.array(self._owner)
+        self._blocks.clear()
+        self._finalizer()
+
+    def _check_open(self):
+        """Проверяет, что процессы полос еще работают."""
+        if not self._finalizer.alive:
+            raise RuntimeError("ShardedGameLogic уже закрыт")
+
+    def __enter__(self) -> 'ShardedGameLogic':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # === Полосы ===
+
+    def _assign_strips(self) -> np.ndarray:
+        """Назначает шарики полосам по текущим координатам X."""
+        n = self._count
+        owner = self._owner[:n]
+        strips = np.floor(self._x[:n] / self._strip_width)
+        np.clip(strips, 0, self.workers - 1, out=strips)
+        owner[:] = strips
+        return owner
+
+    def _strip_bounds(self, strip: int) -> Tuple[float, float]:
+        """Возвращает границы полосы по X (крайние полосы не ограничены)."""
+        left = strip * self._strip_width if strip > 0 else -np.inf
+        right = (strip + 1) * self._strip_width if strip < self.workers - 1 else np.inf
+        return left, right
+
+    # === Симуляция ===
+
+    def _move_balls(self, dt: float):
+        """Двигает шарики в процессах полос и переназначает перешедшие границу."""
+        n = self._count
+        if n == 0:
+            return
+        self._check_open()
+        self._sync_workers()
+        before = self._assign_strips().copy()
+        self._broadcast(('move', n, dt))
+        after = self._assign_strips()
+        self.migrations += int(np.count_nonzero(before != after))
+
+    def _handle_boundaries(self):
+        """Отскок от границ выполняют процессы полос вместе с движением."""
+
+    def find_touching_pairs(self) -> List[Tuple[int, int]]:
+        """
+        Находит касающиеся пары в процессах полос.
+
+        Returns:
+            Отсортированный список пар индексов (i, j), i < j, как
+            GameLogic.find_touching_pairs
+        """
+        n = self._count
+        if n < 2:
+            return []
+        self._check_open()
+        self._sync_workers()
+        self._assign_strips()
+        max_diameter = 2 * float(self._radius[:n].max())
+        # Касающиеся шарики ближе друг к другу по X, чем наибольший диаметр
+        halo = max_diameter + self._SAP_MARGIN
+        cell_size = max(self.cell_size, max_diameter)
+        for strip, conn in enumerate(self._connections):
+            left, right = self._strip_bounds(strip)
+            conn.send(('pairs', n, left, right, halo, cell_size))
+        found = [conn.recv() for conn in self._connections]
+        i = np.concatenate([pair[0] for pair in found])
+        j = np.concatenate([pair[1] for pair in found])
+        order = np.lexsort((j, i))
+        return list(zip(i[order].tolist(), j[order].tolist()))
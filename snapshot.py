@@ -0,0 +1,213 @@
+"""
+Снимки состояния игры про шарики.
+Сохраняет шарики на поле, инвентарь, зоны удаления и радиус всасывания
+в двоичный файл фиксированной разметки и восстанавливает их без разбора
+каждого шарика: файл отображается в память (np.memmap), а его столбцы
+становятся массивами NumpyGameLogic без копирования.
+
+Формат файла (little-endian):
+    заголовок (_HEADER, дополнен до _DATA_OFFSET байт): b'BSNP', версия,
+        флаги, количество шариков на поле и в инвентаре, размер поля,
+        радиус всасывания, емкость инвентаря, количество зон удаления
+    зоны удаления: x, y, width, height (float64) на каждую зону
+    столбцы шариков на поле: x, y, vx, vy, radius (float64), r, g, b (int64)
+    столбцы шариков инвентаря в том же порядке
+
+Разметка столбцов совпадает с массивами NumpyGameLogic, все столбцы
+выровнены на 8 байт.
+
+Требует NumPy (необязательная зависимость): pip install numpy
+
+Пример:
+    save_snapshot(game, 'scene.snapshot')
+    game = load_snapshot('scene.snapshot', backend='numpy')
+"""
+
+import struct
+from typing import Dict, List
+
+import numpy as np
+
+from logic import Ball, Color, GameLogic, create_game_logic
+from logic_numpy import NumpyGameLogic
+
+_MAGIC = b'BSNP'
+_VERSION = 2
+_HEADER = struct.Struct('<4sHHQQdddqQ')
+_DATA_OFFSET = 128
+_ZONE = struct.Struct('<4d')
+
+# Флаги заголовка
+_UNLIMITED_INVENTORY = 1
+
+# Столбцы шарика и их типы
+COLUMNS = (
+    ('x', '<f8'), ('y', '<f8'), ('vx', '<f8'), ('vy', '<f8'), ('radius', '<f8'),
+    ('r', '<i8'), ('g', '<i8'), ('b', '<i8'),
+)
+
+
+def _ball_columns(balls: List[Ball]) -> Dict[str, np.ndarray]:
+    """Собирает столбцы из списка шариков."""
+    count = len(balls)
+    return {
+        'x': np.fromiter((ball.x for ball in balls), np.float64, count),
+        'y': np.fromiter((ball.y for ball in balls), np.float64, count),
+        'vx': np.fromiter((ball.vx for ball in balls), np.float64, count),
+        'vy': np.fromiter((ball.vy for ball in balls), np.float64, count),
+        'radius': np.fromiter((ball.radius for ball in balls), np.float64, count),
+        'r': np.fromiter((ball.color.r for ball in balls), np.int64, count),
+        'g': np.fromiter((ball.color.g for ball in balls), np.int64, count),
+        'b': np.fromiter((ball.color.b for ball in balls), np.int64, count),
+    }
+
+
+def _field_columns(game: GameLogic) -> Dict[str, np.ndarray]:
+    """Возвращает столбцы шариков на поле (для NumpyGameLogic - срезы массивов)."""
+    if isinstance(game, NumpyGameLogic):
+        n = game.get_ball_count()
+        return {name: getattr(game, '_' + name)[:n] for name, _ in COLUMNS}
+    return _ball_columns(game.balls)
+
+
+def _column_balls(columns: Dict[str, np.ndarray]) -> List[Ball]:
+    """Создает шарики из столбцов."""
+    values = [columns[name].tolist() for name, _ in COLUMNS]
+    return [Ball(x, y, vx, vy, radius, Color.intern(r, g, b))
+            for x, y, vx, vy, radius, r, g, b in zip(*values)]
+
+
+def save_snapshot(game: GameLogic, path: str):
+    """
+    Сохраняет состояние игры в файл.
+
+    Args:
+        game: Игровая логика (любой бэкенд)
+        path: Путь к файлу снимка
+    """
+    field = _field_columns(game)
+    inventory = _ball_columns(game.inventory.balls)
+    zones = game.delete_zones
+    max_size = game.inventory.max_size
+    flags = 0
+    if max_size is None:
+        flags |= _UNLIMITED_INVENTORY
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, flags,
+        len(field['x']), len(inventory['x']),
+        game.width, game.height, game.sucking_radius,
+        max_size if max_size is not None else -1,
+        len(zones)
+    )
+    with open(path, 'wb') as f:
+        f.write(header.ljust(_DATA_OFFSET, b'\0'))
+        for zone in zones:
+            f.write(_ZONE.pack(zone.x, zone.y, zone.width, zone.height))
+        for columns in (field, inventory):
+            for name, dtype in COLUMNS:
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+
+
+def read_snapshot(path: str) -> dict:
+    """
+    Отображает снимок в память и разбирает заголовок.
+
+    Столбцы - представления файла в режиме копирования при записи:
+    изменения видны только в памяти процесса, файл не меняется.
+
+    Returns:
+        Словарь с параметрами из заголовка и столбцами 'field'
+        и 'inventory' ({имя: массив})
+
+    Raises:
+        ValueError: если файл не является снимком поддерживаемой версии
+    """
+    data = np.memmap(path, dtype=np.uint8, mode='c')
+    if len(data) < _DATA_OFFSET:
+        raise ValueError(f"{path}: файл слишком короткий для снимка")
+    (magic, version, flags, ball_count, inventory_count, width, height,
+     sucking_radius, max_size, zone_count) = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError(f"{path}: не снимок игры")
+    if version != _VERSION:
+        raise ValueError(f"{path}: неподдерживаемая версия снимка {version}")
+    offset = _DATA_OFFSET + zone_count * _ZONE.size
+    expected = offset + (ball_count + inventory_count) * 8 * len(COLUMNS)
+    if len(data) != expected:
+        raise ValueError(f"{path}: размер файла {len(data)} вместо {expected}")
+    zones = [_ZONE.unpack_from(data, _DATA_OFFSET + k * _ZONE.size)
+             for k in range(zone_count)]
+
+    def take(count: int) -> Dict[str, np.ndarray]:
+        nonlocal offset
+        columns = {}
+        for name, dtype in COLUMNS:
+            end = offset + count * 8
+            columns[name] = data[offset:end].view(dtype)
+            offset = end
+        return columns
+
+    return {
+        'width': width,
+        'height': height,
+        'sucking_radius': sucking_radius,
+        'inventory_size': None if flags & _UNLIMITED_INVENTORY else max_size,
+        'delete_zones': zones,
+        'field': take(ball_count),
+        'inventory': take(inventory_count),
+    }
+
+
+def restore_snapshot(game: GameLogic, path: str):
+    """
+    Восстанавливает состояние игры из снимка.
+
+    NumpyGameLogic принимает столбцы файла как свои массивы без копирования,
+    GameLogic создает объекты Ball. Шарики получают новые id.
+
+    Args:
+        game: Игровая логика с тем же размером поля
+        path: Путь к файлу снимка
+
+    Raises:
+        ValueError: если размер поля снимка не совпадает с размером игры
+    """
+    snapshot = read_snapshot(path)
+    if (snapshot['width'], snapshot['height']) != (game.width, game.height):
+        raise ValueError(
+            f"Размер поля снимка {snapshot['width']}x{snapshot['height']} "
+            f"не совпадает с {game.width}x{game.height}"
+        )
+    if isinstance(game, NumpyGameLogic):
+        game.load_arrays(snapshot['field'])
+    else:
+        game.clear_all_balls()
+        for ball in _column_balls(snapshot['field']):
+            game.add_ball(ball)
+
+    game.inventory.clear()
+    game.inventory.max_size = snapshot['inventory_size']
+    for ball in _column_balls(snapshot['inventory']):
+        game.inventory.add_ball(ball)
+    game.sucking_radius = snapshot['sucking_radius']
+    game.delete_zones = []
+    for zone in snapshot['delete_zones']:
+        game.add_delete_zone(*zone)
+
+
+def load_snapshot(path: str, backend: str = 'python', **kwargs) -> GameLogic:
+    """
+    Создает игровую логику и восстанавливает в нее снимок.
+
+    Args:
+        path: Путь к файлу снимка
+        backend: Бэкенд симуляции
+        **kwargs: Параметры create_game_logic
+
+    Returns:
+        Игровая логика в состоянии снимка
+    """
+    snapshot = read_snapshot(path)
+    game = create_game_logic(snapshot['width'], snapshot['height'], backend=backend, **kwargs)
+    restore_snapshot(game, path)
+    return game
@@ -0,0 +1,6 @@
+"""Общие настройки тестов: модули игры лежат в корне репозитория."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,47 @@
+"""Тесты клиента игры (client.py)."""
+
+import pytest
+
+pytest.importorskip('pygame')
+
+from client import RemoteGame
+from logic import Inventory
+
+
+def _frame(tick, keyframe=False, removed=(), added=(), moved=(), recolored=()):
+    return {'tick': tick, 'keyframe': keyframe, 'removed': list(removed),
+            'added': list(added), 'moved': list(moved),
+            'recolored': list(recolored), 'inventory': None}
+
+
+def _remote():
+    """Возвращает RemoteGame без соединения с сервером."""
+    game = RemoteGame.__new__(RemoteGame)
+    game.inventory = Inventory()
+    game.tick = 0
+    game.frames = 0
+    game._balls = {}
+    game._balls_cache = None
+    return game
+
+
+@pytest.mark.parametrize('frame', [
+    _frame(2, moved=[(9, 1.0, 2.0)]),
+    _frame(2, recolored=[(9, 1, 2, 3)]),
+    _frame(2, removed=[1], moved=[(1, 1.0, 2.0)]),
+    _frame(2, keyframe=True, recolored=[(1, 1, 2, 3)]),
+])
+def test_frame_with_unknown_id_is_rejected(frame):
+    game = _remote()
+    game._apply_frame(_frame(1, keyframe=True, added=[(1, 10.0, 20.0, 5.0, 0, 0, 0)]))
+    with pytest.raises(ValueError):
+        game._apply_frame(frame)
+    assert game.tick == 1
+    assert [(ball.id, ball.x, ball.y) for ball in game.balls] == [(1, 10.0, 20.0)]
+
+
+def test_frame_moves_ball_added_in_same_frame():
+    game = _remote()
+    game._apply_frame(_frame(1, added=[(4, 10.0, 20.0, 5.0, 0, 0, 0)],
+                             moved=[(4, 11.0, 21.0)]))
+    assert [(ball.id, ball.x, ball.y) for ball in game.balls] == [(4, 11.0, 21.0)]
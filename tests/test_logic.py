@@ -0,0 +1,169 @@
+"""Тесты игровой логики (logic.py)."""
+
+import dataclasses
+import random
+
+import pytest
+
+from logic import (Ball, Color, ColorMixer, GameLogic, create_game_logic,
+                   create_predefined_colors)
+
+
+def _random_layout(game: GameLogic, count: int, seed: int, max_radius: float = 30.0):
+    """Заполняет поле случайными шариками с радиусами до max_radius."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        game.add_ball(Ball(
+            rng.uniform(0, game.width), rng.uniform(0, game.height),
+            rng.uniform(-2, 2), rng.uniform(-2, 2),
+            rng.uniform(1, max_radius),
+            Color(rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+        ))
+
+
+def _touching_pairs(game: GameLogic):
+    """Возвращает касающиеся пары как множество пар id."""
+    balls = game.balls
+    return {tuple(sorted((balls[i].id, balls[j].id))) for i, j in game.find_touching_pairs()}
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('max_radius', [30.0, 90.0])
+def test_grid_finds_same_touching_pairs_as_brute(seed, max_radius):
+    """Сетка находит те же касания, что и перебор, в том числе для шариков крупнее ячейки."""
+    grid = GameLogic(800, 600, broad_phase='grid', cell_size=60.0)
+    brute = GameLogic(800, 600, broad_phase='brute')
+    _random_layout(grid, 300, seed, max_radius)
+    for ball in grid.balls:
+        brute.add_ball(ball.copy())
+
+    expected = _touching_pairs(brute)
+    assert expected
+    assert _touching_pairs(grid) == expected
+
+
+def test_mix_many_matches_mix_colors_on_palette():
+    """Пакетное смешивание совпадает со скалярным на всех парах палитры."""
+    pytest.importorskip('numpy')
+    palette = list(create_predefined_colors().values())
+    colors_a = [a for a in palette for _ in palette]
+    colors_b = [b for _ in palette for b in palette]
+
+    mixed = ColorMixer.mix_many([c.to_tuple() for c in colors_a],
+                                [c.to_tuple() for c in colors_b])
+
+    assert len(mixed) == len(palette) ** 2
+    for k, (a, b) in enumerate(zip(colors_a, colors_b)):
+        assert tuple(mixed[k].tolist()) == ColorMixer.mix_colors(a, b).to_tuple()
+
+
+def _query_games(seed):
+    """Возвращает одинаковые игры с сеткой для запросов и с полным перебором."""
+    indexed = GameLogic(800, 600)
+    linear = GameLogic(800, 600)
+    linear.spatial_index = False
+    _random_layout(indexed, 200, seed)
+    for ball in indexed.balls:
+        linear.add_ball(ball)
+    return indexed, linear
+
+
+def _assert_same_queries(indexed, linear, rng):
+    """Проверяет, что запросы по точке совпадают с полным перебором."""
+    for _ in range(50):
+        x = rng.uniform(0, indexed.width)
+        y = rng.uniform(0, indexed.height)
+        assert indexed.get_ball_at_position(x, y) is linear.get_ball_at_position(x, y)
+        assert indexed.get_balls_in_area(x, y, 80) == linear.get_balls_in_area(x, y, 80)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_indexed_queries_match_linear_scan(seed):
+    indexed, linear = _query_games(seed)
+    rng = random.Random(seed)
+    _assert_same_queries(indexed, linear, rng)
+    indexed.update()
+    _assert_same_queries(indexed, linear, rng)
+
+
+def test_indexed_queries_after_moving_ball_between_ticks():
+    indexed, linear = _query_games(7)
+    rng = random.Random(7)
+    indexed.get_ball_at_position(0, 0)  # Строит сетку
+    ball = indexed.balls[0]
+    ball.x, ball.y = 400.0, 300.0
+    indexed.invalidate_spatial_index()
+    assert indexed.get_ball_at_position(400.0, 300.0) is linear.get_ball_at_position(400.0, 300.0)
+    _assert_same_queries(indexed, linear, rng)
+
+
+def test_suck_and_spit_keep_spatial_index():
+    game, _ = _query_games(5)
+    game.get_ball_at_position(0, 0)
+    grid = game._spatial_index()
+    ball = game.balls[0]
+    assert game.suck_ball_at_position(ball.x, ball.y)
+    assert game.spit_ball_at_position(100.0, 100.0)
+    assert game._spatial_index() is grid
+    assert game.get_ball_at_position(100.0, 100.0) in game.balls
+    other = GameLogic(800, 600)
+    other.spatial_index = False
+    for stored in game.balls:
+        other.add_ball(stored)
+    _assert_same_queries(game, other, random.Random(5))
+
+
+def test_removing_moved_ball_leaves_no_stale_entry():
+    indexed, linear = _query_games(11)
+    indexed.get_ball_at_position(0, 0)
+    ball = indexed.balls[5]
+    ball.x, ball.y = 10.0, 10.0
+    indexed.remove_ball(ball)
+    linear.remove_ball(ball)
+    assert ball not in indexed.get_balls_in_area(400, 300, 1000)
+    _assert_same_queries(indexed, linear, random.Random(11))
+
+
+def test_numpy_ball_view_move():
+    pytest.importorskip('numpy')
+    game = create_game_logic(800, 600, backend='numpy')
+    game.add_ball(Ball(100.0, 200.0, 3.0, -2.0, 10.0, Color(255, 0, 0)))
+    view = game.balls[0]
+    view.move(0.5)
+    assert (view.x, view.y) == (101.5, 199.0)
+    view.move()
+    assert (view.x, view.y) == (104.5, 197.0)
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_sap_order_survives_add_and_remove_between_ticks(backend):
+    if backend == 'numpy':
+        pytest.importorskip('numpy')
+    sap = create_game_logic(800, 600, backend=backend, broad_phase='sap', seed=3)
+    brute = GameLogic(800, 600, broad_phase='brute')
+    _random_layout(sap, 150, 3)
+    rng = random.Random(3)
+    for _ in range(20):
+        sap.update()
+        # Удаляем и возвращаем шарики, в том числе тот же шарик с тем же id
+        for ball in rng.sample(sap.balls, 5):
+            # BallView после удаления недействителен: numpy возвращает копию
+            removed = ball if backend == 'python' and rng.random() < 0.5 else ball.copy()
+            sap.remove_ball(ball)
+            if rng.random() < 0.5:
+                sap.add_ball(removed)
+        sap.add_ball(sap.create_random_ball())
+        brute.clear_all_balls()
+        for ball in sap.balls:
+            brute.add_ball(ball.copy())
+        assert _touching_pairs(sap) == _touching_pairs(brute)
+
+
+@pytest.mark.parametrize('name', ['r', 'unknown'])
+def test_color_is_frozen_for_any_attribute(name):
+    color = Color(10, 20, 30)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        setattr(color, name, 1)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        delattr(color, name)
+    assert color.to_tuple() == (10, 20, 30)
@@ -0,0 +1,34 @@
+"""Тесты записи и воспроизведения сессий (replay.py)."""
+
+import json
+import struct
+
+import pytest
+
+from logic import GameLogic
+from replay import ReplayRecorder, read_replay, replay
+
+
+def test_recorded_session_replays_without_divergence(tmp_path):
+    path = str(tmp_path / 'session.replay')
+    with ReplayRecorder(GameLogic(800, 600, seed=9), path, checksum_interval=5) as game:
+        game.set_delete_zone(700, 500, 100, 100)
+        game.add_delete_zone(0, 0, 60, 60)
+        for _ in range(100):
+            game.add_ball(game.create_random_ball())
+        for tick in range(30):
+            game.update()
+            if tick % 7 == 0:
+                game.suck_ball_at_position(400, 300)
+    result = replay(path)
+    assert result['divergence'] is None
+    assert result['checksums'] > 0
+    assert result['ticks'] == 30
+
+
+def test_version_1_log_is_rejected(tmp_path):
+    path = tmp_path / 'old.replay'
+    payload = json.dumps({'width': 800, 'height': 600, 'delete_zone': None}).encode('utf-8')
+    path.write_bytes(struct.pack('<4sHI', b'BRPL', 1, len(payload)) + payload)
+    with pytest.raises(ValueError, match='версия'):
+        read_replay(str(path))
@@ -0,0 +1,48 @@
+"""Тесты сервера игры (server.py)."""
+
+import asyncio
+import math
+
+import pytest
+
+from logic import GameLogic
+from server import (CMD_ADD_BALL, CMD_SPIT, CMD_SUCK, GameServer, pack_command,
+                    valid_command)
+
+
+@pytest.mark.parametrize('op, args, valid', [
+    (CMD_SUCK, (10.0, 20.0), True),
+    (CMD_SUCK, (math.nan, 20.0), False),
+    (CMD_SPIT, (10.0, 20.0, math.inf, 0.0), False),
+    (CMD_ADD_BALL, (10.0, 20.0, 1.0, -1.0, 15.0, 0, 128, 255), True),
+    (CMD_ADD_BALL, (math.nan, 20.0, 1.0, -1.0, 15.0, 0, 128, 255), False),
+    (CMD_ADD_BALL, (10.0, 20.0, 1.0, -1.0, 0.0, 0, 128, 255), False),
+    (CMD_ADD_BALL, (10.0, 20.0, 1.0, -1.0, math.nan, 0, 128, 255), False),
+    (CMD_ADD_BALL, (10.0, 20.0, 1.0, -1.0, math.inf, 0, 128, 255), False),
+])
+def test_valid_command(op, args, valid):
+    assert valid_command(op, args) is valid
+
+
+def test_bad_command_drops_client_and_ticks_continue():
+    async def scenario():
+        game = GameLogic(800, 600, seed=1)
+        server = GameServer(game, ticks_per_second=200)
+        await server.start('127.0.0.1', 0)
+        host, port = server.address[:2]
+        ticking = asyncio.ensure_future(server.run(ticks=40))
+
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(pack_command(CMD_ADD_BALL, math.nan, 100.0, 0.0, 0.0, 10.0, 1, 2, 3))
+        await writer.drain()
+        # Сервер закрывает соединение: чтение доходит до конца потока
+        await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+
+        await asyncio.wait_for(ticking, timeout=10)
+        await server.close()
+        return server.tick, game.get_ball_count()
+
+    ticks, balls = asyncio.run(scenario())
+    assert ticks == 40
+    assert balls == 0
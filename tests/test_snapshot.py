@@ -0,0 +1,83 @@
+"""Тесты снимков состояния (snapshot.py)."""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from logic import Ball, Color, GameLogic, create_game_logic
+from snapshot import load_snapshot, save_snapshot
+
+BACKENDS = ['python', 'numpy']
+
+
+def _inventory(game: GameLogic):
+    """Возвращает содержимое инвентаря как список (радиус, цвет)."""
+    return [(ball.radius, ball.color.to_tuple()) for ball in game.inventory.balls]
+
+
+def _zones(game: GameLogic):
+    """Возвращает зоны удаления как кортежи (x, y, width, height)."""
+    return [(zone.x, zone.y, zone.width, zone.height) for zone in game.delete_zones]
+
+
+def _scene(backend: str, balls: int = 200) -> GameLogic:
+    """Создает сцену с шариками, инвентарем и двумя зонами удаления."""
+    game = create_game_logic(800, 600, backend=backend, seed=5)
+    for _ in range(balls):
+        game.add_ball(game.create_random_ball())
+    for radius, color in ((12.0, Color(255, 0, 0)), (20.5, Color(1, 2, 3))):
+        game.inventory.add_ball(Ball(0.0, 0.0, 0.0, 0.0, radius, color))
+    game.set_delete_zone(700, 500, 100, 100)
+    game.add_delete_zone(0, 0, 50, 80)
+    game.sucking_radius = 42.5
+    return game
+
+
+def _assert_same_state(original: GameLogic, loaded: GameLogic):
+    assert loaded.state_checksum() == original.state_checksum()
+    assert _inventory(loaded) == _inventory(original)
+    assert loaded.inventory.max_size == original.inventory.max_size
+    assert _zones(loaded) == _zones(original)
+    assert loaded.sucking_radius == original.sucking_radius
+    assert (loaded.width, loaded.height) == (original.width, original.height)
+
+
+@pytest.mark.parametrize('saved_backend', BACKENDS)
+@pytest.mark.parametrize('loaded_backend', BACKENDS)
+def test_round_trip(tmp_path, saved_backend, loaded_backend):
+    original = _scene(saved_backend)
+    path = str(tmp_path / 'scene.snapshot')
+    save_snapshot(original, path)
+    loaded = load_snapshot(path, backend=loaded_backend)
+    _assert_same_state(original, loaded)
+
+    # Скорости тоже восстановлены: дальше игры идут одинаково
+    for _ in range(5):
+        original.update()
+        loaded.update()
+    assert loaded.state_checksum() == original.state_checksum()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_round_trip_empty_scene(tmp_path, backend):
+    original = create_game_logic(320, 240, backend=backend)
+    path = str(tmp_path / 'empty.snapshot')
+    save_snapshot(original, path)
+    loaded = load_snapshot(path, backend=backend)
+    _assert_same_state(original, loaded)
+    assert loaded.get_ball_count() == 0
+    assert loaded.get_inventory_count() == 0
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_round_trip_unlimited_inventory(tmp_path, backend):
+    original = _scene(backend, balls=20)
+    original.inventory.max_size = None
+    for k in range(15):
+        original.inventory.add_ball(Ball(0.0, 0.0, 0.0, 0.0, 5.0 + k, Color(k, k, k)))
+    path = str(tmp_path / 'unlimited.snapshot')
+    save_snapshot(original, path)
+    loaded = load_snapshot(path, backend=backend)
+    _assert_same_state(original, loaded)
+    assert loaded.inventory.max_size is None
+    assert loaded.get_inventory_count() == 17
@@ -0,0 +1,63 @@
+"""
+Фиксированный шаг симуляции для игры про шарики.
+Отделяет частоту тиков игровой логики от частоты отрисовки.
+"""
+
+
+class FixedTimestep:
+    """
+    Аккумулятор фиксированного шага.
+
+    Реальное время кадров накапливается, а логика продвигается целым
+    числом тиков одинаковой длины. Так физика детерминирована и не зависит
+    от того, насколько медленным оказался кадр.
+    """
+
+    def __init__(self, ticks_per_second: float, max_steps: int = 5):
+        """
+        Инициализирует аккумулятор.
+
+        Args:
+            ticks_per_second: Частота тиков логики
+            max_steps: Максимум тиков за один кадр (догоняющих шагов)
+        """
+        if ticks_per_second <= 0:
+            raise ValueError("Частота тиков должна быть положительной")
+        if max_steps < 1:
+            raise ValueError("Нужен хотя бы один тик за кадр")
+        self.step = 1.0 / ticks_per_second
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_time = 0.0  # Время, отброшенное из-за лимита шагов
+
+    def advance(self, frame_time: float) -> int:
+        """
+        Добавляет время кадра и возвращает, сколько тиков нужно выполнить.
+
+        Args:
+            frame_time: Длительность прошедшего кадра в секундах
+
+        Returns:
+            Количество тиков логики (не больше max_steps)
+        """
+        self.accumulator += max(0.0, frame_time)
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            # Не пытаемся догнать слишком большое отставание: это только
+            # замедлит следующие кадры. Лишнее время просто отбрасываем.
+            self.dropped_time += (steps - self.max_steps) * self.step
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.step
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Доля следующего тика, уже накопленная в аккумуляторе (0..1)."""
+        return min(1.0, self.accumulator / self.step)
+
+    def reset(self):
+        """Сбрасывает накопленное время."""
+        self.accumulator = 0.0
+        self.dropped_time = 0.0